@@ -13,4 +13,21 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+
+async def application(scope, receive, send):
+    """Django ASGI-приложение с обработкой lifespan: закрывает HTTP-сессии."""
+    if scope["type"] != "lifespan":
+        return await django_application(scope, receive, send)
+
+    from app.services.vacancies.utils.http_client import session_registry
+
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await session_registry.aclose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
@@ -1,8 +1,23 @@
 import os
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
 app = Celery("app")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def warm_dimension_cache(**kwargs):
+    from app.services.vacancies.utils.dimensions import dimension_resolver
+
+    dimension_resolver.warm()
+
+
+@worker_process_shutdown.connect
+def close_http_sessions(**kwargs):
+    from app.services.vacancies.utils.http_client import session_registry
+
+    session_registry.close()
@@ -2,6 +2,7 @@ import { router } from '@inertiajs/react';
 import { Box, Button, CloseButton, Container, Group, Pagination, Text, TextInput, Title } from '@mantine/core';
 import { useForm } from '@mantine/form';
 import { Search } from 'lucide-react';
+import { type RefreshStatus, useVacancyRefresh } from '../../hooks/useVacancyRefresh';
 import type { VacancyCardProps } from '../../types';
 import { VacancyCard } from '../shared/VacancyCard';
 
@@ -13,9 +14,10 @@ type PaginationMeta = {
 type VacancyPageProps = {
   vacancies: VacancyCardProps[];
   pagination: PaginationMeta;
+  refresh: RefreshStatus | null;
 };
 
-function VacanciesPage({ vacancies, pagination }: VacancyPageProps) {
+function VacanciesPage({ vacancies, pagination, refresh }: VacancyPageProps) {
   const form = useForm({
     mode: "uncontrolled",
     initialValues: {
@@ -40,6 +42,12 @@ function VacanciesPage({ vacancies, pagination }: VacancyPageProps) {
     });
   }
 
+  const isRefreshing = useVacancyRefresh(
+    refresh,
+    new URLSearchParams(window.location.search).get('search') ?? '',
+    pagination.current_page,
+  );
+
   if (!vacancies) return "Loading..."
 
   return (
@@ -69,6 +77,12 @@ function VacanciesPage({ vacancies, pagination }: VacancyPageProps) {
         <VacancyCard key={vacancy.id} props={vacancy} />
       ))}
 
+      {isRefreshing && (
+        <Text size="sm" c="dimmed" mb="sm">
+          Загружаем свежие вакансии…
+        </Text>
+      )}
+
       <Pagination
         total={pagination.total_pages}
         value={pagination.current_page}
@@ -0,0 +1,38 @@
+import { router } from '@inertiajs/react';
+import axios from 'axios';
+import { useEffect, useState } from "react";
+
+export type RefreshStatus = {
+  status: 'pending' | 'running' | 'done' | 'failed' | null;
+};
+
+const POLL_INTERVAL = 3000;
+
+export function useVacancyRefresh(refresh: RefreshStatus | null, search: string, page: number) {
+  const [status, setStatus] = useState(refresh?.status ?? null);
+
+  useEffect(() => {
+    setStatus(refresh?.status ?? null);
+  }, [refresh]);
+
+  useEffect(() => {
+    if (status !== 'pending' && status !== 'running') return;
+
+    const handler = setInterval(() => {
+      axios.get('/vacancies/refresh/', { params: { search, page } })
+        .then(({ data }) => {
+          setStatus(data.status);
+          if (data.status === 'done') {
+            router.reload({ only: ['vacancies', 'pagination'] });
+          }
+        })
+        .catch(() => setStatus('failed'));
+    }, POLL_INTERVAL);
+
+    return () => {
+      clearInterval(handler);
+    };
+  }, [status, search, page]);
+
+  return status === 'pending' || status === 'running';
+}
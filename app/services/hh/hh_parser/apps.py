@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class HhParserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "app.services.hh.hh_parser"
\ No newline at end of file
+    name = "app.services.hh.hh_parser"
+
+    def ready(self):
+        from .utils import source  # noqa: F401
@@ -1,13 +1,18 @@
 import asyncio
+import json
+from datetime import timedelta
 from http import HTTPStatus
 from unittest.mock import AsyncMock, patch
 
+import aiohttp
 from django.http import JsonResponse
 from django.test import TransactionTestCase
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from app.services.hh.hh_parser.utils.data_transformer import (
-    extract_city_and_address,
+    extract_address,
+    extract_city,
     extract_company,
     extract_plain_text,
     format_list,
@@ -15,13 +20,22 @@ from app.services.hh.hh_parser.utils.data_transformer import (
     safe_nested_get,
     transform_hh_data,
 )
-from app.services.hh.hh_parser.utils.vacancy_fetcher import fetch_hh_vacancies
-from app.services.hh.hh_parser.utils.vacancy_service import (
-    process_vacancies,
-    save_vacancy,
+from app.services.hh.hh_parser.utils.vacancy_fetcher import (
+    BASE_URL,
+    DATE_FORMAT,
+    MAX_LIST_DEPTH,
 )
+from app.services.hh.hh_parser.utils.vacancy_service import process_vacancy_stream
 from app.services.hh.hh_parser.views import hh_vacancy_parse
-from app.services.vacancies.models import City, Company, Platform, Vacancy
+from app.services.vacancies.models import (
+    Company,
+    CrawlWatermark,
+    PageValidator,
+    Platform,
+    Vacancy,
+)
+from app.services.vacancies.utils.http_client import HTTPResponse
+from app.services.vacancies.utils.sources import SourceAdapter, get_source
 
 
 class HhParserTests(TransactionTestCase):
@@ -82,123 +96,400 @@ class HhParserTests(TransactionTestCase):
         self.assertIsNone(safe_nested_get(None, "a"))
 
     def test_extract_company_and_city_and_address(self):
-        comp = extract_company({"employer": {"name": "Hexlet"}})
-        self.assertIsInstance(comp, Company)
-        self.assertEqual(comp.name, "Hexlet")
-
+        self.assertEqual(extract_company({"employer": {"name": "Hexlet"}}), "Hexlet")
         self.assertIsNone(extract_company({}))
 
-        city_obj, addr = extract_city_and_address({"city": "Spb", "raw": "St"})
-        self.assertIsInstance(city_obj, City)
-        self.assertEqual(city_obj.name, "Spb")
-        self.assertEqual(addr, "St")
+        self.assertEqual(extract_city({"area": {"name": "Spb"}}), "Spb")
+        self.assertIsNone(extract_city({}))
 
-        self.assertEqual(extract_city_and_address(None), (None, None))
+        self.assertEqual(extract_address({"address": {"raw": "St"}}), "St")
+        self.assertIsNone(extract_address({}))
 
-    def test_transform_hh_data_creates_related(self):
-        self.assertFalse(Platform.objects.filter(name=Platform.HH).exists())
+    @patch(
+        "app.services.hh.hh_parser.utils.data_transformer"
+        ".get_hh_city_to_region_mapping",
+        return_value={"Москва": "Москва"},
+    )
+    def test_transform_hh_data_returns_names(self, mock_regions):
         transformed = transform_hh_data(self.sample_item)
         self.assertEqual(transformed["title"], "Test Vacancy")
         self.assertEqual(transformed["salary"], "от 100000 до 200000 RUB")
 
-        self.assertIsInstance(transformed["platform"], Platform)
-        self.assertIsInstance(transformed["company"], Company)
-        self.assertIsInstance(transformed["city"], City)
+        self.assertEqual(transformed["platform"], Platform.HH)
+        self.assertEqual(transformed["company"], "TestCompany")
+        self.assertIsNone(transformed["city"])
 
-        self.assertTrue(Platform.objects.filter(name=Platform.HH).exists())
+        self.assertFalse(Platform.objects.exists())
+        self.assertFalse(Company.objects.exists())
 
+    @patch(
+        "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.fetch_conditional",
+        new_callable=AsyncMock,
+    )
     @patch(
         "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.get",
         new_callable=AsyncMock,
     )
-    def test_fetch_hh_vacancies_success(self, mock_get):
-        first = {"items": [{"id": "1"}, {"id": "2"}]}
-        second1 = {"id": "1"}
-        second2 = {"id": "2"}
-        mock_get.side_effect = [[first], [second1, second2]]
-        result = asyncio.run(fetch_hh_vacancies())
-        self.assertEqual(result, [second1, second2])
+    def test_hh_source_streams_details(self, mock_get, mock_detail):
+        mock_get.return_value = [{"items": [{"id": "1"}, {"id": "2"}]}]
+        mock_detail.side_effect = lambda url, *validators: HTTPResponse(
+            200, {"id": url.rsplit("/", 1)[-1]}
+        )
+
+        async def crawl():
+            return [item async for item in get_source("hh").stream()]
+
+        self.assertCountEqual(asyncio.run(crawl()), [{"id": "1"}, {"id": "2"}])
 
     @patch(
         "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.get",
         new_callable=AsyncMock,
     )
-    def test_fetch_hh_vacancies_empty_items(self, mock_get):
+    def test_hh_source_stream_errors(self, mock_get):
+        async def crawl():
+            return [item async for item in get_source("hh").stream({})]
+
         mock_get.return_value = [{"items": []}]
         with self.assertRaises(ValueError):
-            asyncio.run(fetch_hh_vacancies({}))
+            asyncio.run(crawl())
+
+        mock_get.return_value = [aiohttp.ClientError("Api error")]
+        with self.assertRaises(aiohttp.ClientError):
+            asyncio.run(crawl())
+
+    def test_hh_source_save_creates_record(self):
+        get_source("hh").save(
+            [
+                {
+                    "platform_vacancy_id": "123",
+                    "title": "Python developer",
+                    "published_at": timezone.now(),
+                }
+            ]
+        )
+        self.assertTrue(
+            Vacancy.objects.filter(platform_vacancy_id="123").exists()
+        )
 
     @patch(
-        "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.get",
+        "app.services.hh.hh_parser.views.process_vacancy_stream",
         new_callable=AsyncMock,
     )
-    def test_fetch_hh_vacancies_api_error(self, mock_get):
-        mock_get.side_effect = [[]]
-        with self.assertRaises(IndexError):
-            asyncio.run(fetch_hh_vacancies({}))
+    def test_hh_vacancy_parse_happy_path(self, mock_process):
+        response = JsonResponse(
+            {
+                "status": "success",
+                "vacancies": ["vacancies"],
+                "message": "Успешно сохранено 5 вакансий",
+            },
+            status=200,
+        )
+        mock_process.return_value = response
+        result = asyncio.run(hh_vacancy_parse())
+        mock_process.assert_awaited_with(
+            get_source("hh"), params=None, incremental=False
+        )
 
-    def test_process_vacancies_success(self):
-        async def fake_fetch(params):
-            return [{"id": "1"}]
+        self.assertIs(result, response)
 
-        def fake_transform(item):
-            return {
-                "platform_vacancy_id": "p1",
-                "title": "t",
-                "published_at": timezone.now(),
-            }
+    @patch(
+        "app.services.hh.hh_parser.utils.data_transformer"
+        ".get_hh_city_to_region_mapping",
+        return_value={"Москва": "Москва"},
+    )
+    def test_hh_source_ingest_upserts_batch(self, mock_regions):
+        async def payloads():
+            for vacancy_id in ("123", "124"):
+                yield {
+                    **self.sample_item,
+                    "id": vacancy_id,
+                    "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+                    "area": {"name": "Москва"},
+                }
 
-        response = asyncio.run(
-            process_vacancies(fake_fetch, fake_transform, {})
-        )
-        self.assertEqual(response.status_code, HTTPStatus.OK.value)
+        source = get_source("hh")
+        asyncio.run(source.ingest(payloads()))
+        self.sample_item["name"] = "Updated Vacancy"
+        stats = asyncio.run(source.ingest(payloads()))
+
+        self.assertEqual(stats["save"].items, 2)
+        self.assertEqual(Vacancy.objects.count(), 2)
+        self.assertEqual(Company.objects.count(), 1)
         self.assertTrue(
-            Vacancy.objects.filter(platform_vacancy_id="p1").exists()
+            Vacancy.objects.filter(
+                platform_vacancy_id=f"{Platform.HH}123",
+                title="Updated Vacancy",
+                platform__name=Platform.HH,
+                city__name="Москва",
+            ).exists()
         )
 
-    def test_process_vacancies_not_found(self):
-        async def fake_fetch(params):
-            raise ValueError("No vacancy found")
+    def test_process_vacancy_stream_saves_items(self):
+        class FakeSource(SourceAdapter):
+            name = "fake"
+            platform = Platform.HH
+
+            async def stream(self, params=None, incremental=False, paginate=False):
+                for i in range(3):
+                    yield {"id": str(i)}
 
-        response = asyncio.run(process_vacancies(fake_fetch, lambda i: {}, {}))
+            def transform(self, payload):
+                if payload["id"] == "1":
+                    raise KeyError("salary")
+                return {
+                    "platform_vacancy_id": f"p{payload['id']}",
+                    "title": "t",
+                    "published_at": timezone.now(),
+                }
+
+        response = asyncio.run(process_vacancy_stream(FakeSource()))
+        data = json.loads(response.content)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK.value)
+        self.assertEqual(data["saved"], 2)
+        self.assertEqual(data["stages"]["fetch"]["items"], 3)
+        self.assertEqual(data["stages"]["transform"]["failed"], 1)
+        self.assertEqual(Vacancy.objects.count(), 2)
+
+    def test_process_vacancy_stream_errors(self):
+        class EmptySource(SourceAdapter):
+            name = "empty"
+            platform = Platform.HH
+
+            async def stream(self, params=None, incremental=False, paginate=False):
+                return
+                yield
+
+        response = asyncio.run(process_vacancy_stream(EmptySource()))
         self.assertEqual(response.status_code, 404)
 
-        async def fake_fetch(params):
-            raise RuntimeError("Api error")
+        class FailingSource(EmptySource):
+            async def stream(self, params=None, incremental=False, paginate=False):
+                raise RuntimeError("Api error")
+                yield
 
-        response = asyncio.run(process_vacancies(fake_fetch, lambda i: {}, {}))
+        response = asyncio.run(process_vacancy_stream(FailingSource()))
         self.assertEqual(response.status_code, 500)
 
-    def test_save_vacancy_creates_record(self):
-        def fake_transform(item):
+    @patch(
+        "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.fetch_conditional",
+        new_callable=AsyncMock,
+    )
+    @patch(
+        "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.get",
+        new_callable=AsyncMock,
+    )
+    def test_hh_source_stream_skips_unchanged_details(self, mock_get, mock_detail):
+        mock_get.return_value = [{"items": [{"id": "1"}, {"id": "2"}, {"id": "3"}]}]
+        responses = {
+            f"{BASE_URL}/1": HTTPResponse(200, {"id": "1"}, etag='"a"'),
+            f"{BASE_URL}/2": RuntimeError("timeout"),
+            f"{BASE_URL}/3": HTTPResponse(304, etag='"c"'),
+        }
+
+        async def fetch_detail(url, etag=None, last_modified=None):
+            response = responses[url]
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        mock_detail.side_effect = fetch_detail
+
+        async def crawl():
+            source = get_source("hh").stream({})
+            items = [item async for item in source]
+            await source.commit()
+            return source, items
+
+        source, items = asyncio.run(crawl())
+
+        self.assertEqual(items, [{"id": "1"}])
+        self.assertEqual(source.unchanged, 1)
+        self.assertEqual(
+            dict(PageValidator.objects.values_list("url", "etag")),
+            {f"{BASE_URL}/1": '"a"', f"{BASE_URL}/3": '"c"'},
+        )
+
+        asyncio.run(crawl())
+        mock_detail.assert_any_await(f"{BASE_URL}/1", '"a"', None)
+
+    @patch(
+        "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.fetch_conditional",
+        new_callable=AsyncMock,
+    )
+    @patch(
+        "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.get",
+        new_callable=AsyncMock,
+    )
+    def test_hh_source_incremental_uses_watermark(self, mock_get, mock_detail):
+        now = timezone.now()
+
+        def listed(*hours_ago):
             return {
-                "platform_vacancy_id": "123",
-                "title": "Python developer",
-                "published_at": timezone.now(),
+                "id": str(hours_ago[0]),
+                "published_at": (now - timedelta(hours=hours_ago[0])).strftime(
+                    DATE_FORMAT
+                ),
             }
 
-        asyncio.run(save_vacancy(fake_transform, {}))
-        self.assertTrue(
-            Vacancy.objects.filter(platform_vacancy_id="123").exists()
+        mock_detail.side_effect = lambda url, *validators: HTTPResponse(
+            200, {"id": url.rsplit("/", 1)[-1]}
+        )
+        mock_get.side_effect = [
+            [{"items": [listed(2), listed(3)], "pages": 1}],
+            [{"items": [listed(1), listed(2), listed(3)], "pages": 5}],
+        ]
+        params = {"text": "python", "area": 1}
+
+        async def crawl():
+            source = get_source("hh").stream(params, incremental=True)
+            items = [item async for item in source]
+            await source.commit()
+            return items
+
+        self.assertEqual(len(asyncio.run(crawl())), 2)
+        first_params = mock_get.await_args_list[0].kwargs["params"]
+        self.assertEqual(first_params["order_by"], "publication_time")
+        # Без отметки окно начинается за CRAWL_DAYS до текущего момента.
+        self.assertLess(
+            parse_datetime(first_params["date_from"]), now - timedelta(days=29)
+        )
+
+        self.assertEqual(len(asyncio.run(crawl())), 2)
+        second_params = mock_get.await_args_list[1].kwargs["params"]
+        self.assertEqual(second_params["date_from"], listed(2)["published_at"])
+        # Первая же страница дошла до отметки: листать дальше не нужно.
+        self.assertEqual(mock_get.await_count, 2)
+
+        watermark = CrawlWatermark.objects.get()
+        self.assertEqual(
+            watermark.last_published_at.strftime(DATE_FORMAT),
+            listed(1)["published_at"],
         )
 
     @patch(
-        "app.services.hh.hh_parser.views.process_vacancies",
+        "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.fetch_conditional",
         new_callable=AsyncMock,
     )
-    def test_hh_vacancy_parse_happy_path(self, mock_process):
-        response = JsonResponse(
+    @patch(
+        "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.get",
+        new_callable=AsyncMock,
+    )
+    def test_hh_source_incremental_holds_watermark_on_failure(
+        self, mock_get, mock_detail
+    ):
+        now = timezone.now().replace(microsecond=0)
+        published = {str(i): now - timedelta(hours=i) for i in range(1, 4)}
+
+        async def fetch_detail(url, *validators):
+            vacancy_id = url.rsplit("/", 1)[-1]
+            if vacancy_id == "2":
+                raise aiohttp.ClientError("timeout")
+            return HTTPResponse(200, {"id": vacancy_id})
+
+        mock_detail.side_effect = fetch_detail
+        mock_get.return_value = [
             {
-                "status": "success",
-                "vacancies": ["vacancies"],
-                "message": "Успешно сохранено 5 вакансий",
-            },
-            status=200,
+                "items": [
+                    {"id": i, "published_at": at.strftime(DATE_FORMAT)}
+                    for i, at in published.items()
+                ],
+                "pages": 1,
+            }
+        ]
+
+        async def crawl():
+            source = get_source("hh").stream({"text": "python"}, incremental=True)
+            items = [item async for item in source]
+            await source.commit()
+            return items
+
+        self.assertCountEqual(asyncio.run(crawl()), [{"id": "1"}, {"id": "3"}])
+        self.assertEqual(CrawlWatermark.objects.get().last_published_at, published["2"])
+
+    @patch(
+        "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.fetch_conditional",
+        new_callable=AsyncMock,
+    )
+    @patch(
+        "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.get",
+        new_callable=AsyncMock,
+    )
+    def test_hh_source_incremental_splits_deep_window(self, mock_get, mock_detail):
+        mock_detail.side_effect = lambda url, *validators: HTTPResponse(
+            200, {"id": url.rsplit("/", 1)[-1]}
         )
-        mock_process.return_value = response
-        result = asyncio.run(hh_vacancy_parse())
-        mock_process.assert_awaited_with(
-            fetch_hh_vacancies, transform_hh_data, params=None
+        windows = []
+
+        async def list_vacancies(urls, params):
+            windows.append((params["date_from"], params["date_to"]))
+            if len(windows) == 1:
+                return [{"found": MAX_LIST_DEPTH + 1, "items": [], "pages": 20}]
+            published_at = parse_datetime(params["date_to"]) - timedelta(minutes=1)
+            return [
+                {
+                    "found": 1,
+                    "items": [
+                        {
+                            "id": str(len(windows)),
+                            "published_at": published_at.strftime(DATE_FORMAT),
+                        }
+                    ],
+                    "pages": 1,
+                }
+            ]
+
+        mock_get.side_effect = list_vacancies
+
+        async def crawl():
+            source = get_source("hh").stream({}, incremental=True)
+            return [item async for item in source]
+
+        self.assertCountEqual(asyncio.run(crawl()), [{"id": "2"}, {"id": "3"}])
+        whole, newer, older = windows
+        self.assertEqual(newer[1], whole[1])
+        self.assertEqual(older[0], whole[0])
+        self.assertEqual(older[1], newer[0])
+
+    @patch(
+        "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.fetch_conditional",
+        new_callable=AsyncMock,
+    )
+    @patch(
+        "app.services.hh.hh_parser.utils.vacancy_fetcher.HTTPClient.get",
+        new_callable=AsyncMock,
+    )
+    def test_hh_source_stream_skips_stored_vacancies(self, mock_get, mock_detail):
+        published_at = "2024-01-15T10:00:00+0300"
+        Vacancy.objects.create(
+            platform_vacancy_id=f"{Platform.HH}1",
+            title="Stored",
+            published_at=parse_datetime(published_at),
+        )
+        Vacancy.objects.create(
+            platform_vacancy_id=f"{Platform.HH}2",
+            title="Republished",
+            published_at=parse_datetime(published_at),
+        )
+        mock_get.return_value = [
+            {
+                "items": [
+                    {"id": "1", "published_at": published_at},
+                    {"id": "2", "published_at": "2024-01-16T10:00:00+0300"},
+                    {"id": "3", "published_at": published_at},
+                ]
+            }
+        ]
+        mock_detail.side_effect = lambda url, *validators: HTTPResponse(
+            200, {"id": url.rsplit("/", 1)[-1]}
         )
 
-        self.assertIs(result, response)
+        async def crawl():
+            source = get_source("hh").stream({})
+            return source, [item async for item in source]
+
+        source, items = asyncio.run(crawl())
+
+        self.assertCountEqual(items, [{"id": "2"}, {"id": "3"}])
+        self.assertEqual(source.known, 1)
+        self.assertEqual(mock_detail.await_count, 2)
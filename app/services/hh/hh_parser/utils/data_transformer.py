@@ -4,7 +4,7 @@ from typing import Any, Optional
 
 from bs4 import BeautifulSoup
 
-from app.services.vacancies.models import City, Company, Platform
+from app.services.vacancies.models import Platform
 
 from .regions_parser import get_hh_city_to_region_mapping
 
@@ -82,7 +82,8 @@ def safe_nested_get(data: Optional[dict[str, Any]], *keys: str) -> Any:
 
 
 def transform_hh_data(item: dict[str, Any]) -> dict[str, Any]:
-    platform, _ = Platform.objects.get_or_create(name=Platform.HH)
+    """Преобразует вакансию HH в строку для bulk_upsert_vacancies."""
+    platform = Platform.HH
     company = extract_company(item)
     city = extract_city(item)
     full_address = extract_address(item)
@@ -91,7 +92,7 @@ def transform_hh_data(item: dict[str, Any]) -> dict[str, Any]:
     return {
         "platform": platform,
         "company": company,
-        "region": region.get(str(city), 'Регион не найден'),
+        "region": region.get(city, 'Регион не найден'),
         "city": city,
         "platform_vacancy_id": f"{Platform.HH}{item.get('id')}",
         "title": item.get("name"),
@@ -110,20 +111,12 @@ def transform_hh_data(item: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def extract_company(item: dict[str, Any]) -> Optional[Company]:
-    employer_name = item.get("employer", {}).get("name")
-    if not employer_name:
-        return None
-    company, _ = Company.objects.get_or_create(name=employer_name)
-    return company
+def extract_company(item: dict[str, Any]) -> Optional[str]:
+    return item.get("employer", {}).get("name") or None
 
 
-def extract_city(item: dict[str, Any]) -> Optional[City]:
-    city_name = item.get("area", {}).get("name")
-    if not city_name:
-        return None
-    city, _ = City.objects.get_or_create(name=city_name)
-    return city
+def extract_city(item: dict[str, Any]) -> Optional[str]:
+    return item.get("area", {}).get("name") or None
 
 
 def extract_address(item: Optional[dict[str, Any]]) -> Optional[str]:
@@ -1,23 +1,24 @@
 import os
+from collections.abc import Mapping
 
 import requests
 
-from app.parser import get_fixture_data, save_data
+from app.parser import save_data
+from app.services.vacancies.utils.region_index import RegionIndex
 
 CACHE_FILE = os.path.join('app', 'services', 'hh', 'hh_parser',
                           'utils', 'hh_city_region_mapping.json'
                           )
 
 
-def get_hh_city_to_region_mapping(source='hh') -> dict[str, str]:
-    if os.path.exists(CACHE_FILE):
-        return get_fixture_data(CACHE_FILE)
-
-    if source == 'hh':
-        base_url = 'https://api.hh.ru/areas'
-    else:
+def get_hh_city_to_region_mapping(source='hh') -> Mapping[str, str]:
+    if source != 'hh':
         raise ValueError('Unknown source')
+    return hh_region_index.get()
+
 
+def fetch_hh_city_to_region_mapping() -> dict[str, str]:
+    base_url = 'https://api.hh.ru/areas'
     response = requests.get(base_url, timeout=10)
     response.raise_for_status()
     areas = response.json()
@@ -39,4 +40,7 @@ def parse_hh_areas(areas: list) -> dict[str, str]:
                 mapping[city['name']] = region_name
             if not region['areas']:
                 mapping[region_name] = region_name
-    return mapping
\ No newline at end of file
+    return mapping
+
+
+hh_region_index = RegionIndex(CACHE_FILE, fetch_hh_city_to_region_mapping)
@@ -0,0 +1,37 @@
+from app.services.vacancies.models import Platform
+from app.services.vacancies.utils.refill import HH_VACANCY_CATEGORIES
+from app.services.vacancies.utils.sources import SourceAdapter, register_source
+
+from .data_transformer import transform_hh_data
+from .vacancy_fetcher import (
+    DATE_FORMAT,
+    MAX_LIST_DEPTH,
+    HhCrawl,
+    count_hh_vacancies,
+)
+
+
+@register_source
+class HhSource(SourceAdapter):
+    name = "hh"
+    platform = Platform.HH
+    catalog_params = {"professional_role": HH_VACANCY_CATEGORIES}
+    max_depth = MAX_LIST_DEPTH
+
+    def stream(self, params=None, incremental=False, paginate=False):
+        return HhCrawl(params, incremental=incremental, paginate=paginate)
+
+    def transform(self, payload):
+        return transform_hh_data(payload)
+
+    async def count(self, params):
+        return await count_hh_vacancies(params)
+
+    def window_params(self, window):
+        params = {
+            "date_from": window.date_from.strftime(DATE_FORMAT),
+            "date_to": window.date_to.strftime(DATE_FORMAT),
+        }
+        if window.area:
+            params["area"] = window.area
+        return params
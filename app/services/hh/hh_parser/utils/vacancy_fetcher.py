@@ -1,29 +1,187 @@
 import logging
+from datetime import timedelta
 
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from app.services.vacancies.models import Platform
+from app.services.vacancies.utils.catalog_crawl import CRAWL_DAYS, MIN_WINDOW, Window
+from app.services.vacancies.utils.crawl_state import (
+    CrawlSource,
+    get_stored_published_at,
+    get_validators,
+    get_watermark,
+)
 from app.services.vacancies.utils.http_client import HTTPClient
 
 logger = logging.getLogger(__name__)
 
+BASE_URL = "https://api.hh.ru/vacancies"
+HEADERS = {"User-Agent": "HH-User-Agent"}
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+LIST_PER_PAGE = 100
+# Глубже 2000 вакансий HH по одному запросу не отдает.
+MAX_LIST_DEPTH = 2000
+
+
+class HhCrawl(CrawlSource):
+    """
+    Обход вакансий HH: список, затем подробные страницы по мере получения.
+
+    Вакансии, уже сохраненные с той же датой публикации, отсеиваются одним
+    запросом к базе. Остальные подробные страницы запрашиваются условно
+    (If-None-Match / If-Modified-Since), неизменившиеся вакансии (304)
+    дальше не идут.
+
+    С paginate список листается до конца выдачи (не глубже MAX_LIST_DEPTH).
+    В инкрементальном режиме список запрашивается за окно от отметки
+    последнего обхода (без нее — за CRAWL_DAYS) до текущего момента; окно,
+    в котором вакансий больше MAX_LIST_DEPTH, делится по дате публикации.
+    Отметка не сдвигается дальше вакансий, которые не удалось получить.
+    """
+
+    platform = Platform.HH
+
+    def __init__(
+        self,
+        params: dict | None = None,
+        incremental: bool = False,
+        paginate: bool = False,
+    ):
+        super().__init__(params, incremental)
+        self.paginate = paginate or incremental
+
+    async def crawl(self):
+        api_client = HTTPClient(BASE_URL, HEADERS)
+        if self.paginate:
+            vacancies = await self.list_pages(api_client)
+        else:
+            response = await self.list_vacancies(api_client, self.params)
+            vacancies = response.get("items")
+            if not vacancies:
+                raise ValueError("Vacancy not found")
+
+        vacancies = await self.skip_known(vacancies)
+        listed = {f"{BASE_URL}/{vacancy['id']}": vacancy for vacancy in vacancies}
+        validators = await sync_to_async(get_validators)(listed)
+
+        async def fetch_detail(url):
+            try:
+                response = await api_client.fetch_conditional(
+                    url, *validators.get(url, (None, None))
+                )
+            except Exception as e:
+                return url, e
+            return url, response
+
+        async for url, response in api_client.stream(listed, fetch=fetch_detail):
+            if isinstance(response, Exception):
+                self.failed(listed[url])
+                continue
+            if response.etag or response.last_modified:
+                self.validators[url] = (response.etag, response.last_modified)
+            if response.not_modified:
+                self.unchanged += 1
+                continue
+            yield response.data
+
+    def published_at(self, payload):
+        published_at = payload.get("published_at")
+        return parse_datetime(published_at) if published_at else None
+
+    async def skip_known(self, vacancies):
+        """
+        Отсеивает вакансии, которые уже есть в базе с той же датой публикации
+        (HH обновляет ее при изменении вакансии), до запроса подробностей.
+        """
+        stored = await sync_to_async(get_stored_published_at)(
+            f"{self.platform}{vacancy['id']}" for vacancy in vacancies
+        )
+
+        def is_known(vacancy):
+            stored_at = stored.get(f"{self.platform}{vacancy['id']}")
+            published_at = vacancy.get("published_at")
+            return bool(stored_at and published_at) and (
+                parse_datetime(published_at) == stored_at
+            )
+
+        changed = [vacancy for vacancy in vacancies if not is_known(vacancy)]
+        self.known += len(vacancies) - len(changed)
+        return changed
+
+    @staticmethod
+    async def list_vacancies(api_client, params):
+        responses = await api_client.get(urls=[BASE_URL], params=params)
+        if isinstance(responses[0], Exception):
+            raise responses[0]
+        return responses[0]
+
+    async def list_pages(self, api_client):
+        params = {
+            **self.params,
+            "order_by": "publication_time",
+            "per_page": LIST_PER_PAGE,
+        }
+        if not self.incremental:
+            return await self.list_window(api_client, params)
 
-async def fetch_hh_vacancies(params: dict | None = None):
-    base_url = "https://api.hh.ru/vacancies"
-    headers = {"User-Agent": "HH-User-Agent"}
-    api_client = HTTPClient(base_url, headers)
-    urls = [base_url]
+        watermark = await sync_to_async(get_watermark)(self.platform, self.params)
+        date_to = timezone.now()
+        date_from = watermark or date_to - timedelta(days=CRAWL_DAYS)
+        vacancies = await self.list_split(api_client, params, Window(date_from, date_to))
+        # Соседние окна делят границу: вакансия на ней приходит дважды.
+        return list({vacancy["id"]: vacancy for vacancy in vacancies}.values())
 
-    responses = await api_client.get(urls=urls, params=params)
-    vacancies = responses[0].get("items")
+    async def list_split(self, api_client, params, window):
+        """
+        Листает окно дат; окно, в котором найдено больше MAX_LIST_DEPTH
+        вакансий, делится пополам, чтобы не потерять вакансии за пределом.
+        """
+        params = {
+            **params,
+            "date_from": window.date_from.strftime(DATE_FORMAT),
+            "date_to": window.date_to.strftime(DATE_FORMAT),
+        }
+        first_page = await self.list_vacancies(api_client, {**params, "page": 0})
+        found = first_page.get("found", 0)
+        if found > MAX_LIST_DEPTH:
+            if window.date_to - window.date_from > MIN_WINDOW:
+                newer, older = reversed(window.split())
+                return [
+                    *await self.list_split(api_client, params, newer),
+                    *await self.list_split(api_client, params, older),
+                ]
+            logger.warning(
+                f"Окно {window.key} HH: найдено {found}, "
+                f"площадка отдаст только {MAX_LIST_DEPTH}"
+            )
+        return await self.list_window(api_client, params, first_page, window.date_from)
 
-    if not vacancies:
-        raise ValueError("Vacancy not found")
+    async def list_window(self, api_client, params, response=None, date_from=None):
+        vacancies = []
+        for page in range(MAX_LIST_DEPTH // LIST_PER_PAGE):
+            if page or response is None:
+                response = await self.list_vacancies(
+                    api_client, {**params, "page": page}
+                )
+            items = response.get("items") or []
+            # date_from включает границу: вакансии с датой отметки уже могли
+            # быть сохранены, их отсеют skip_known и условные запросы.
+            new_items = [
+                item
+                for item in items
+                if date_from is None or parse_datetime(item["published_at"]) >= date_from
+            ]
+            for item in new_items:
+                self.seen(parse_datetime(item["published_at"]))
+            vacancies.extend(new_items)
+            if len(new_items) < len(items) or page + 1 >= response.get("pages", 0):
+                break
+        return vacancies
 
-    urls = [f"{base_url}/{vacancy['id']}" for vacancy in vacancies]
-    responses = await api_client.get(urls=urls)
 
-    vacancies = [
-        response for response in responses if not isinstance(response, Exception)
-    ]
-    if not vacancies:
-        logger.warning("No vacancy found in hh api")
-        raise ValueError("Vacancy not found")
-    return vacancies
+async def count_hh_vacancies(params: dict) -> int:
+    api_client = HTTPClient(BASE_URL, HEADERS)
+    response = await HhCrawl.list_vacancies(api_client, {**params, "per_page": 1})
+    return response.get("found", 0)
@@ -1,47 +1,55 @@
 import logging
 from typing import Any
 
-from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 
-from app.services.vacancies.models import Vacancy
+from app.services.vacancies.utils.crawl_state import CrawlSource
+from app.services.vacancies.utils.search_cache import ainvalidate_search_cache
+from app.services.vacancies.utils.sources import SourceAdapter
 
 logger = logging.getLogger(__name__)
 
 
-async def process_vacancies(
-    fetch_vacancies, transform_data, params: dict[str, Any] | None = None
+async def process_vacancy_stream(
+    source: SourceAdapter,
+    params: dict[str, Any] | None = None,
+    incremental: bool = False,
 ) -> JsonResponse:
+    """
+    Загружает вакансии источника через IngestPipeline: сохранение идет
+    параллельно с получением, сырые ответы площадки не копятся в памяти.
+    """
+    stream = source.stream(params, incremental=incremental)
     try:
-        vacancies = await fetch_vacancies(params)
-        for vacancy in vacancies:
-            await save_vacancy(transform_data, vacancy)
-    except ValueError as e:
-        logger.error(str(e))
-        return JsonResponse(
-            {"status": "error", "message": "Vacancies not found"},
-            status=404,
-        )
+        stats = await source.ingest(stream)
+        # Пустой обход с состоянием допустим: вакансии могли не измениться.
+        if not isinstance(stream, CrawlSource) and not stats["fetch"].items:
+            raise ValueError("Vacancy not found")
+        await ainvalidate_search_cache()
     except Exception as e:
-        logger.error(str(e))
-        return JsonResponse(
-            {"status": "error", "message": "Ошибка при парсинге"},
-            status=500,
-        )
+        return error_response(e)
+    saved = stats["save"].items
     return JsonResponse(
         {
             "status": "success",
-            "vacancies": vacancies,
-            "message": f"Успешно сохранено {len(vacancies)} вакансий",
+            "saved": saved,
+            "unchanged": getattr(stream, "unchanged", 0),
+            "known": getattr(stream, "known", 0),
+            "stages": {name: stage.as_dict() for name, stage in stats.items()},
+            "message": f"Успешно сохранено {saved} вакансий",
         },
         status=200,
     )
 
 
-@sync_to_async
-def save_vacancy(transform_data, item):
-    transformed_data = transform_data(item)
-    Vacancy.objects.update_or_create(
-        platform_vacancy_id=transformed_data["platform_vacancy_id"],
-        defaults=transformed_data,
+def error_response(error: Exception) -> JsonResponse:
+    logger.error(str(error))
+    if isinstance(error, ValueError):
+        return JsonResponse(
+            {"status": "error", "message": "Vacancies not found"},
+            status=404,
+        )
+    return JsonResponse(
+        {"status": "error", "message": "Ошибка при парсинге"},
+        status=500,
     )
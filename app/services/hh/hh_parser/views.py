@@ -1,7 +1,11 @@
-from .utils.data_transformer import transform_hh_data
-from .utils.vacancy_fetcher import fetch_hh_vacancies
-from .utils.vacancy_service import process_vacancies
+from app.services.vacancies.utils.sources import get_source
 
+from .utils.vacancy_service import process_vacancy_stream
 
-async def hh_vacancy_parse(request=None, params: dict | None = None):
-    return await process_vacancies(fetch_hh_vacancies, transform_hh_data, params=params)
+
+async def hh_vacancy_parse(
+    request=None, params: dict | None = None, incremental: bool = False
+):
+    return await process_vacancy_stream(
+        get_source("hh"), params=params, incremental=incremental
+    )
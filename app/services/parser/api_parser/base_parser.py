@@ -1,20 +1,25 @@
 import logging
 import os
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from app.parser import get_fixture_data, save_data
+from .rate_limiter import get_rate_limiter
+from .region_index import build_region_index, load_region_index
 
 
 class BaseVacancyParser:
     API_URL = None
     HEADERS = None
-    DEFAULT_DELAY = 0.3
-    CACHE_FILE = os.path.join(os.path.dirname(__file__), 'city_region_mapping.json')
+    # Частота запросов к API площадки (в секунду) и число потоков,
+    # которые параллельно запрашивают подробные страницы вакансий.
+    RATE_LIMIT = 10
+    RATE_BURST = 5
+    MAX_WORKERS = 8
+    INDEX_FILE = os.path.join(os.path.dirname(__file__), 'city_region_mapping.idx')
 
     def __init__(self):
         self.session = requests.Session()
@@ -23,13 +28,18 @@ class BaseVacancyParser:
             backoff_factor=0.5,
             status_forcelist=[429, 500, 502, 503, 504]
         )
-        self.session.mount('https://', HTTPAdapter(max_retries=retries))
+        adapter = HTTPAdapter(max_retries=retries, pool_maxsize=self.MAX_WORKERS)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.rate_limiter = get_rate_limiter(
+            self.API_URL, self.RATE_LIMIT, self.RATE_BURST
+        )
 
     def fetch_data(self, params=None, item_id=None):
         url = self.API_URL
         if item_id:
             url = f"{self.API_URL}/{item_id}"
-            time.sleep(self.DEFAULT_DELAY)
+        self.rate_limiter.acquire()
 
         response = None
         try:
@@ -55,6 +65,15 @@ class BaseVacancyParser:
     def fetch_item_details(self, item_id):
         return self.fetch_data(item_id=item_id)
 
+    def fetch_items_details(self, item_ids):
+        """Подробные данные в порядке item_ids, до MAX_WORKERS запросов сразу."""
+        item_ids = list(item_ids)
+        if not item_ids:
+            return []
+        workers = min(self.MAX_WORKERS, len(item_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.fetch_item_details, item_ids))
+
     def parse_description(self, description):
         return BeautifulSoup(description or '', 'html.parser').get_text()
 
@@ -102,9 +121,14 @@ class BaseVacancyParser:
         return str(field_data)
 
     def get_city_to_region_mapping(self, source='hh'):
-        if os.path.exists(self.CACHE_FILE):
-            return get_fixture_data(self.CACHE_FILE)
+        if os.path.exists(self.INDEX_FILE):
+            return load_region_index(self.INDEX_FILE)
 
+        mapping = self.fetch_region_mapping(source)
+        build_region_index(mapping, self.INDEX_FILE)
+        return mapping
+
+    def fetch_region_mapping(self, source='hh'):
         if source == 'hh':
             url = 'https://api.hh.ru/areas'
         elif source == 'superjob':
@@ -125,16 +149,9 @@ class BaseVacancyParser:
             raise ValueError(f"Error fetching areas: {status}")
 
         areas = response.json()
-        mapping = {}
-
         if source == 'hh':
-            mapping = self.parse_hh_areas(areas)
-
-        elif source == 'superjob':
-            mapping = self.parse_superjob_areas(areas)
-
-        save_data(self.CACHE_FILE, mapping)
-        return mapping
+            return self.parse_hh_areas(areas)
+        return self.parse_superjob_areas(areas)
 
     def parse_hh_areas(self, areas):
         mapping = {}
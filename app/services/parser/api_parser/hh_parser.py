@@ -15,13 +15,8 @@ class HhVacancyParser(BaseVacancyParser):
 
     def parse_vacancies(self, search_params):
         vacancy_ids = self.fetch_vacancies_list(search_params)
-        vacancies = []
-
-        for vacancy_id in vacancy_ids:
-            item = self.fetch_item_details(vacancy_id)
-            vacancies.append(self.parse_vacancy(item))
-
-        return vacancies
+        items = self.fetch_items_details(vacancy_ids)
+        return [self.parse_vacancy(item) for item in items]
 
     def parse_vacancy(self, item):
         salary_data = item.get('salary', {})
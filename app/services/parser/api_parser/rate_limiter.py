@@ -0,0 +1,42 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Ограничение частоты запросов для потоков: rate запросов в секунду,
+    запас burst. Каждый вызов acquire резервирует свой интервал под
+    блокировкой, а ждет уже без нее, поэтому потоки идут по очереди.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key, rate, burst=1):
+    """Общий для процесса ограничитель: парсер создается на каждый запрос."""
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(rate, burst)
+        return _limiters[key]
@@ -0,0 +1,159 @@
+"""
+Компактный индекс город -> регион в бинарном файле.
+
+Формат (все числа little-endian):
+
+    заголовок   magic "CRX1", число городов N, число регионов R
+    города      N + 1 смещений (u32) в блок названий городов
+    регионы     N номеров регионов (u16)
+    регионы     R + 1 смещений (u32) в блок названий регионов
+    блок названий городов в UTF-8, отсортированных по байтам
+    блок названий регионов в UTF-8 (каждый регион хранится один раз)
+
+Файл открывается через mmap и не копируется в память процесса:
+поиск — бинарный поиск по отсортированным названиям городов.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Iterator, Mapping
+
+MAGIC = b"CRX1"
+HEADER = struct.Struct("<4sII")
+OFFSET = struct.Struct("<I")
+REGION_ID = struct.Struct("<H")
+MAX_REGIONS = 2**16
+
+
+def build_region_index(mapping: Mapping[str, str], path: str) -> None:
+    """Записывает сопоставление город -> регион в бинарный индекс."""
+    regions = sorted(set(mapping.values()))
+    if len(regions) >= MAX_REGIONS:
+        raise ValueError(f"Слишком много регионов: {len(regions)}")
+    region_ids = {region: i for i, region in enumerate(regions)}
+    cities = sorted(
+        (city.encode(), region_ids[region]) for city, region in mapping.items()
+    )
+
+    city_offsets, city_blob = pack_strings(name for name, _ in cities)
+    region_offsets, region_blob = pack_strings(region.encode() for region in regions)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(cities), len(regions)))
+        f.write(city_offsets)
+        f.write(b"".join(REGION_ID.pack(region_id) for _, region_id in cities))
+        f.write(region_offsets)
+        f.write(city_blob)
+        f.write(region_blob)
+    os.replace(tmp_path, path)
+
+
+def pack_strings(strings: Iterator[bytes]) -> tuple[bytes, bytes]:
+    offsets = [0]
+    blob = bytearray()
+    for value in strings:
+        blob += value
+        offsets.append(len(blob))
+    return b"".join(OFFSET.pack(offset) for offset in offsets), bytes(blob)
+
+
+class CompiledRegionIndex(Mapping):
+    """
+    Только для чтения: индекс из build_region_index, открытый через mmap.
+
+    Таблицы смещений читаются через memoryview без копирования
+    (формат little-endian совпадает с порядком байт x86 и ARM).
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.city_count, self.region_count = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            self.buffer.close()
+            raise ValueError(f"Неизвестный формат индекса регионов: {path}")
+
+        view = memoryview(self.buffer)
+        position = HEADER.size
+        self.city_offsets, position = self.table(
+            view, position, "I", self.city_count + 1
+        )
+        self.region_ids, position = self.table(view, position, "H", self.city_count)
+        self.region_offsets, position = self.table(
+            view, position, "I", self.region_count + 1
+        )
+        self.cities = view[position : position + self.city_offsets[-1]]
+        position += self.city_offsets[-1]
+        self.regions = view[position : position + self.region_offsets[-1]]
+
+    @staticmethod
+    def table(view: memoryview, position: int, code: str, count: int):
+        end = position + count * struct.calcsize(code)
+        return view[position:end].cast(code), end
+
+    def city(self, i: int) -> bytes:
+        return self.cities[self.city_offsets[i] : self.city_offsets[i + 1]].tobytes()
+
+    def region(self, i: int) -> str:
+        region_id = self.region_ids[i]
+        start, end = self.region_offsets[region_id], self.region_offsets[region_id + 1]
+        return str(self.regions[start:end], "utf-8")
+
+    def find(self, city: str) -> int | None:
+        key = city.encode()
+        low, high = 0, self.city_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.city(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.city_count and self.city(low) == key:
+            return low
+        return None
+
+    def __getitem__(self, city: str) -> str:
+        i = self.find(city) if isinstance(city, str) else None
+        if i is None:
+            raise KeyError(city)
+        return self.region(i)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.city(i).decode() for i in range(self.city_count))
+
+    def __len__(self) -> int:
+        return self.city_count
+
+    def close(self) -> None:
+        for view in (
+            self.city_offsets,
+            self.region_ids,
+            self.region_offsets,
+            self.cities,
+            self.regions,
+        ):
+            view.release()
+        self.buffer.close()
+
+
+_indexes: dict[str, tuple[float, CompiledRegionIndex]] = {}
+_lock = threading.Lock()
+
+
+def load_region_index(path: str) -> CompiledRegionIndex:
+    """
+    Возвращает общий для процесса индекс; файл переоткрывается при смене
+    mtime, а mmap прежнего индекса закрывается.
+    """
+    mtime = os.stat(path).st_mtime
+    with _lock:
+        cached = _indexes.get(path)
+        if cached is None or cached[0] != mtime:
+            _indexes[path] = (mtime, CompiledRegionIndex(path))
+            if cached is not None:
+                cached[1].close()
+        return _indexes[path][1]
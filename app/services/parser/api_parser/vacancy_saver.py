@@ -1,5 +1,25 @@
+import logging
+
+from django.core.exceptions import ValidationError
+from django.db import DataError, IntegrityError, transaction
+
 from app.services.parser.models import HhVacancy, SuperjobVacancy
 
+SOURCES = {
+    'hh': (HhVacancy, 'hh_id'),
+    'superjob': (SuperjobVacancy, 'superjob_id'),
+}
+
+
+def error_message(error):
+    if isinstance(error, IntegrityError):
+        return "Конфликт уникальности данных"
+    if isinstance(error, DataError):
+        return f"Проблемы с типа данных {str(error)}"
+    if isinstance(error, (KeyError, ValueError, TypeError, ValidationError)):
+        return f"Проблема с данными: {str(error)}"
+    return f"Обнаружена непредвиденная ошибка  {str(error)}"
+
 
 class VacancySaver:
     def save_vacancy(self, vacancy_data, source='hh'):
@@ -15,3 +35,62 @@ class VacancySaver:
                 superjob_id=vacancy_data.get('superjob_id'),
                 defaults=vacancy_data
             )
+
+    def save_many(self, vacancies, source='hh'):
+        """
+        Сохраняет вакансии одной транзакцией (INSERT ... ON CONFLICT по
+        hh_id/superjob_id). Строка с ошибкой не прерывает сохранение
+        остальных: возвращает число сохраненных и список ошибок.
+        """
+        model, key = SOURCES[source]
+        errors = []
+        instances = {}
+        for vacancy_data in vacancies:
+            try:
+                instance = model(**vacancy_data)
+                self.convert_fields(instance)
+            except Exception as e:
+                errors.append(error_message(e))
+                continue
+            instances[getattr(instance, key)] = instance
+
+        saved_count = 0
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    self.upsert(model, key, list(instances.values()))
+                saved_count = len(instances)
+            except (IntegrityError, DataError, ValueError) as e:
+                # Пачка не записалась: сохраняем по строке, каждую в
+                # своей точке сохранения, чтобы найти ошибочные.
+                logging.warning(f"Пачка вакансий {source} не сохранена: {e}")
+                for instance in instances.values():
+                    try:
+                        with transaction.atomic():
+                            self.upsert(model, key, [instance])
+                        saved_count += 1
+                    except Exception as e:
+                        errors.append(error_message(e))
+        return saved_count, errors
+
+    def convert_fields(self, instance):
+        # Приводит значения к типам полей, как это делает update_or_create
+        # при записи, чтобы ошибка типа относилась к своей строке.
+        for field in instance._meta.concrete_fields:
+            value = getattr(instance, field.attname)
+            if value is not None:
+                setattr(instance, field.attname, field.to_python(value))
+
+    def upsert(self, model, key, instances):
+        if not instances:
+            return
+        update_fields = [
+            field.name for field in model._meta.concrete_fields
+            if not field.primary_key and field.name not in (key, 'created_at')
+        ]
+        model.objects.bulk_create(
+            instances,
+            update_conflicts=True,
+            unique_fields=[key],
+            update_fields=update_fields,
+        )
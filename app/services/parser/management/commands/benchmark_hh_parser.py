@@ -0,0 +1,115 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from app.services.parser.api_parser.hh_parser import HhVacancyParser
+from app.services.parser.api_parser.rate_limiter import RateLimiter
+
+DETAIL_PATH = re.compile(r"^/vacancies/(\d+)")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        match = DETAIL_PATH.match(self.path)
+        if match:
+            # Подробная страница: задержка как у ответа API площадки.
+            time.sleep(self.server.latency)
+            data = {
+                "id": match.group(1),
+                "name": f"Python Developer {match.group(1)}",
+                "area": {"name": "Москва"},
+            }
+        else:
+            data = {"items": [{"id": str(i)} for i in range(self.server.vacancies)]}
+        with self.server.lock:
+            self.server.requests += 1
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, vacancies=100, latency=0.05):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.vacancies = vacancies
+        self.latency = latency
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/vacancies"
+
+
+class LegacyHhVacancyParser(HhVacancyParser):
+    """Прежнее поведение: вакансии по одной, пауза 0.3 с перед каждой."""
+
+    DELAY = 0.3
+
+    def fetch_items_details(self, item_ids):
+        items = []
+        for item_id in item_ids:
+            time.sleep(self.DELAY)
+            items.append(self.fetch_item_details(item_id))
+        return items
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время HhVacancyParser.parse_vacancies на локальном "
+        "stub-сервере: прежние последовательные запросы с паузой и пул "
+        "потоков с ограничением частоты."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--vacancies", type=int, default=100, help="Вакансий в выдаче"
+        )
+        parser.add_argument(
+            "--latency", type=float, default=0.05, help="Задержка ответа, с"
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=HhVacancyParser.RATE_LIMIT,
+            help="Ограничение запросов в секунду",
+        )
+
+    def handle(self, *args, **options):
+        server = StubServer(options["vacancies"], options["latency"])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        parsers = {
+            "legacy": LegacyHhVacancyParser,
+            "pooled": HhVacancyParser,
+        }
+        self.stdout.write(f"{'parser':>8} {'seconds':>8} {'vacancies':>10}")
+        try:
+            for name, parser_class in parsers.items():
+                seconds, vacancies = measure(parser_class(), server.url, options["rate"])
+                self.stdout.write(f"{name:>8} {seconds:>8.2f} {vacancies:>10}")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def measure(parser, url, rate):
+    parser.API_URL = url
+    # Свой ограничитель на прогон: общий для API_URL помнит прошлый прогон.
+    parser.rate_limiter = RateLimiter(rate, parser.RATE_BURST)
+    started = time.perf_counter()
+    vacancies = parser.parse_vacancies({})
+    return time.perf_counter() - started, len(vacancies)
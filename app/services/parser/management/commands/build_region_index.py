@@ -0,0 +1,64 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.parser import get_fixture_data
+from app.services.parser.api_parser.base_parser import BaseVacancyParser
+from app.services.parser.api_parser.region_index import (
+    build_region_index,
+    load_region_index,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Собирает бинарный индекс город -> регион из справочников "
+        "HH /areas и SuperJob /regions/combined/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sources",
+            nargs="+",
+            choices=["hh", "superjob"],
+            default=["hh", "superjob"],
+            help="Площадки в порядке приоритета при совпадении названий",
+        )
+        parser.add_argument(
+            "--from-json",
+            help="Собрать из готового JSON-сопоставления вместо запросов к API",
+        )
+        parser.add_argument(
+            "--output",
+            default=BaseVacancyParser.INDEX_FILE,
+            help="Путь к файлу индекса",
+        )
+
+    def handle(self, *args, **options):
+        if options["from_json"]:
+            mapping = get_fixture_data(options["from_json"])
+        else:
+            mapping = self.fetch_mapping(options["sources"])
+        if not mapping:
+            raise CommandError("Сопоставление городов и регионов пустое")
+
+        build_region_index(mapping, options["output"])
+        index = load_region_index(options["output"])
+        self.stdout.write(
+            f"Индекс {options['output']}: городов {len(index)}, "
+            f"регионов {index.region_count}, "
+            f"{os.path.getsize(options['output']) / 1024:.1f} KiB"
+        )
+
+    @staticmethod
+    def fetch_mapping(sources):
+        parser = BaseVacancyParser()
+        mapping = {}
+        for source in sources:
+            try:
+                areas = parser.fetch_region_mapping(source)
+            except ValueError as e:
+                raise CommandError(f"{source}: {e}")
+            for city, region in areas.items():
+                mapping.setdefault(city, region)
+        return mapping
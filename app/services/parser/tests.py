@@ -1,4 +1,8 @@
+import json
 import os
+import tempfile
+import threading
+import time
 from http import HTTPStatus
 from unittest.mock import MagicMock, patch
 
@@ -9,8 +13,15 @@ from app.settings import FIXTURE_PATH
 
 from .api_parser.base_parser import BaseVacancyParser
 from .api_parser.hh_parser import HhVacancyParser
+from .api_parser.rate_limiter import RateLimiter
+from .api_parser.region_index import (
+    CompiledRegionIndex,
+    build_region_index,
+    load_region_index,
+)
 from .api_parser.superjob_parser import SuperjobVacancyParser
 from .api_parser.vacancy_saver import VacancySaver
+from .management.commands.benchmark_hh_parser import StubServer
 from .models import HhVacancy, SuperjobVacancy
 from .views import base_vacancy_parser
 
@@ -30,6 +41,16 @@ class VacancyTest(TestCase):
 
         self.mock_request = MagicMock()
 
+        # Индекс город -> регион не хранится в репозитории: тесты собирают
+        # свой, чтобы не обращаться к API площадок.
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        index_file = os.path.join(tmp.name, 'regions.idx')
+        build_region_index({'Екатеринбург': 'Свердловская область'}, index_file)
+        index_patch = patch.object(BaseVacancyParser, 'INDEX_FILE', index_file)
+        index_patch.start()
+        self.addCleanup(index_patch.stop)
+
     @patch('app.services.parser.api_parser.base_parser.BaseVacancyParser.fetch_data')
     def test_hh_parser_fetch_vacancies(self, mock_fetch):
         mock_fetch.return_value = self.hh_list
@@ -51,11 +72,10 @@ class VacancyTest(TestCase):
 
     @patch('app.services.parser.api_parser.base_parser.BaseVacancyParser.fetch_data')
     def test_hh_parser_parse_vacancies(self, mock_fetch):
-        mock_fetch.side_effect = [
-            self.hh_list,
-            self.hh_list['items'][0],
-            self.hh_list['items'][1]
-        ]
+        details = {item['id']: item for item in self.hh_list['items']}
+        mock_fetch.side_effect = lambda params=None, item_id=None: (
+            details[item_id] if item_id else self.hh_list
+        )
         parser = HhVacancyParser()
         result = parser.parse_vacancies({})
 
@@ -66,6 +86,37 @@ class VacancyTest(TestCase):
         self.assertEqual(result[1]['hh_id'], "87654321")
         self.assertEqual(result[1]['title'], "Backend Developer (Python)")
 
+    def test_hh_parser_fetches_details_concurrently(self):
+        server = StubServer(vacancies=16, latency=0.1)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        parser = HhVacancyParser()
+        parser.API_URL = server.url
+        parser.rate_limiter = RateLimiter(1000, burst=16)
+        started = time.perf_counter()
+        result = parser.parse_vacancies({})
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual([item['hh_id'] for item in result],
+                         [str(i) for i in range(16)])
+        self.assertEqual(result[3]['title'], 'Python Developer 3')
+        self.assertEqual(server.requests, 17)
+        # По одной 16 вакансий с задержкой 0.1 с загружались бы 1.6 с.
+        self.assertLess(elapsed, 0.8)
+
+    def test_rate_limiter_spaces_requests_across_threads(self):
+        limiter = RateLimiter(rate=20, burst=1)
+        started = time.perf_counter()
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertGreaterEqual(time.perf_counter() - started, 4 / 20 - 0.01)
+
     @patch('app.services.parser.api_parser.base_parser.BaseVacancyParser.fetch_data')
     def test_sj_parser_parse_vacancies(self, mock_fetch):
         mock_fetch.return_value = self.sj_list
@@ -117,6 +168,44 @@ class VacancyTest(TestCase):
         vacancy = HhVacancy.objects.get(hh_id=999)
         self.assertEqual(vacancy.title, 'Test Vacancy Update')
 
+    def test_vacancy_saver_save_many(self):
+        saver = VacancySaver()
+        saver.save_vacancy({**self.hh_vacancy_saver, 'hh_id': '1000',
+                            'url': 'http://test.com/1000'}, source='hh')
+        vacancies = [
+            self.hh_vacancy_saver,
+            {**self.hh_vacancy_saver, 'hh_id': '1001', 'url': 'http://test.com/1001'},
+            {**self.hh_vacancy_saver, 'hh_id': '1002', 'published_at': 'вчера'},
+            # url уже занят вакансией 1000: строка не сохранится.
+            {**self.hh_vacancy_saver, 'hh_id': '1003', 'url': 'http://test.com/1000'},
+            self.hh_vacancy_saver_update,
+        ]
+
+        saved_count, errors = saver.save_many(vacancies, source='hh')
+
+        self.assertEqual(saved_count, 2)
+        self.assertEqual(len(errors), 2)
+        self.assertIn("Конфликт уникальности данных", errors)
+        self.assertEqual(HhVacancy.objects.get(hh_id=999).title, 'Test Vacancy Update')
+        self.assertEqual(
+            sorted(HhVacancy.objects.values_list('hh_id', flat=True)),
+            [999, 1000, 1001],
+        )
+
+    def test_base_vacancy_parser_reports_throughput(self):
+        parser_class = MagicMock()
+        parser_class.return_value.parse_vacancies.return_value = [
+            self.hh_vacancy_saver, {**self.hh_vacancy_saver, 'hh_id': 'x'}]
+
+        response = base_vacancy_parser(
+            self.mock_request, parser_class, HhVacancy, {})
+        data = json.loads(response.content)
+
+        self.assertEqual(data['saved_count'], 1)
+        self.assertEqual(len(data['errors']), 1)
+        self.assertEqual(data['stats']['parsed'], 2)
+        self.assertIn('saved_per_second', data['stats'])
+
     @patch('app.services.parser.views.HhVacancyParser')
     def test_base_vacancy_parser_success(self, mock_parser):
         mock_instance = mock_parser.return_value
@@ -183,27 +272,27 @@ class VacancyTest(TestCase):
 
     @patch('app.services.parser.api_parser.base_parser.requests.get')
     @patch('app.services.parser.api_parser.base_parser.os.path.exists')
-    @patch('app.services.parser.api_parser.base_parser.get_fixture_data')
-    @patch('app.services.parser.api_parser.base_parser.save_data')
+    @patch('app.services.parser.api_parser.base_parser.load_region_index')
+    @patch('app.services.parser.api_parser.base_parser.build_region_index')
     def test_get_city_to_region_mapping_from_cache(self,
-                                                   mock_save,
-                                                   mock_get_fixture,
+                                                   mock_build,
+                                                   mock_load_index,
                                                    mock_exists,
                                                    mock_get):
         mock_exists.return_value = True
-        mock_get_fixture.return_value = {'Москва': 'Москва'}
+        mock_load_index.return_value = {'Москва': 'Москва'}
 
         parser = BaseVacancyParser()
         mapping = parser.get_city_to_region_mapping(source='hh')
 
-        mock_get_fixture.assert_called_once_with(parser.CACHE_FILE)
+        mock_load_index.assert_called_once_with(parser.INDEX_FILE)
         mock_get.assert_not_called()
-        mock_save.assert_not_called()
+        mock_build.assert_not_called()
         self.assertEqual(mapping, {'Москва': 'Москва'})
 
     @patch('requests.Session.get')
     @patch('app.services.parser.api_parser.base_parser.os.path.exists')
-    @patch('app.services.parser.api_parser.base_parser.save_data')
+    @patch('app.services.parser.api_parser.base_parser.build_region_index')
     def test_get_city_to_region_mapping_fetch_hh(self, mock_save, mock_exists, mock_get):
         mock_exists.return_value = False
 
@@ -216,17 +305,17 @@ class VacancyTest(TestCase):
         mapping = parser.get_city_to_region_mapping(source='hh')
 
         mock_get.assert_called_once_with('https://api.hh.ru/areas', timeout=10)
-        mock_save.assert_called_once_with(parser.CACHE_FILE, {
+        mock_save.assert_called_once_with({
             'Москва': 'Москва',
             'Подмосковье': 'Московская область'
-        })
+        }, parser.INDEX_FILE)
         self.assertEqual(mapping, {
             'Москва': 'Москва',
             'Подмосковье': 'Московская область'})
 
     @patch('requests.Session.get')
     @patch('app.services.parser.api_parser.base_parser.os.path.exists')
-    @patch('app.services.parser.api_parser.base_parser.save_data')
+    @patch('app.services.parser.api_parser.base_parser.build_region_index')
     def test_get_city_to_region_mapping_fetch_superjob(self,
                                                        mock_save,
                                                        mock_exists,
@@ -246,12 +335,46 @@ class VacancyTest(TestCase):
             timeout=10
         )
         mock_save.assert_called_once_with(
-            parser.CACHE_FILE, {
+            {
                 'Москва': 'Москва',
                 'Подмосковье': 'Московская область',
-                'Санкт-Петербург': 'Санкт-Петербург'})
+                'Санкт-Петербург': 'Санкт-Петербург'}, parser.INDEX_FILE)
         self.assertEqual(
             mapping, {
                 'Москва': 'Москва',
                 'Подмосковье': 'Московская область',
                 'Санкт-Петербург': 'Санкт-Петербург'})
+
+    def test_compiled_region_index(self):
+        mapping = {
+            'Москва': 'Москва',
+            'Подмосковье': 'Московская область',
+            'Зеленоград': 'Москва',
+            'Екатеринбург': 'Свердловская область',
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'regions.idx')
+            build_region_index(mapping, path)
+            index = CompiledRegionIndex(path)
+
+            self.assertEqual(dict(index), mapping)
+            self.assertEqual(index.region_count, 3)
+            self.assertEqual(index.get('Зеленоград'), 'Москва')
+            self.assertEqual(index.get('Казань', 'Unknown'), 'Unknown')
+            self.assertNotIn('', index)
+            index.close()
+
+    def test_load_region_index_closes_replaced_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'regions.idx')
+            build_region_index({'Москва': 'Москва'}, path)
+            old = load_region_index(path)
+            self.assertIs(load_region_index(path), old)
+
+            build_region_index({'Казань': 'Татарстан'}, path)
+            os.utime(path, (0, 0))
+            new = load_region_index(path)
+
+            self.assertTrue(old.buffer.closed)
+            self.assertEqual(dict(new), {'Казань': 'Татарстан'})
+            new.close()
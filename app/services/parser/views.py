@@ -1,4 +1,5 @@
-from django.db import DataError, IntegrityError
+import time
+
 from django.http import JsonResponse
 
 from .api_parser.hh_parser import HhVacancyParser
@@ -10,30 +11,25 @@ from .models import HhVacancy, SuperjobVacancy
 def base_vacancy_parser(request, parser_class, model, search_params):
     parser = parser_class()
     saver = VacancySaver()
-    saved_count = 0
-    errors = []
+    source = 'hh' if model is HhVacancy else 'superjob'
 
+    started = time.perf_counter()
     vacancies = parser.parse_vacancies(search_params)
-    for vacancy_data in vacancies:
-        try:
-            source = 'hh' if isinstance(parser, HhVacancyParser) else 'superjob'
-            saver.save_vacancy(vacancy_data, source=source)
-            saved_count += 1
-
-        except IntegrityError:
-            errors.append("Конфликт уникальности данных")
-        except DataError as e:
-            errors.append(f"Проблемы с типа данных {str(e)}")
-        except (KeyError, ValueError) as e:
-            errors.append(f"Проблема с данными: {str(e)}")
-        except Exception as e:
-            errors.append(f"Обнаружена непредвиденная ошибка  {str(e)}")
-            continue
+    parsed_at = time.perf_counter()
+    saved_count, errors = saver.save_many(vacancies, source=source)
+    save_seconds = time.perf_counter() - parsed_at
 
     return JsonResponse({
         'status': 'success',
         'saved_count': saved_count,
         'errors': errors,
+        'stats': {
+            'parsed': len(vacancies),
+            'parse_seconds': round(parsed_at - started, 3),
+            'save_seconds': round(save_seconds, 3),
+            'saved_per_second': round(saved_count / save_seconds, 1)
+            if save_seconds else None,
+        },
         'message': f'Успешно сохранено {saved_count} вакансий'
     }, status=200)
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SuperjobParserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app.services.superjob.superjob_parser"
+
+    def ready(self):
+        from .utils import source  # noqa: F401
@@ -1,16 +1,12 @@
 import asyncio
+import os
 from datetime import datetime
-from http import HTTPStatus
 from unittest.mock import AsyncMock, patch
 
 from django.http import JsonResponse
 from django.test import TransactionTestCase
 from django.utils import timezone
 
-from app.services.hh.hh_parser.utils.vacancy_service import (
-    process_vacancies,
-    save_vacancy,
-)
 from app.services.superjob.superjob_parser.utils.data_transformer import (
     extract_city,
     extract_company,
@@ -18,11 +14,9 @@ from app.services.superjob.superjob_parser.utils.data_transformer import (
     parse_published_at,
     transform_superjob_data,
 )
-from app.services.superjob.superjob_parser.utils.vacancy_fetcher import (
-    fetch_superjob_vacancies,
-)
 from app.services.superjob.superjob_parser.views import superjob_vacancy_parse
-from app.services.vacancies.models import City, Company, Platform, Vacancy
+from app.services.vacancies.models import City, Platform, Vacancy
+from app.services.vacancies.utils.sources import get_source
 
 
 class SuperJobParserTests(TransactionTestCase):
@@ -47,6 +41,10 @@ class SuperJobParserTests(TransactionTestCase):
             "town": {"title": "Moscow"},
         }
 
+    @staticmethod
+    async def crawl(params=None):
+        return [item async for item in get_source("superjob").stream(params)]
+
     def test_format_salary_variants(self):
         from app.services.hh.hh_parser.utils.data_transformer import (
             format_salary,
@@ -67,17 +65,13 @@ class SuperJobParserTests(TransactionTestCase):
         self.assertEqual(format_salary(None), "По договоренности")
 
     def test_extract_company(self):
-        comp = extract_company({"client": {"title": "Yandex"}})
-        self.assertIsInstance(comp, Company)
-        self.assertEqual(comp.name, "Yandex")
+        self.assertEqual(extract_company({"client": {"title": "Yandex"}}), "Yandex")
 
         self.assertIsNone(extract_company({"client": {}}))
         self.assertIsNone(extract_company({}))
 
     def test_extract_city(self):
-        city_obj = extract_city({"title": "Saint Petersburg"})
-        self.assertIsInstance(city_obj, City)
-        self.assertEqual(city_obj.name, "Saint Petersburg")
+        self.assertEqual(extract_city({"title": "Saint Petersburg"}), "Saint Petersburg")
 
         self.assertIsNone(extract_city({}))
         self.assertIsNone(extract_city(None))
@@ -98,19 +92,19 @@ class SuperJobParserTests(TransactionTestCase):
         self.assertIsNone(parse_published_at(None))
         self.assertIsNone(parse_published_at(0))
 
-    def test_transform_superjob_data_creates_related(self):
-        self.assertFalse(Platform.objects.filter(name=Platform.SUPER_JOB).exists())
+    def test_transform_superjob_data_returns_names(self):
         transformed = transform_superjob_data(self.sample_item)
 
         self.assertEqual(transformed["title"], "Senior Python Developer")
         self.assertEqual(transformed["salary"], "от 150000 до 250000 RUB")
         self.assertEqual(transformed["platform_vacancy_id"], f"{Platform.SUPER_JOB}456")
 
-        self.assertIsInstance(transformed["platform"], Platform)
-        self.assertIsInstance(transformed["company"], Company)
-        self.assertIsInstance(transformed["city"], City)
+        self.assertEqual(transformed["platform"], Platform.SUPER_JOB)
+        self.assertEqual(transformed["company"], "SuperCompany")
+        self.assertEqual(transformed["city"], "Moscow")
 
-        self.assertTrue(Platform.objects.filter(name=Platform.SUPER_JOB).exists())
+        self.assertFalse(Platform.objects.exists())
+        self.assertFalse(City.objects.exists())
 
     def test_transform_superjob_data_missing_fields(self):
         minimal_item = {
@@ -135,11 +129,12 @@ class SuperJobParserTests(TransactionTestCase):
         "app.services.superjob.superjob_parser.utils.vacancy_fetcher.HTTPClient.get",
         new_callable=AsyncMock,
     )
-    def test_fetch_superjob_vacancies_success(self, mock_get):
+    @patch.dict(os.environ, {"SUPERJOB_API_KEY": "key"})
+    def test_superjob_source_streams_list(self, mock_get):
         response_data = {"objects": [{"id": "1"}, {"id": "2"}]}
         mock_get.return_value = [response_data]
 
-        result = asyncio.run(fetch_superjob_vacancies())
+        result = asyncio.run(self.crawl())
         self.assertEqual(result, [{"id": "1"}, {"id": "2"}])
         mock_get.assert_awaited_once()
 
@@ -147,68 +142,35 @@ class SuperJobParserTests(TransactionTestCase):
         "app.services.superjob.superjob_parser.utils.vacancy_fetcher.HTTPClient.get",
         new_callable=AsyncMock,
     )
-    def test_fetch_superjob_vacancies_empty_objects(self, mock_get):
+    @patch.dict(os.environ, {"SUPERJOB_API_KEY": "key"})
+    def test_superjob_source_empty_objects(self, mock_get):
         mock_get.return_value = [{"objects": []}]
 
         with self.assertRaises(ValueError):
-            asyncio.run(fetch_superjob_vacancies(params={}))
+            asyncio.run(self.crawl({}))
 
     @patch(
         "app.services.superjob.superjob_parser.utils.vacancy_fetcher.os.getenv",
         return_value=None,
     )
-    def test_fetch_superjob_vacancies_missing_api_key(self, mock_getenv):
+    def test_superjob_source_missing_api_key(self, mock_getenv):
         with self.assertRaises(ValueError):
-            asyncio.run(fetch_superjob_vacancies(params={}))
-
-    def test_process_vacancies_success(self):
-        from app.services.hh.hh_parser.utils.vacancy_service import (
-            process_vacancies,
+            asyncio.run(self.crawl({}))
+
+    def test_superjob_source_save_creates_record(self):
+        get_source("superjob").save(
+            [
+                {
+                    "platform_vacancy_id": "sj_123",
+                    "title": "Test SuperJob",
+                    "published_at": timezone.now(),
+                }
+            ]
         )
-
-        async def fake_fetch(params):
-            return [{"id": "1"}]
-
-        def fake_transform(item):
-            return {
-                "platform_vacancy_id": "sj_1",
-                "title": "SuperJob Vacancy",
-                "published_at": timezone.now(),
-            }
-
-        response = asyncio.run(process_vacancies(fake_fetch, fake_transform, {}))
-        self.assertEqual(response.status_code, HTTPStatus.OK.value)
-        self.assertTrue(Vacancy.objects.filter(platform_vacancy_id="sj_1").exists())
-
-    def test_process_vacancies_not_found(self):
-        async def fake_fetch(params):
-            raise ValueError("No vacancies")
-
-        def fake_transform():
-            return {}
-
-        response = asyncio.run(process_vacancies(fake_fetch, fake_transform))
-        self.assertEqual(response.status_code, 404)
-
-        async def fake_fetch(params):
-            raise RuntimeError("API error")
-
-        response = asyncio.run(process_vacancies(fake_fetch, fake_transform))
-        self.assertEqual(response.status_code, 500)
-
-    def test_save_vacancy_creates_record(self):
-        def fake_transform(item):
-            return {
-                "platform_vacancy_id": "sj_123",
-                "title": "Test SuperJob",
-                "published_at": timezone.now(),
-            }
-
-        asyncio.run(save_vacancy(fake_transform, {}))
         self.assertTrue(Vacancy.objects.filter(platform_vacancy_id="sj_123").exists())
 
     @patch(
-        "app.services.superjob.superjob_parser.views.process_vacancies",
+        "app.services.superjob.superjob_parser.views.process_vacancy_stream",
         new_callable=AsyncMock,
     )
     def test_superjob_vacancy_parse_happy_path(self, mock_process):
@@ -223,7 +185,5 @@ class SuperJobParserTests(TransactionTestCase):
         mock_process.return_value = response
         result = asyncio.run(superjob_vacancy_parse(params={"x": 1}))
 
-        mock_process.assert_awaited_with(
-            fetch_superjob_vacancies, transform_superjob_data, params={"x": 1}
-        )
+        mock_process.assert_awaited_with(get_source("superjob"), params={"x": 1})
         self.assertIs(result, response)
\ No newline at end of file
@@ -8,13 +8,14 @@ from app.services.hh.hh_parser.utils.data_transformer import (
     format_salary,
     safe_nested_get,
 )
-from app.services.vacancies.models import City, Company, Platform
+from app.services.vacancies.models import Platform
 
 from .regions_parser import get_sj_city_to_region_mapping
 
 
 def transform_superjob_data(item: dict[str, Any]) -> dict[str, Any]:
-    platform, _ = Platform.objects.get_or_create(name=Platform.SUPER_JOB)
+    """Преобразует вакансию SuperJob в строку для bulk_upsert_vacancies."""
+    platform = Platform.SUPER_JOB
     company = extract_company(item)
     city = extract_city(item.get("town"))
     region = get_sj_city_to_region_mapping(source="superjob")
@@ -28,7 +29,7 @@ def transform_superjob_data(item: dict[str, Any]) -> dict[str, Any]:
     return {
         "platform": platform,
         "company": company,
-        "region": region.get(str(city), 'Регион не найден'),
+        "region": region.get(city, 'Регион не найден'),
         "city": city,
         "platform_vacancy_id": f"{Platform.SUPER_JOB}{item.get('id')}",
         "title": item.get("profession"),
@@ -47,23 +48,15 @@ def transform_superjob_data(item: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def extract_company(item: dict[str, Any]) -> Optional[Company]:
+def extract_company(item: dict[str, Any]) -> Optional[str]:
     company_data = item.get("client", {})
-    company_name = company_data.get("title")
-    if not company_name:
-        return None
-    company, _ = Company.objects.get_or_create(name=company_name)
-    return company
+    return company_data.get("title") or None
 
 
-def extract_city(town_data: Optional[dict[str, Any]]) -> Optional[City]:
+def extract_city(town_data: Optional[dict[str, Any]]) -> Optional[str]:
     if not town_data:
         return None
-    city_name = town_data.get("title")
-    if not city_name:
-        return None
-    city, _ = City.objects.get_or_create(name=city_name)
-    return city
+    return town_data.get("title") or None
 
 
 def format_skills(skills_data: Optional[Any]) -> Optional[str]:
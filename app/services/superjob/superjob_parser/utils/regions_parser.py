@@ -1,8 +1,10 @@
 import os
+from collections.abc import Mapping
 
 import requests
 
-from app.parser import get_fixture_data, save_data
+from app.parser import save_data
+from app.services.vacancies.utils.region_index import RegionIndex
 
 CACHE_FILE = os.path.join('app', 'services', 'superjob',
                           'superjob_parser', 'utils',
@@ -10,15 +12,14 @@ CACHE_FILE = os.path.join('app', 'services', 'superjob',
                           )
 
 
-def get_sj_city_to_region_mapping(source='superjob') -> dict[str, str]:
-    if os.path.exists(CACHE_FILE):
-        return get_fixture_data(CACHE_FILE)
-
-    if source == 'superjob':
-        base_url = 'https://api.superjob.ru/2.0/regions/combined/'
-    else:
+def get_sj_city_to_region_mapping(source='superjob') -> Mapping[str, str]:
+    if source != 'superjob':
         raise ValueError('Unknown source')
+    return sj_region_index.get()
+
 
+def fetch_sj_city_to_region_mapping() -> dict[str, str]:
+    base_url = 'https://api.superjob.ru/2.0/regions/combined/'
     response = requests.get(base_url, timeout=10)
     response.raise_for_status()
     areas = response.json()
@@ -41,4 +42,7 @@ def parse_superjob_areas(areas: list) -> dict[str, str]:
                 mapping[city['title']] = region_name
             if not region['towns']:
                 mapping[region_name] = region_name
-    return mapping
\ No newline at end of file
+    return mapping
+
+
+sj_region_index = RegionIndex(CACHE_FILE, fetch_sj_city_to_region_mapping)
@@ -0,0 +1,33 @@
+from app.services.vacancies.models import Platform
+from app.services.vacancies.utils.refill import SUPERJOB_VACANCY_CATEGORY
+from app.services.vacancies.utils.sources import SourceAdapter, register_source
+
+from .data_transformer import transform_superjob_data
+from .vacancy_fetcher import MAX_LIST_DEPTH, SuperJobCrawl, count_superjob_vacancies
+
+
+@register_source
+class SuperJobSource(SourceAdapter):
+    name = "superjob"
+    platform = Platform.SUPER_JOB
+    catalog_params = {"catalogues": SUPERJOB_VACANCY_CATEGORY}
+    max_depth = MAX_LIST_DEPTH
+
+    def stream(self, params=None, incremental=False, paginate=False):
+        # Отметок обхода у SuperJob нет: список и так отдает вакансии целиком.
+        return SuperJobCrawl(params, paginate=paginate)
+
+    def transform(self, payload):
+        return transform_superjob_data(payload)
+
+    async def count(self, params):
+        return await count_superjob_vacancies(params)
+
+    def window_params(self, window):
+        params = {
+            "date_published_from": int(window.date_from.timestamp()),
+            "date_published_to": int(window.date_to.timestamp()),
+        }
+        if window.area:
+            params["town"] = window.area
+        return params
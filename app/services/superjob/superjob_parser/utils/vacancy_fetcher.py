@@ -3,30 +3,69 @@ import os
 
 from dotenv import load_dotenv
 
+from app.services.vacancies.models import Platform
+from app.services.vacancies.utils.crawl_state import CrawlSource
 from app.services.vacancies.utils.http_client import HTTPClient
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+BASE_URL = "https://api.superjob.ru/2.0/vacancies"
+LIST_PER_PAGE = 100
+# Глубже 500 вакансий SuperJob по одному запросу не отдает.
+MAX_LIST_DEPTH = 500
 
-async def fetch_superjob_vacancies(params: dict | None = None):
+
+def get_superjob_client() -> HTTPClient:
     secret_key = os.getenv("SUPERJOB_API_KEY")
     if not secret_key:
         raise ValueError("SUPERJOB_API_KEY environment variable is not set")
-    base_url = "https://api.superjob.ru/2.0/vacancies"
-    headers = {"X-Api-App-Id": secret_key}
-    api_client = HTTPClient(base_url, headers)
-    urls = [base_url]
-
-    responses = await api_client.get(urls=urls, params=params)
-
-    vacancies = [
-        vacancy
-        for response in responses
-        if not isinstance(response, Exception)
-        for vacancy in response.get("objects", [])
-    ]
-    if not vacancies:
-        logger.warning("No vacancy found in superjob api")
-        raise ValueError("Vacancy not found")
-    return vacancies
\ No newline at end of file
+    return HTTPClient(BASE_URL, {"X-Api-App-Id": secret_key})
+
+
+class SuperJobCrawl(CrawlSource):
+    """
+    Выдача SuperJob по params. Список SuperJob уже содержит вакансии
+    целиком, подробные страницы не запрашиваются. С paginate листаются
+    все страницы выдачи (не глубже MAX_LIST_DEPTH).
+    """
+
+    platform = Platform.SUPER_JOB
+
+    def __init__(self, params: dict | None = None, paginate: bool = False):
+        super().__init__(params)
+        self.paginate = paginate
+
+    async def crawl(self):
+        api_client = get_superjob_client()
+        if not self.paginate:
+            response = await self.list_vacancies(api_client, self.params)
+            vacancies = response.get("objects")
+            if not vacancies:
+                raise ValueError("Vacancy not found")
+            for vacancy in vacancies:
+                yield vacancy
+            return
+
+        for page in range(MAX_LIST_DEPTH // LIST_PER_PAGE):
+            response = await self.list_vacancies(
+                api_client, {**self.params, "count": LIST_PER_PAGE, "page": page}
+            )
+            for vacancy in response.get("objects", []):
+                yield vacancy
+            if not response.get("more"):
+                break
+
+    @staticmethod
+    async def list_vacancies(api_client, params):
+        responses = await api_client.get(urls=[BASE_URL], params=params)
+        if isinstance(responses[0], Exception):
+            raise responses[0]
+        return responses[0]
+
+
+async def count_superjob_vacancies(params: dict) -> int:
+    response = await SuperJobCrawl.list_vacancies(
+        get_superjob_client(), {**params, "count": 1}
+    )
+    return response.get("total", 0)
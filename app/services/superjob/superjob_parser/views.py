@@ -1,10 +1,6 @@
-from app.services.hh.hh_parser.utils.vacancy_service import process_vacancies
-
-from .utils.data_transformer import transform_superjob_data
-from .utils.vacancy_fetcher import fetch_superjob_vacancies
+from app.services.hh.hh_parser.utils.vacancy_service import process_vacancy_stream
+from app.services.vacancies.utils.sources import get_source
 
 
 async def superjob_vacancy_parse(request=None, params: dict | None = None):
-    return await process_vacancies(
-        fetch_superjob_vacancies, transform_superjob_data, params=params
-    )
+    return await process_vacancy_stream(get_source("superjob"), params=params)
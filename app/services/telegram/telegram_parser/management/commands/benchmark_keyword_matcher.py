@@ -0,0 +1,98 @@
+import asyncio
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.parser import get_fixture_data
+from app.services.telegram.telegram_parser.parser.keyword_matcher import (
+    KeywordMatcher,
+)
+from app.services.telegram.telegram_parser.parser.line_parser import LineParser
+from app.services.telegram.telegram_parser.parser.vacancy_parser import VacancyParser
+from app.settings import FIXTURE_PATH
+
+CORPUS = os.path.join(FIXTURE_PATH, "telegram_posts.json")
+
+
+class LegacyKeywordMatcher:
+    """Прежнее поведение: any(kw in line.lower()) по списку каждого поля."""
+
+    def __init__(self, keywords):
+        self.keywords = keywords
+
+    def match(self, line):
+        return {
+            field
+            for field, words in self.keywords.items()
+            if isinstance(words, list) and any(kw in line.lower() for kw in words)
+        }
+
+
+def load_posts(path):
+    """
+    Посты из корпуса {"posts": [...]} или из выгрузки канала Telegram
+    Desktop (result.json), где text — строка или список фрагментов.
+    """
+    data = get_fixture_data(path)
+    if "posts" in data:
+        return data["posts"]
+    posts = []
+    for message in data.get("messages", []):
+        text = message.get("text", "")
+        if isinstance(text, list):
+            text = "".join(
+                part if isinstance(part, str) else part.get("text", "") for part in text
+            )
+        if text:
+            posts.append(text)
+    return posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает скорость разбора выгрузки канала Telegram: проверка "
+        "ключевых слов по каждому полю и общий KeywordMatcher."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dump", default=CORPUS, help="Корпус или выгрузка канала (JSON)"
+        )
+        parser.add_argument(
+            "--keywords", default=CORPUS, help="JSON с ключевыми словами KeyWord"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=200, help="Сколько раз пройти выгрузку"
+        )
+
+    def handle(self, *args, **options):
+        keywords = get_fixture_data(options["keywords"])["keywords"]
+        posts = load_posts(options["dump"]) * options["repeat"]
+        matchers = {
+            "legacy": LegacyKeywordMatcher(keywords),
+            "compiled": KeywordMatcher(keywords),
+        }
+
+        results = {}
+        self.stdout.write(f"{'matcher':>9} {'msg/s':>10}")
+        for name, matcher in matchers.items():
+            rate, results[name] = asyncio.run(measure(keywords, matcher, posts))
+            self.stdout.write(f"{name:>9} {rate:>10.0f}")
+        identical = results["legacy"] == results["compiled"]
+        self.stdout.write(f"Результаты совпадают: {'да' if identical else 'нет'}")
+
+
+async def measure(keywords, matcher, posts):
+    parser = VacancyParser()
+    line_parser = LineParser(keywords["salary"])
+
+    async def load_keywords():
+        parser.keywords = keywords
+        parser.matcher = matcher
+        parser.line_parser = line_parser
+
+    parser.load_keywords = load_keywords
+    started = time.perf_counter()
+    parsed = [await parser.parse_vacancy_from_text(post) for post in posts]
+    return len(posts) / (time.perf_counter() - started), parsed
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import time
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+
+from app.parser import get_fixture_data
+from app.services.telegram.telegram_parser.models import KeyWord
+from app.services.telegram.telegram_parser.parser.keyword_store import keyword_store
+from app.services.telegram.telegram_parser.parser.vacancy_parser import VacancyParser
+from app.settings import FIXTURE_PATH
+
+CORPUS = os.path.join(FIXTURE_PATH, "telegram_posts.json")
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает скорость разбора записанных постов Telegram: загрузка "
+        "KeyWord на каждое сообщение и ключевые слова в KeywordStore. "
+        "Если KeyWord пуст, на время замера создается запись из корпуса."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--corpus", default=CORPUS, help="JSON-файл корпуса")
+        parser.add_argument(
+            "--repeat", type=int, default=50, help="Сколько раз пройти корпус"
+        )
+
+    def handle(self, *args, **options):
+        corpus = get_fixture_data(options["corpus"])
+        messages = corpus["posts"] * options["repeat"]
+        created = None
+        if not KeyWord.objects.exists():
+            created = KeyWord.objects.create(**corpus["keywords"])
+        try:
+            results = asyncio.run(self.run_benchmark(messages))
+        finally:
+            if created is not None:
+                created.delete()
+
+        self.stdout.write(f"{'store':>8} {'msg/s':>10} {'loads':>8}")
+        for name, (rate, loads) in results.items():
+            self.stdout.write(f"{name:>8} {rate:>10.0f} {loads:>8}")
+
+    @staticmethod
+    async def run_benchmark(messages):
+        results = {}
+        for name, reload_each in (("legacy", True), ("cached", False)):
+            parser = VacancyParser()
+            keyword_store.invalidate()
+            with mock.patch.object(
+                keyword_store, "load", wraps=keyword_store.load
+            ) as load:
+                started = time.perf_counter()
+                for message in messages:
+                    if reload_each:
+                        # Прежнее поведение: запрос KeyWord на каждое сообщение.
+                        keyword_store.invalidate()
+                    await parser.parse_vacancy_from_text(message)
+                elapsed = time.perf_counter() - started
+            results[name] = (len(messages) / elapsed, load.call_count)
+        keyword_store.invalidate()
+        return results
@@ -0,0 +1,168 @@
+import os
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.parser import get_fixture_data
+from app.services.telegram.telegram_parser.parser.line_parser import LineParser
+from app.settings import FIXTURE_PATH
+
+from .benchmark_keyword_matcher import load_posts
+
+CORPUS = os.path.join(FIXTURE_PATH, "telegram_posts.json")
+
+
+class LegacyLineParser:
+    """Прежнее поведение: вызовы re по строке на каждое извлечение."""
+
+    def __init__(self, salary_keywords):
+        self.salary_keywords = salary_keywords
+
+    @staticmethod
+    def extract_value(line):
+        parts = re.split(r"[:\-—]", line, maxsplit=1)
+        return parts[1].strip() if len(parts) > 1 else line.strip()
+
+    def extract_salary(self, line):
+        cleaned_line = line
+        for kw in self.salary_keywords:
+            cleaned_line = re.sub(kw, "", cleaned_line, flags=re.IGNORECASE)
+        match = re.search(r"(от\s*)?\d[\d\s.,]{3,}", cleaned_line.lower())
+        return match.group().strip() if match else None
+
+    @staticmethod
+    def extract_phone(line):
+        match_username = re.search(r"@\w+", line)
+        if match_username:
+            return match_username.group()
+        match_phone = re.search(
+            r"""(\+7|8)?[\s\-]?\(?\d{3}\)?[\s\-]
+?\d{3}[\s\-]?\d{2}[\s\-]?\d{2}""",
+            line,
+        )
+        return match_phone.group() if match_phone else None
+
+    @staticmethod
+    def extract_link(line):
+        match = re.search(r"https?://[^\s]+|t\.me/[^\s]+", line)
+        return match.group() if match else None
+
+
+class TokenizedLineParser:
+    """
+    Все шаблоны в одной альтернации с именованными группами: строка
+    сканируется один раз, вид токена определяется по match.lastgroup.
+    """
+
+    def __init__(self, salary_keywords):
+        keywords = "|".join(
+            map(re.escape, sorted(set(salary_keywords), key=len, reverse=True))
+        )
+        groups = [
+            ("link", r"https?://[^\s]+|t\.me/[^\s]+"),
+            ("username", r"@\w+"),
+            (
+                "phone",
+                r"(?:\+7|8)?[\s\-]?\(?\d{3}\)?[\s\-]\d{3}[\s\-]?\d{2}[\s\-]?\d{2}",
+            ),
+            ("salary_keyword", f"(?i:{keywords})"),
+            ("salary", r"(?:(?i:от)\s*)?\d[\d\s.,]{3,}"),
+            ("separator", r"[:\-—]"),
+        ]
+        self.tokens = re.compile(
+            "|".join(f"(?P<{name}>{pattern})" for name, pattern in groups)
+        )
+
+    def tokenize(self, line):
+        first = {}
+        for match in self.tokens.finditer(line):
+            first.setdefault(match.lastgroup, match)
+        separator = first.get("separator")
+        salary = first.get("salary")
+        contact = first.get("username") or first.get("phone")
+        link = first.get("link")
+        return (
+            line[separator.end() :].strip() if separator else line.strip(),
+            salary.group().strip().lower() if salary else None,
+            contact.group() if contact else None,
+            link.group() if link else None,
+        )
+
+
+EXTRACTORS = ("value", "salary", "phone", "link")
+
+
+class Command(BaseCommand):
+    help = (
+        "Стоимость извлечения значений из строк поста на одно сообщение: "
+        "вызовы re на каждое извлечение, скомпилированный LineParser и "
+        "один проход по строке общей альтернацией."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dump", default=CORPUS, help="Корпус или выгрузка канала (JSON)"
+        )
+        parser.add_argument(
+            "--keywords", default=CORPUS, help="JSON с ключевыми словами KeyWord"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=200, help="Сколько раз пройти выгрузку"
+        )
+
+    def handle(self, *args, **options):
+        salary_keywords = get_fixture_data(options["keywords"])["keywords"]["salary"]
+        posts = [
+            [line.strip() for line in post.strip().splitlines()]
+            for post in load_posts(options["dump"])
+        ] * options["repeat"]
+        parsers = {
+            "legacy": LegacyLineParser(salary_keywords),
+            "compiled": LineParser(salary_keywords),
+        }
+
+        self.stdout.write(
+            f"{'parser':>9} "
+            + " ".join(f"{name:>8}" for name in EXTRACTORS)
+            + f" {'all':>8}   (µs на сообщение)"
+        )
+        results = {}
+        for name, parser in parsers.items():
+            costs = [measure(posts, [extractor(parser, kind)]) for kind in EXTRACTORS]
+            total = measure(posts, [extractor(parser, kind) for kind in EXTRACTORS])
+            self.stdout.write(
+                f"{name:>9} "
+                + " ".join(f"{cost:>8.1f}" for cost in costs)
+                + f" {total:>8.1f}"
+            )
+            results[name] = [
+                [extractor(parser, kind)(line) for kind in EXTRACTORS]
+                for post in posts[: len(posts) // options["repeat"]]
+                for line in post
+            ]
+        identical = results["legacy"] == results["compiled"]
+        self.stdout.write(f"Результаты совпадают: {'да' if identical else 'нет'}")
+
+        tokenized = TokenizedLineParser(salary_keywords)
+        total = measure(posts, [tokenized.tokenize])
+        self.stdout.write(f"{'tokenized':>9} {'':>35} {total:>8.1f}")
+        same = results["legacy"] == [
+            list(tokenized.tokenize(line))
+            for post in posts[: len(posts) // options["repeat"]]
+            for line in post
+        ]
+        self.stdout.write(f"Результаты совпадают: {'да' if same else 'нет'}")
+
+
+def extractor(parser, kind):
+    return getattr(parser, f"extract_{kind}")
+
+
+def measure(posts, extractors):
+    started = time.perf_counter()
+    for lines in posts:
+        for line in lines:
+            for extract in extractors:
+                extract(line)
+    return (time.perf_counter() - started) / len(posts) * 1_000_000
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DROP = "drop"
+SPILL = "spill"
+SPILL_FILE = "telegram-spill.jsonl"
+# Повторы записи пачки и пауза перед первым повтором (удваивается).
+SAVE_RETRIES = 3
+RETRY_DELAY = 0.5
+
+
+@dataclass
+class QueueStats:
+    received: int = 0
+    parsed: int = 0
+    saved: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    failed: int = 0
+    batches: int = 0
+    # Секунды от получения самого раннего сообщения пачки до ее записи.
+    lag: float = 0.0
+
+
+class MessageQueue:
+    """
+    Очередь между обработчиком Telegram и записью в базу.
+
+    Обработчик только кладет текст поста в inbox (offer не ждет), workers
+    задач разбирают посты, а писатель сохраняет разобранные пачками:
+    по batch_size сообщений или через flush_interval секунд после первого
+    сообщения пачки. Обе очереди ограничены: если запись не успевает,
+    разбор ждет писателя, а переполненный inbox по политике overflow
+    отбрасывает новые сообщения (drop) или дописывает их в файл spill_dir
+    (spill), откуда они разбираются при следующем запуске. Пачка, которую
+    не удалось записать и после SAVE_RETRIES повторов, тоже уходит
+    в spill-файл, если spill_dir задан.
+
+    Spill-файл пишет отдельная задача в потоке (asyncio.to_thread), чтобы
+    обработчик Telegram не ждал диска. При запуске файл переименовывается
+    в telegram-spill-<время>.replay и разбирается вместе с оставшимися
+    от прошлых запусков .replay-файлами; файл удаляется, только когда
+    все его сообщения поставлены в очередь. Если процесс упал посреди
+    разбора, файл будет разобран заново: id вакансий Telegram стабильны,
+    поэтому повтор обновит те же вакансии.
+    """
+
+    def __init__(
+        self,
+        parse,
+        save,
+        workers=4,
+        batch_size=50,
+        flush_interval=0.5,
+        maxsize=1000,
+        overflow=DROP,
+        spill_dir=None,
+    ):
+        if overflow == SPILL and not spill_dir:
+            raise ValueError("Для политики spill нужен spill_dir")
+        self.parse = parse
+        self.save = save
+        self.workers = workers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.spill_path = Path(spill_dir) / SPILL_FILE if spill_dir else None
+        self.inbox = asyncio.Queue(maxsize)
+        self.parsed = asyncio.Queue(maxsize)
+        self.overflowed = asyncio.Queue()
+        self.batch_ready = asyncio.Event()
+        self.stopping = False
+        self.stats = QueueStats()
+        self.tasks = []
+        self.replay_task = None
+
+    def offer(self, text):
+        """Кладет пост в очередь; False, если очередь переполнена."""
+        self.stats.received += 1
+        try:
+            self.inbox.put_nowait((text, time.monotonic()))
+        except asyncio.QueueFull:
+            if self.overflow == SPILL:
+                self.spill(text)
+            else:
+                self.stats.dropped += 1
+            return False
+        return True
+
+    def spill(self, *texts):
+        """Передает сообщения задаче spill_writer, не блокируя event loop."""
+        for text in texts:
+            self.overflowed.put_nowait(text)
+
+    def write_spill(self, texts):
+        with open(self.spill_path, "a", encoding="utf-8") as file:
+            for text in texts:
+                file.write(json.dumps({"text": text}, ensure_ascii=False) + "\n")
+
+    def rotate_spill(self):
+        """Переименовывает spill-файл и отдает все .replay-файлы по порядку."""
+        if self.spill_path.exists():
+            self.spill_path.rename(
+                self.spill_path.with_name(
+                    f"{self.spill_path.stem}-{time.time_ns()}.replay"
+                )
+            )
+        return sorted(self.spill_path.parent.glob(f"{self.spill_path.stem}-*.replay"))
+
+    def metrics(self):
+        return {
+            **asdict(self.stats),
+            "lag": round(self.stats.lag, 3),
+            "depth": self.inbox.qsize(),
+            "pending": self.parsed.qsize(),
+        }
+
+    async def start(self):
+        self.stopping = False
+        self.tasks = [
+            asyncio.create_task(self.parse_worker()) for _ in range(self.workers)
+        ]
+        self.tasks.append(asyncio.create_task(self.writer()))
+        if self.spill_path:
+            self.tasks.append(asyncio.create_task(self.spill_writer()))
+            replay_paths = self.rotate_spill()
+            if replay_paths:
+                self.replay_task = asyncio.create_task(self.replay_spill(replay_paths))
+
+    async def stop(self):
+        """Дожидается разбора и записи принятых сообщений."""
+        if self.replay_task is not None:
+            # Недочитанный файл остался бы на диске и разбирался бы заново.
+            await self.replay_task
+            self.replay_task = None
+        await self.inbox.join()
+        # Неполная пачка записывается сразу, без ожидания flush_interval.
+        self.stopping = True
+        self.batch_ready.set()
+        await self.parsed.join()
+        await self.overflowed.join()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    async def replay_spill(self, replay_paths):
+        for replay_path in replay_paths:
+            lines = await asyncio.to_thread(replay_path.read_text, encoding="utf-8")
+            for line in lines.splitlines():
+                try:
+                    text = json.loads(line)["text"]
+                except (ValueError, KeyError) as e:
+                    logger.error(f"Поврежденная строка в {replay_path.name}: {e}")
+                    continue
+                await self.inbox.put((text, time.monotonic()))
+            replay_path.unlink()
+            logger.info(f"Сообщения из {replay_path.name} возвращены в очередь")
+
+    async def spill_writer(self):
+        while True:
+            texts = [await self.overflowed.get()]
+            while not self.overflowed.empty():
+                texts.append(self.overflowed.get_nowait())
+            try:
+                await asyncio.to_thread(self.write_spill, texts)
+                self.stats.spilled += len(texts)
+            except OSError as e:
+                logger.error(f"Spill-файл не записан, потеряно {len(texts)}: {e}")
+                self.stats.dropped += len(texts)
+            finally:
+                for _ in texts:
+                    self.overflowed.task_done()
+
+    async def parse_worker(self):
+        while True:
+            text, received_at = await self.inbox.get()
+            try:
+                parsed = await self.parse(text)
+            except Exception as e:
+                logger.error(f"Ошибка разбора сообщения: {e}")
+                self.stats.failed += 1
+            else:
+                if parsed:
+                    self.stats.parsed += 1
+                    await self.parsed.put((text, parsed, received_at))
+                    if self.parsed.qsize() >= self.batch_size - 1:
+                        self.batch_ready.set()
+            finally:
+                self.inbox.task_done()
+
+    async def writer(self):
+        while True:
+            batch = [await self.parsed.get()]
+            if not self.stopping and self.parsed.qsize() < self.batch_size - 1:
+                # Ждем полную пачку, но не дольше flush_interval. Ожидание
+                # события, а не get, поэтому по таймауту ничего не теряется.
+                self.batch_ready.clear()
+                try:
+                    await asyncio.wait_for(self.batch_ready.wait(), self.flush_interval)
+                except TimeoutError:
+                    pass
+            while len(batch) < self.batch_size and not self.parsed.empty():
+                batch.append(self.parsed.get_nowait())
+            try:
+                await self.flush(batch)
+            finally:
+                for _ in batch:
+                    self.parsed.task_done()
+
+    async def flush(self, batch):
+        parsed_list = [parsed for _, parsed, _ in batch]
+        for attempt in range(SAVE_RETRIES + 1):
+            try:
+                await self.save(parsed_list)
+                break
+            except Exception as e:
+                logger.error(f"Пачка из {len(batch)} вакансий не сохранена: {e}")
+                if attempt < SAVE_RETRIES:
+                    await asyncio.sleep(RETRY_DELAY * 2**attempt)
+        else:
+            if self.spill_path:
+                self.spill(*(text for text, _, _ in batch))
+            else:
+                self.stats.failed += len(batch)
+            return
+        self.stats.saved += len(batch)
+        self.stats.batches += 1
+        self.stats.lag = time.monotonic() - min(received for _, _, received in batch)
@@ -1,18 +1,13 @@
-from asgiref.sync import sync_to_async
-
-from ..models import KeyWord
+from .keyword_store import keyword_store
 
 
 class KeywordExtractor:
     def __init__(self):
         self.keywords = None
+        self.matcher = None
+        self.line_parser = None
 
-    @sync_to_async
-    def load_keywords(self):
-        kw = KeyWord.objects.all()
-        if not kw:
-            raise ValueError("KeyWords data not found")
-        self.keywords = list(kw.values())[0]
-
-    def matches(self, line, field):
-        return any(kw in line.lower() for kw in self.keywords[field])
+    async def load_keywords(self):
+        self.keywords = await keyword_store.aget()
+        self.matcher = keyword_store.matcher
+        self.line_parser = keyword_store.line_parser
@@ -0,0 +1,52 @@
+import re
+from collections import defaultdict
+
+
+class KeywordMatcher:
+    """
+    Все поля KeyWord, ключевые слова которых входят в строку, за один проход.
+
+    Слова объединяются в одно регулярное выражение вида (?=(w1|w2|...)):
+    просмотр вперед проверяет каждую позицию строки, поэтому находятся и
+    перекрывающиеся вхождения. Альтернативы упорядочены от длинных к
+    коротким, и в каждой позиции совпадает самое длинное слово; остальные
+    слова, совпадающие в той же позиции, — его префиксы, их поля заранее
+    добавлены к полям длинного слова. Результат тот же, что у
+    any(kw in line.lower() for kw in keywords[field]) для каждого поля.
+    """
+
+    def __init__(self, keywords):
+        word_fields = defaultdict(set)
+        # Пустое слово входит в любую строку.
+        self.always = set()
+        for field, words in keywords.items():
+            if not isinstance(words, list):
+                continue
+            for word in words:
+                if not isinstance(word, str):
+                    continue
+                if word:
+                    word_fields[word].add(field)
+                else:
+                    self.always.add(field)
+
+        self.fields = {}
+        for word in word_fields:
+            fields = set(self.always)
+            for end in range(1, len(word) + 1):
+                fields |= word_fields.get(word[:end], set())
+            self.fields[word] = frozenset(fields)
+
+        words = sorted(word_fields, key=len, reverse=True)
+        self.pattern = (
+            re.compile(f"(?=({'|'.join(map(re.escape, words))}))") if words else None
+        )
+        self.always = frozenset(self.always)
+
+    def match(self, line):
+        if self.pattern is None:
+            return self.always
+        fields = set(self.always)
+        for match in self.pattern.finditer(line.lower()):
+            fields |= self.fields[match.group(1)]
+        return fields
@@ -0,0 +1,54 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from ..models import KeyWord
+from .keyword_matcher import KeywordMatcher
+from .line_parser import LineParser
+
+
+class KeywordStore:
+    """
+    Ключевые слова KeyWord в памяти процесса.
+
+    Загружаются при первом обращении и перечитываются после изменения
+    KeyWord (сигналы, в том же процессе) или по истечении
+    TELEGRAM_KEYWORDS_TTL: слушатель работает отдельным процессом и видит
+    правки из админки не позже чем через TTL. Пока слова свежие, aget не
+    обращается к базе и не переключается в поток sync_to_async. Вместе со
+    словами хранятся собранные по ним KeywordMatcher и LineParser.
+    """
+
+    def __init__(self):
+        self.keywords = None
+        self.matcher = None
+        self.line_parser = None
+        self.expires_at = 0.0
+
+    def fresh(self):
+        return self.keywords is not None and time.monotonic() < self.expires_at
+
+    def load(self):
+        keywords = KeyWord.objects.values().first()
+        if keywords is None:
+            raise ValueError("KeyWords data not found")
+        self.matcher = KeywordMatcher(keywords)
+        self.line_parser = LineParser(keywords.get("salary") or ())
+        self.keywords = keywords
+        self.expires_at = time.monotonic() + settings.TELEGRAM_KEYWORDS_TTL
+        return keywords
+
+    def get(self):
+        return self.keywords if self.fresh() else self.load()
+
+    async def aget(self):
+        if self.fresh():
+            return self.keywords
+        return await sync_to_async(self.load)()
+
+    def invalidate(self):
+        self.expires_at = 0.0
+
+
+keyword_store = KeywordStore()
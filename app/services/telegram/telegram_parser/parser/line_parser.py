@@ -1,33 +1,62 @@
 import re
 
+VALUE_SEPARATOR = re.compile(r"[:\-—]")
+SALARY = re.compile(r"(от\s*)?\d[\d\s.,]{3,}")
+USERNAME = re.compile(r"@\w+")
+PHONE = re.compile(
+    r"""(\+7|8)?[\s\-]?\(?\d{3}\)?[\s\-]
+?\d{3}[\s\-]?\d{2}[\s\-]?\d{2}"""
+)
+LINK = re.compile(r"https?://[^\s]+|t\.me/[^\s]+")
+DIGIT = re.compile(r"\d")
+
 
 class LineParser:
+    """
+    Извлечение значений из строки поста скомпилированными шаблонами.
+
+    Каждое значение ищется своим поиском и только когда оно нужно разбору.
+    Одна альтернация с именованными группами (TokenizedLineParser
+    в benchmark_line_parser) медленнее: цикл по finditer на Python стоит
+    дороже отдельных поисков в C, а ссылки и телефоны, поглощенные одним
+    токеном, меняют найденные значения.
+    """
+
+    def __init__(self, salary_keywords=()):
+        words = sorted(
+            {kw for kw in salary_keywords if isinstance(kw, str) and kw},
+            key=len,
+            reverse=True,
+        )
+        # Ключевые слова зарплаты убираются из строки одной заменой.
+        self.salary_keywords = (
+            re.compile("|".join(map(re.escape, words)), re.IGNORECASE) if words else None
+        )
+
     @staticmethod
     def extract_value(line):
-        parts = re.split(r"[:\-\u2014]", line, maxsplit=1)
+        parts = VALUE_SEPARATOR.split(line, maxsplit=1)
         return parts[1].strip() if len(parts) > 1 else line.strip()
 
-    @staticmethod
-    def extract_salary(line, keywords):
-        cleaned_line = line
-        for kw in keywords:
-            cleaned_line = re.sub(kw, "", cleaned_line, flags=re.IGNORECASE)
-        match = re.search(r"(от\s*)?\d[\d\s.,]{3,}", cleaned_line.lower())
+    def extract_salary(self, line):
+        # Без цифр в строке зарплаты нет: замены и поиск не нужны.
+        if DIGIT.search(line) is None:
+            return None
+        if self.salary_keywords is not None:
+            line = self.salary_keywords.sub("", line)
+        match = SALARY.search(line.lower())
         return match.group().strip() if match else None
 
     @staticmethod
     def extract_phone(line):
-        match_username = re.search(r"@\w+", line)
-        if match_username:
-            return match_username.group()
-        match_phone = re.search(
-            r"""(\+7|8)?[\s\-]?\(?\d{3}\)?[\s\-]
-?\d{3}[\s\-]?\d{2}[\s\-]?\d{2}""",
-            line,
-        )
-        return match_phone.group() if match_phone else None
+        if "@" in line:
+            match = USERNAME.search(line)
+            if match:
+                return match.group()
+        match = PHONE.search(line)
+        return match.group() if match else None
 
     @staticmethod
     def extract_link(line):
-        match = re.search(r"https?://[^\s]+|t\.me/[^\s]+", line)
+        match = LINK.search(line)
         return match.group() if match else None
@@ -1,48 +1,17 @@
-import datetime
 import logging
-import uuid
 
-from asgiref.sync import sync_to_async
-
-from app.services.hh.hh_parser.utils.regions_parser import get_city_to_region_mapping
-from app.services.vacancies.models import City, Company, Platform, Vacancy
+from app.services.vacancies.utils.search_cache import ainvalidate_search_cache
+from app.services.vacancies.utils.sources import get_source
 
 logger = logging.getLogger(__name__)
 
 
 class SaveDataVacancy:
-    @sync_to_async
-    def save_vacancy(self, parsed, date):
-        region, city, company = None, None, None
-
-        platform, _ = Platform.objects.get_or_create(name=Platform.TELEGRAM)
-        if parsed["company"]:
-            company, _ = Company.objects.get_or_create(name=parsed["company"])
-        if parsed["city"]:
-            city, _ = City.objects.get_or_create(name=parsed["city"])
-            region = get_city_to_region_mapping(source="hh")
-
-        platform_vacancy_id = f"{Platform.TELEGRAM}{uuid.uuid4()}"
-
-        Vacancy.objects.update_or_create(
-            platform_vacancy_id=platform_vacancy_id,
-            defaults={
-                "platform": platform,
-                "region": region.get(city, 'Регион не найден'),
-                "city": city,
-                "company": company,
-                "platform_vacancy_id": platform_vacancy_id,
-                "title": parsed["title"],
-                "salary": parsed["salary"],
-                "url": parsed["url"],
-                "experience": parsed["experience"],
-                "schedule": parsed["schedule"],
-                "work_format": parsed["work_format"],
-                "skills": parsed["skills"],
-                "description": parsed["description"],
-                "address": parsed["address"],
-                "contacts": parsed["contacts"],
-                "published_at": datetime.datetime.now(),
-            },
-        )
-        logger.info("Данные в модель успешно записаны")
+    async def save_vacancies(self, parsed_list):
+        async def messages():
+            for parsed in parsed_list:
+                yield parsed
+
+        stats = await get_source("telegram").ingest(messages())
+        await ainvalidate_search_cache()
+        logger.info(f"Данные в модель успешно записаны: {stats['save'].items}")
@@ -1,88 +1,44 @@
 from app.services.vacancies.models import Vacancy
 
 from .keyword_extractor import KeywordExtractor
-from .line_parser import LineParser
 
 
 class VacancyParser(KeywordExtractor):
     def __init__(self):
         super().__init__()
+        self.field_names = [field.name for field in Vacancy._meta.get_fields()]
 
     async def parse_vacancy_from_text(self, text):
         await self.load_keywords()
 
         lines = text.strip().splitlines()
-        parser = LineParser()
 
-        all_fields = Vacancy._meta.get_fields()
-        field_names = [field.name for field in all_fields]
-
-        data = dict.fromkeys(field_names)
+        data = dict.fromkeys(self.field_names)
         data["title"] = next((line.strip() for line in lines if line.strip()), None)
 
+        parser = self.line_parser
+        # Поле, функция разбора и нужно ли строке совпасть с ключевыми
+        # словами поля; порядок задает приоритет при заполнении.
         actions = [
-            (
-                "company",
-                lambda line: parser.extract_value(line)
-                if self.matches(line, "company")
-                else None,
-            ),
-            (
-                "salary",
-                lambda line: parser.extract_salary(line, self.keywords["salary"])
-                if self.matches(line, "salary")
-                else None,
-            ),
-            (
-                "city",
-                lambda line: parser.extract_value(line)
-                if self.matches(line, "city")
-                else None,
-            ),
-            (
-                "schedule",
-                lambda line: parser.extract_value(line)
-                if self.matches(line, "schedule")
-                else None,
-            ),
-            (
-                "work_format",
-                lambda line: parser.extract_value(line)
-                if self.matches(line, "work_format")
-                else None,
-            ),
-            (
-                "skills",
-                lambda line: parser.extract_value(line)
-                if self.matches(line, "skills")
-                else None,
-            ),
-            (
-                "description",
-                lambda line: parser.extract_value(line)
-                if self.matches(line, "description")
-                else None,
-            ),
-            (
-                "address",
-                lambda line: parser.extract_value(line)
-                if self.matches(line, "address")
-                else None,
-            ),
-            (
-                "experience",
-                lambda line: parser.extract_value(line)
-                if self.matches(line, "experience")
-                else None,
-            ),
-            ("contacts", parser.extract_phone),
-            ("url", parser.extract_link),
+            ("company", parser.extract_value, True),
+            ("salary", parser.extract_salary, True),
+            ("city", parser.extract_value, True),
+            ("schedule", parser.extract_value, True),
+            ("work_format", parser.extract_value, True),
+            ("skills", parser.extract_value, True),
+            ("description", parser.extract_value, True),
+            ("address", parser.extract_value, True),
+            ("experience", parser.extract_value, True),
+            ("contacts", parser.extract_phone, False),
+            ("url", parser.extract_link, False),
         ]
 
         for line in lines:
             line = line.strip()
-            for key, func in actions:
-                if not data[key]:
+            # Все поля, ключевые слова которых есть в строке, за один проход.
+            matched = self.matcher.match(line)
+            for key, func, keyed in actions:
+                if not data[key] and (not keyed or key in matched):
                     value = func(line)
                     if value:
                         data[key] = value
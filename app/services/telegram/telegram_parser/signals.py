@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import KeyWord
+from .parser.keyword_store import keyword_store
+
+
+@receiver(post_save, sender=KeyWord)
+@receiver(post_delete, sender=KeyWord)
+def reload_keywords(sender, instance, **kwargs):
+    keyword_store.invalidate()
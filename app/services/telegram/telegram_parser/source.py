@@ -0,0 +1,84 @@
+import datetime
+import hashlib
+import logging
+
+from django.db import IntegrityError, transaction
+
+from app.services.hh.hh_parser.utils.regions_parser import hh_region_index
+from app.services.vacancies.models import Platform
+from app.services.vacancies.utils.bulk_upsert import bulk_upsert_vacancies
+from app.services.vacancies.utils.sources import SourceAdapter, register_source
+
+logger = logging.getLogger(__name__)
+
+
+@register_source
+class TelegramSource(SourceAdapter):
+    """
+    Вакансии из Telegram-каналов присылает слушатель (run_listener), поэтому
+    стадии fetch у источника нет: разобранные сообщения передаются в ingest.
+    """
+
+    name = "telegram"
+    platform = Platform.TELEGRAM
+
+    def transform(self, payload):
+        return {
+            "platform": Platform.TELEGRAM,
+            "company": payload["company"],
+            "region": hh_region_index.region_for(payload["city"], "Регион не найден"),
+            "city": payload["city"],
+            "platform_vacancy_id": self.vacancy_id(payload),
+            "title": payload["title"],
+            "salary": payload["salary"],
+            "url": payload["url"],
+            "experience": payload["experience"],
+            "schedule": payload["schedule"],
+            "work_format": payload["work_format"],
+            "skills": payload["skills"],
+            "description": payload["description"],
+            "address": payload["address"],
+            "contacts": payload["contacts"],
+            "published_at": datetime.datetime.now(),
+        }
+
+    @staticmethod
+    def vacancy_id(payload):
+        """
+        id из ссылки поста (url вакансии и так уникален), без нее — из текста
+        полей: повторная обработка того же поста из архива обновляет
+        вакансию, а не создает новую. 16 hex-символов после названия
+        площадки укладываются в platform_vacancy_id (max_length=25).
+        """
+        key = payload["url"] or "\n".join(
+            payload[field] or "" for field in ("company", "title", "description")
+        )
+        digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        return f"{Platform.TELEGRAM}{digest}"
+
+    def save(self, rows):
+        """
+        Сохраняет пачку; при конфликте уникальности (пост ссылается на
+        вакансию, уже сохраненную с другим id) строки сохраняются по одной,
+        каждая в своей точке сохранения, и конфликтующие пропускаются.
+        DataError (значение не помещается в поле) — ошибка в данных, а не
+        конфликт: она не перехватывается, и пачку повторит MessageQueue.
+        """
+        try:
+            with transaction.atomic():
+                return bulk_upsert_vacancies(rows)
+        except IntegrityError as e:
+            logger.warning(f"Пачка вакансий Telegram не сохранена целиком: {e}")
+
+        vacancy_ids = []
+        # Как и в bulk_upsert_vacancies, при повторе id побеждает последняя строка.
+        for row in {row["platform_vacancy_id"]: row for row in rows}.values():
+            try:
+                with transaction.atomic():
+                    vacancy_ids.extend(bulk_upsert_vacancies([row]))
+            except IntegrityError as e:
+                logger.error(
+                    f"Вакансия Telegram {row['platform_vacancy_id']} "
+                    f"({row['url']}) не сохранена: {e}"
+                )
+        return vacancy_ids
@@ -0,0 +1,283 @@
+import asyncio
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from django.test import TransactionTestCase, override_settings
+
+from app.parser import get_fixture_data
+from app.services.telegram.telegram_channels.models import Channel
+from app.settings import FIXTURE_PATH
+
+from .message_queue import SPILL, MessageQueue
+from .models import KeyWord
+from .parser.keyword_matcher import KeywordMatcher
+from .parser.keyword_store import keyword_store
+from .parser.line_parser import LineParser
+from .parser.vacancy_parser import VacancyParser
+from .views import TelegramParserView
+
+
+class TelegramParserTests(TransactionTestCase):
+    def setUp(self):
+        corpus = get_fixture_data(os.path.join(FIXTURE_PATH, "telegram_posts.json"))
+        self.posts = corpus["posts"]
+        self.keywords = KeyWord.objects.create(**corpus["keywords"])
+        keyword_store.invalidate()
+        self.addCleanup(keyword_store.invalidate)
+
+    def test_parse_vacancy_from_text(self):
+        data = asyncio.run(VacancyParser().parse_vacancy_from_text(self.posts[0]))
+
+        self.assertEqual(data["title"], "Python-разработчик (Middle)")
+        self.assertEqual(data["company"], "Яндекс")
+        self.assertEqual(data["city"], "Москва")
+        self.assertEqual(data["contacts"], "@yandex_hr")
+        self.assertEqual(data["url"], "https://t.me/yandex_jobs/101")
+
+    def test_keywords_loaded_once_for_steady_state(self):
+        parser = VacancyParser()
+
+        async def parse_all():
+            await keyword_store.aget()
+            with patch.object(
+                keyword_store, "load", side_effect=AssertionError("DB query")
+            ):
+                return [
+                    await parser.parse_vacancy_from_text(post) for post in self.posts
+                ]
+
+        results = asyncio.run(parse_all())
+        self.assertEqual(len(results), len(self.posts))
+
+    def test_keywords_reload_on_save_and_ttl(self):
+        self.assertEqual(keyword_store.get()["city"], ["город", "локация"])
+
+        self.keywords.city = ["город"]
+        self.keywords.save()
+        self.assertEqual(keyword_store.get()["city"], ["город"])
+
+        with override_settings(TELEGRAM_KEYWORDS_TTL=0):
+            keyword_store.invalidate()
+            keyword_store.get()
+        KeyWord.objects.filter(id=self.keywords.id).update(city=["локация"])
+        self.assertEqual(keyword_store.get()["city"], ["локация"])
+
+    def test_keyword_matcher_matches_per_field_search(self):
+        keywords = {
+            "salary": ["зп", "зп.", "з/п"],
+            "schedule": ["зп. и график", "график"],
+            "city": ["Москва", "моск"],
+            "skills": ["c++", ""],
+            "address": [],
+            "id": 1,
+        }
+        matcher = KeywordMatcher(keywords)
+        lines = self.posts[0].splitlines() + [
+            "ЗП. и график обсуждаются",
+            "Москва, C++ и з/п",
+            "",
+        ]
+
+        for line in lines:
+            expected = {
+                field
+                for field, words in keywords.items()
+                if isinstance(words, list) and any(kw in line.lower() for kw in words)
+            }
+            self.assertEqual(matcher.match(line), expected, line)
+
+    def test_line_parser_extracts_values(self):
+        parser = LineParser(["зп", "з/п", "оплата (руб.)"])
+
+        self.assertEqual(parser.extract_value("Город — Москва"), "Москва")
+        self.assertEqual(parser.extract_value("Москва"), "Москва")
+        self.assertEqual(parser.extract_salary("З/П: от 120 000 руб."), "от 120 000")
+        self.assertEqual(parser.extract_salary("Оплата (руб.) 90 000"), "90 000")
+        self.assertIsNone(parser.extract_salary("Зарплата по договоренности"))
+        self.assertEqual(parser.extract_phone("Пишите @hr_bot, 8 999"), "@hr_bot")
+        self.assertEqual(
+            parser.extract_phone("Тел.: +7 (912) 345-67-89"), "+7 (912) 345-67-89"
+        )
+        self.assertIsNone(parser.extract_phone("Телефон не указан"))
+        self.assertEqual(
+            parser.extract_link("Подробнее: t.me/jobs/1 сегодня"), "t.me/jobs/1"
+        )
+
+    def test_listener_applies_channel_changes(self):
+        Channel.objects.create(username="known", channel_id=123)
+        Channel.objects.create(username="new", channel_id=0)
+        Channel.objects.create(username="missing", channel_id=0)
+        Channel.objects.create(username="disabled", channel_id=999, status="error")
+
+        async def get_peer_id(username):
+            if username == "missing":
+                raise ValueError("No user has this username")
+            return -1000000000456
+
+        listener = TelegramParserView()
+        listener.client = SimpleNamespace(get_peer_id=AsyncMock(side_effect=get_peer_id))
+
+        self.assertEqual(asyncio.run(listener.refresh_channels()), 2)
+        self.assertEqual(listener.chat_ids, {-1000000000123, -1000000000456})
+        self.assertEqual(Channel.objects.get(username="new").channel_id, 456)
+        self.assertEqual(Channel.objects.get(username="missing").status, "error")
+        self.assertTrue(listener.is_watched(SimpleNamespace(chat_id=-1000000000456)))
+        self.assertFalse(listener.is_watched(SimpleNamespace(chat_id=-1000000000999)))
+
+        Channel.objects.filter(username="known").update(status="error")
+        Channel.objects.filter(username="new").delete()
+        Channel.objects.create(username="added", channel_id=789)
+        asyncio.run(listener.refresh_channels())
+
+        self.assertEqual(listener.chat_ids, {-1000000000789})
+        self.assertEqual(listener.client.get_peer_id.await_count, 2)
+
+    def test_message_queue_flushes_by_size_and_interval(self):
+        batches = []
+
+        async def parse(text):
+            return {"title": text} if text != "реклама" else None
+
+        async def save(parsed_list):
+            batches.append([parsed["title"] for parsed in parsed_list])
+
+        async def run():
+            queue = MessageQueue(
+                parse, save, workers=2, batch_size=3, flush_interval=0.2
+            )
+            await queue.start()
+            for text in ["a", "реклама", "b", "c", "d"]:
+                queue.offer(text)
+            await asyncio.sleep(0.05)
+            # Пачка из трех записана сразу, четвертое сообщение ждет интервала.
+            self.assertEqual(len(batches), 1)
+            await asyncio.sleep(0.3)
+            self.assertEqual(len(batches), 2)
+            await queue.stop()
+            return queue.metrics()
+
+        metrics = asyncio.run(run())
+        self.assertEqual(sorted(batches[0]), ["a", "b", "c"])
+        self.assertEqual(batches[1], ["d"])
+        self.assertEqual(metrics["saved"], 4)
+        self.assertEqual(metrics["batches"], 2)
+        self.assertEqual(metrics["depth"], 0)
+
+    def test_message_queue_stop_flushes_without_waiting(self):
+        saved = []
+
+        async def parse(text):
+            return {"title": text}
+
+        async def save(parsed_list):
+            saved.extend(parsed["title"] for parsed in parsed_list)
+
+        async def run():
+            queue = MessageQueue(parse, save, batch_size=10, flush_interval=60)
+            await queue.start()
+            queue.offer("a")
+            await asyncio.wait_for(queue.stop(), 1)
+
+        asyncio.run(run())
+        self.assertEqual(saved, ["a"])
+
+    @patch("app.services.telegram.telegram_parser.message_queue.RETRY_DELAY", 0)
+    def test_message_queue_retries_and_spills_failed_batch(self):
+        spill_dir = tempfile.mkdtemp()
+        save = AsyncMock(side_effect=[OSError("нет связи"), None])
+
+        async def parse(text):
+            return {"title": text}
+
+        async def run(save):
+            queue = MessageQueue(
+                parse, save, flush_interval=0.01, overflow=SPILL, spill_dir=spill_dir
+            )
+            await queue.start()
+            queue.offer("a")
+            await queue.stop()
+            return queue.metrics()
+
+        metrics = asyncio.run(run(save))
+        self.assertEqual(save.await_count, 2)
+        self.assertEqual(metrics["saved"], 1)
+
+        save = AsyncMock(side_effect=OSError("нет связи"))
+        metrics = asyncio.run(run(save))
+        self.assertEqual(save.await_count, 4)
+        self.assertEqual(metrics["spilled"], 1)
+        self.assertEqual(metrics["failed"], 0)
+        self.assertEqual(os.listdir(spill_dir), ["telegram-spill.jsonl"])
+
+    def test_message_queue_drops_on_overflow(self):
+        async def run():
+            queue = MessageQueue(AsyncMock(), AsyncMock(), maxsize=2)
+            return [queue.offer(text) for text in "abc"], queue.metrics()
+
+        accepted, metrics = asyncio.run(run())
+        self.assertEqual(accepted, [True, True, False])
+        self.assertEqual(metrics["received"], 3)
+        self.assertEqual(metrics["dropped"], 1)
+        self.assertEqual(metrics["depth"], 2)
+
+    def test_message_queue_replays_spill_on_start(self):
+        spill_dir = tempfile.mkdtemp()
+        saved = []
+
+        async def parse(text):
+            return {"title": text}
+
+        async def save(parsed_list):
+            saved.extend(parsed["title"] for parsed in parsed_list)
+
+        async def overflow():
+            queue = MessageQueue(
+                parse, save, maxsize=1, overflow=SPILL, spill_dir=spill_dir
+            )
+            queue.offer("a")
+            queue.offer("б")
+            await queue.start()
+            await queue.stop()
+            return queue.metrics()
+
+        async def restart():
+            queue = MessageQueue(
+                parse, save, flush_interval=0.01, overflow=SPILL, spill_dir=spill_dir
+            )
+            await queue.start()
+            await asyncio.sleep(0.05)
+            await queue.stop()
+
+        self.assertEqual(asyncio.run(overflow())["spilled"], 1)
+        self.assertEqual(saved, ["a"])
+        asyncio.run(restart())
+        self.assertEqual(saved, ["a", "б"])
+        self.assertEqual(os.listdir(spill_dir), [])
+
+    def test_message_queue_replays_leftover_replay_files(self):
+        spill_dir = tempfile.mkdtemp()
+        saved = []
+        # Прошлый запуск упал посреди разбора: .replay-файл остался на диске.
+        with open(os.path.join(spill_dir, "telegram-spill-1.replay"), "w") as file:
+            file.write('{"text": "в"}\nне json\n')
+        with open(os.path.join(spill_dir, "telegram-spill.jsonl"), "w") as file:
+            file.write('{"text": "г"}\n')
+
+        async def parse(text):
+            return {"title": text}
+
+        async def save(parsed_list):
+            saved.extend(parsed["title"] for parsed in parsed_list)
+
+        async def run():
+            queue = MessageQueue(
+                parse, save, flush_interval=60, overflow=SPILL, spill_dir=spill_dir
+            )
+            await queue.start()
+            await asyncio.wait_for(queue.stop(), 1)
+
+        asyncio.run(run())
+        self.assertCountEqual(saved, ["в", "г"])
+        self.assertEqual(os.listdir(spill_dir), [])
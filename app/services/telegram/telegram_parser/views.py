@@ -1,17 +1,22 @@
+import asyncio
 import logging
 
-from django.db import DataError, IntegrityError
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from dotenv import load_dotenv
-from telethon import events
+from telethon import events, utils
 from telethon.errors import (
     AuthKeyError,
     PhoneNumberInvalidError,
     RPCError,
     SessionPasswordNeededError,
 )
+from telethon.tl.types import PeerChannel
 
+from app.services.telegram.telegram_channels.models import Channel
 from app.services.telegram.telegram_client import TelegramChannelClient
 
+from .message_queue import MessageQueue
 from .parser.keyword_extractor import KeywordExtractor
 from .parser.save_vacancy import SaveDataVacancy
 from .parser.vacancy_parser import VacancyParser
@@ -21,32 +26,107 @@ logger = logging.getLogger(__name__)
 
 
 class TelegramParserView:
+    """
+    Слушатель всех активных каналов на одном соединении Telegram.
+
+    Обработчик NewMessage регистрируется один раз и отбирает сообщения по
+    множеству chat id, которое refresh_channels сверяет с Channel каждые
+    TELEGRAM_CHANNEL_REFRESH_INTERVAL секунд: новые активные каналы
+    подключаются, удаленные и переведенные в status="error" отключаются
+    без перезапуска клиента. Обработчик только кладет пост в MessageQueue,
+    разбор и запись идут в ее задачах.
+    """
+
     def __init__(self):
         self.client = None
         self.keywords = KeywordExtractor()
         self.vacancy = VacancyParser()
         self.save = SaveDataVacancy()
+        self.queue = MessageQueue(
+            self.vacancy.parse_vacancy_from_text,
+            self.save.save_vacancies,
+            workers=settings.TELEGRAM_PARSE_WORKERS,
+            batch_size=settings.TELEGRAM_BATCH_SIZE,
+            flush_interval=settings.TELEGRAM_FLUSH_INTERVAL_MS / 1000,
+            maxsize=settings.TELEGRAM_QUEUE_SIZE,
+            overflow=settings.TELEGRAM_QUEUE_OVERFLOW,
+            spill_dir=settings.TELEGRAM_SPILL_DIR,
+        )
+        # username -> chat id (для каналов с отрицательным id, -100...)
+        self.channels = {}
+        self.chat_ids = set()
 
     async def initialize(self):
         client_wrapper = await TelegramChannelClient.create()
         self.client = client_wrapper.client
-        self.vacancy = VacancyParser()
         self.keywords = KeywordExtractor()
         await self.keywords.load_keywords()
 
-    async def channel_listener(self, channel_username):
-        @self.client.on(events.NewMessage(chats=channel_username))
-        async def new_post_handler(event):
-            message = event.message.message
-            parsed = await self.vacancy.parse_vacancy_from_text(message)
-            if parsed:
-                try:
-                    await self.save.save_vacancy(parsed, event.message.date)
-                except (IntegrityError, DataError) as e:
-                    logger.error(f"Ошибка целостности БД: {e}")
-                else:
-                    logger.info("Сохранено в БД")
+    def is_watched(self, event):
+        return event.chat_id in self.chat_ids
+
+    async def handle_message(self, event):
+        if not self.queue.offer(event.message.message):
+            logger.warning(f"Очередь постов переполнена: {self.queue.metrics()}")
+
+    async def refresh_channels(self):
+        rows = await sync_to_async(
+            lambda: list(
+                Channel.objects.filter(status="active").values_list(
+                    "username", "channel_id"
+                )
+            )
+        )()
+        active = dict(rows)
+
+        for username in set(self.channels) - set(active):
+            self.chat_ids.discard(self.channels.pop(username))
+            logger.info(f"⏹️ Канал отключен: {username}")
 
+        failed = []
+        for username, channel_id in active.items():
+            if username in self.channels:
+                continue
+            try:
+                chat_id = await self.resolve_chat_id(username, channel_id)
+            except (ValueError, RPCError) as e:
+                logger.error(f"Канал {username} не найден: {e}")
+                failed.append(username)
+                continue
+            self.channels[username] = chat_id
+            self.chat_ids.add(chat_id)
+            logger.info(f"▶️ Подключение к новому каналу: {username}")
+
+        if failed:
+            await sync_to_async(Channel.objects.filter(username__in=failed).update)(
+                status="error"
+            )
+        return len(self.chat_ids)
+
+    async def resolve_chat_id(self, username, channel_id):
+        # id из Channel не требует запроса к Telegram; без него канал
+        # ищется по username, и id сохраняется для следующих запусков.
+        if channel_id:
+            return utils.get_peer_id(PeerChannel(channel_id))
+        chat_id = await self.client.get_peer_id(username)
+        await sync_to_async(Channel.objects.filter(username=username).update)(
+            channel_id=utils.resolve_id(chat_id)[0]
+        )
+        return chat_id
+
+    async def refresh_loop(self):
+        while True:
+            await asyncio.sleep(settings.TELEGRAM_CHANNEL_REFRESH_INTERVAL)
+            try:
+                await self.refresh_channels()
+            except Exception as e:
+                logger.error(f"Не удалось обновить список каналов: {e}")
+            logger.info(f"Очередь постов: {self.queue.metrics()}")
+
+    async def run(self):
+        self.client.add_event_handler(
+            self.handle_message, events.NewMessage(func=self.is_watched)
+        )
         try:
             await self.client.start()
         except AuthKeyError as e:
@@ -64,5 +144,14 @@ class TelegramParserView:
         except (OSError, ConnectionError) as e:
             logger.error(f"Проблема с соединением: {e}")
             return
-        await self.client.run_until_disconnected()
+
+        watched = await self.refresh_channels()
+        logger.info(f"Слушатель телеграм работает, каналов: {watched}")
+        await self.queue.start()
+        refresh = asyncio.create_task(self.refresh_loop())
+        try:
+            await self.client.run_until_disconnected()
+        finally:
+            refresh.cancel()
+            await self.queue.stop()
         logger.info("Слушатель остановлен")
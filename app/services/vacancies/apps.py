@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class VacanciesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app.services.vacancies"
+
+    def ready(self):
+        from . import signals  # noqa: F401
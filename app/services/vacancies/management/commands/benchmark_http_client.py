@@ -0,0 +1,133 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from app.services.vacancies.utils.http_client import (
+    ClientSessionRegistry,
+    HTTPClient,
+)
+
+PAYLOAD = json.dumps({"items": [{"id": str(i)} for i in range(20)]}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        # Заранее заданные ответы (статус, заголовки), затем 200.
+        status, headers = self.server.next_response()
+        body = PAYLOAD if status == 200 else b"{}"
+        self.send_response(status)
+        for name, value in {"Content-Type": "application/json", **headers}.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, responses=()):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.connections = 0
+        self.requests = 0
+        self.responses = list(responses)
+        self.responses_lock = threading.Lock()
+
+    def next_response(self):
+        with self.responses_lock:
+            self.requests += 1
+            if self.responses:
+                return self.responses.pop(0)
+        return 200, {}
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+class LegacyHTTPClient(HTTPClient):
+    """Прежнее поведение: новая ClientSession на каждый вызов get."""
+
+    CONCURRENT_LIMIT = 10
+
+    async def get(self, urls, params=None):
+        semaphore = asyncio.Semaphore(self.CONCURRENT_LIMIT)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async def fetch(session, url):
+            async with semaphore:
+                async with session.get(url, params=params) as response:
+                    return await response.json()
+
+        async with aiohttp.ClientSession(
+            timeout=timeout, raise_for_status=True
+        ) as session:
+            return await asyncio.gather(*(fetch(session, url) for url in urls))
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает пропускную способность HTTPClient на локальном "
+        "stub-сервере: новая сессия на вызов и общий пул соединений."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--calls", type=int, default=100, help="Количество вызовов get"
+        )
+        parser.add_argument(
+            "--batch", type=int, default=10, help="URL в одном вызове get"
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=100_000,
+            help="Ограничение запросов в секунду для stub-сервера",
+        )
+
+    def handle(self, *args, **options):
+        with override_settings(HTTP_CLIENT_DEFAULT_RATE_LIMIT=options["rate"]):
+            self.run_benchmark(options["calls"], options["batch"])
+
+    def run_benchmark(self, calls, batch):
+        server = StubServer()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/vacancies"
+
+        registry = ClientSessionRegistry()
+        clients = {
+            "legacy": LegacyHTTPClient(url, {}),
+            "pooled": HTTPClient(url, {}, registry=registry),
+        }
+        self.stdout.write(f"{'client':>8} {'req/s':>10} {'connections':>12}")
+        try:
+            for name, client in clients.items():
+                server.connections = 0
+                rate = self.measure(client, url, calls, batch)
+                self.stdout.write(f"{name:>8} {rate:>10.0f} {server.connections:>12}")
+        finally:
+            registry.close()
+            server.shutdown()
+            server.server_close()
+
+    @staticmethod
+    def measure(client, url, calls, batch):
+        urls = [f"{url}/{i}" for i in range(batch)]
+        started = time.perf_counter()
+        for _ in range(calls):
+            # Как и во view под WSGI, каждый вызов идет в новом event loop.
+            asyncio.run(client.get(urls))
+        return calls * batch / (time.perf_counter() - started)
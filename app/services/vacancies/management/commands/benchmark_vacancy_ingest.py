@@ -0,0 +1,100 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from app.services.vacancies.models import City, Company, Platform, Vacancy
+from app.services.vacancies.utils.bulk_upsert import bulk_upsert_vacancies
+
+DESCRIPTION = "Python Django PostgreSQL Celery Redis " * 50
+CITIES = ["Москва", "Санкт-Петербург", "Казань", "Новосибирск", "Екатеринбург"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает сохранение вакансий HH/SuperJob: построчный "
+        "update_or_create и пакетный bulk_upsert_vacancies. "
+        "Каждый замер выполняется в транзакции и откатывается."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[1_000, 10_000],
+            help="Количество вакансий в пачке",
+        )
+        parser.add_argument(
+            "--companies",
+            type=int,
+            default=200,
+            help="Количество различных компаний в пачке",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'rows':>8} {'legacy queries':>15} {'legacy ms':>10} "
+            f"{'bulk queries':>13} {'bulk ms':>9}"
+        )
+        for size in options["sizes"]:
+            rows = self.build_rows(size, options["companies"])
+            legacy = self.measure(self.legacy_save, rows)
+            bulk = self.measure(bulk_upsert_vacancies, rows)
+            self.stdout.write(
+                f"{size:>8} {legacy[0]:>15} {legacy[1]:>10.1f} "
+                f"{bulk[0]:>13} {bulk[1]:>9.1f}"
+            )
+
+    @staticmethod
+    def build_rows(size, companies):
+        now = timezone.now()
+        return [
+            {
+                "platform": Platform.HH,
+                "company": f"Benchmark {i % companies}",
+                "city": CITIES[i % len(CITIES)],
+                "region": CITIES[i % len(CITIES)],
+                "platform_vacancy_id": f"{Platform.HH}bench{i}",
+                "title": f"Python Developer {i}",
+                "url": f"https://example.com/bench/{i}",
+                "salary": "от 100000 RUB",
+                "description": DESCRIPTION,
+                "contacts": "bench@example.com",
+                "published_at": now - timezone.timedelta(seconds=i),
+            }
+            for i in range(size)
+        ]
+
+    @staticmethod
+    def measure(func, rows):
+        queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with transaction.atomic(), connection.execute_wrapper(count_queries):
+            started = time.perf_counter()
+            func(rows)
+            elapsed = (time.perf_counter() - started) * 1000
+            transaction.set_rollback(True)
+        return queries, elapsed
+
+    @staticmethod
+    def legacy_save(rows):
+        for row in rows:
+            platform, _ = Platform.objects.get_or_create(name=row["platform"])
+            company, _ = Company.objects.get_or_create(name=row["company"])
+            city, _ = City.objects.get_or_create(name=row["city"])
+            Vacancy.objects.update_or_create(
+                platform_vacancy_id=row["platform_vacancy_id"],
+                defaults={
+                    **row,
+                    "platform": platform,
+                    "company": company,
+                    "city": city,
+                },
+            )
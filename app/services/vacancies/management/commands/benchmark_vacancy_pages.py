@@ -0,0 +1,98 @@
+import time
+import tracemalloc
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.utils import timezone
+
+from app.services.vacancies.models import City, Company, Platform, Vacancy
+from app.services.vacancies.utils.paginated_vacancies import (
+    VACANCIES_PER_PAGE,
+    get_searched_vacancies,
+    get_vacancies_page,
+)
+
+DESCRIPTION = "Python Django PostgreSQL Celery Redis " * 50
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает пиковую память одной страницы вакансий: "
+        "старый путь (весь список в Python) и постраничный запрос в БД. "
+        "Тестовые данные создаются в транзакции и откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[1_000, 5_000, 20_000],
+            help="Размеры таблицы Vacancy для замеров",
+        )
+        parser.add_argument("--search", default="", help="Поисковый запрос")
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'rows':>8} {'legacy peak KiB':>16} {'legacy ms':>10} "
+            f"{'paged peak KiB':>15} {'paged ms':>9}"
+        )
+        with transaction.atomic():
+            created = 0
+            for size in sorted(options["sizes"]):
+                self.create_vacancies(created, size)
+                created = size
+
+                legacy = self.measure(self.legacy_page, options["search"])
+                paged = self.measure(self.paged_page, options["search"])
+                self.stdout.write(
+                    f"{size:>8} {legacy[0]:>16.1f} {legacy[1]:>10.1f} "
+                    f"{paged[0]:>15.1f} {paged[1]:>9.1f}"
+                )
+            transaction.set_rollback(True)
+
+    def create_vacancies(self, start, stop):
+        platform, _ = Platform.objects.get_or_create(name=Platform.HH)
+        company, _ = Company.objects.get_or_create(name="Benchmark")
+        city, _ = City.objects.get_or_create(name="Москва")
+        now = timezone.now()
+        Vacancy.objects.bulk_create(
+            (
+                Vacancy(
+                    platform=platform,
+                    company=company,
+                    city=city,
+                    platform_vacancy_id=f"bench{i}",
+                    title=f"Python Developer {i}",
+                    url=f"https://example.com/bench/{i}",
+                    description=DESCRIPTION,
+                    contacts="bench@example.com",
+                    published_at=now - timezone.timedelta(seconds=i),
+                )
+                for i in range(start, stop)
+            ),
+            batch_size=1000,
+        )
+
+    @staticmethod
+    def measure(func, search_query):
+        tracemalloc.start()
+        started = time.perf_counter()
+        func(search_query)
+        elapsed = (time.perf_counter() - started) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak / 1024, elapsed
+
+    @staticmethod
+    def legacy_page(search_query):
+        vacancies = async_to_sync(get_searched_vacancies)(search_query)
+        paginator = Paginator(vacancies, VACANCIES_PER_PAGE)
+        return paginator.get_page(1).object_list
+
+    @staticmethod
+    def paged_page(search_query):
+        vacancies, _, _ = async_to_sync(get_vacancies_page)(search_query, 1)
+        return vacancies
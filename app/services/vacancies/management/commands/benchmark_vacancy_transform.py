@@ -0,0 +1,77 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app.parser import get_fixture_data, save_data
+from app.services.hh.hh_parser.utils import data_transformer
+from app.services.hh.hh_parser.utils.data_transformer import transform_hh_data
+from app.services.parser.api_parser.base_parser import BaseVacancyParser
+from app.services.vacancies.utils.region_index import RegionIndex
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает стоимость transform_hh_data на одну вакансию: "
+        "чтение файла регионов на каждый вызов и общий RegionIndex."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=200, help="Количество вакансий")
+        parser.add_argument(
+            "--mapping",
+            help="JSON-файл сопоставления город -> регион "
+            "(по умолчанию собирается из индекса парсеров)",
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = options["mapping"]
+            if not path:
+                path = os.path.join(tmp, "city_region_mapping.json")
+                mapping = BaseVacancyParser().get_city_to_region_mapping()
+                save_data(path, dict(mapping))
+            self.run_benchmark(path, options["count"])
+
+    def run_benchmark(self, path, count):
+        items = self.build_items(count)
+        index = RegionIndex(path, fetch_mapping=dict)
+
+        legacy = self.measure(items, lambda source="hh": get_fixture_data(path))
+        indexed = self.measure(items, lambda source="hh": index.get())
+
+        self.stdout.write(f"{'path':>8} {'µs per vacancy':>15}")
+        self.stdout.write(f"{'legacy':>8} {legacy:>15.1f}")
+        self.stdout.write(f"{'index':>8} {indexed:>15.1f}")
+
+    @staticmethod
+    def build_items(count):
+        return [
+            {
+                "id": str(i),
+                "name": f"Python Developer {i}",
+                "salary": {"from": 100000, "to": 200000, "currency": "RUR"},
+                "alternate_url": f"https://hh.ru/vacancy/{i}",
+                "area": {"name": "Казань"},
+                "employer": {"name": "Hexlet"},
+                "key_skills": [{"name": "Python"}, {"name": "Django"}],
+                "description": "<p>Python Django PostgreSQL</p>",
+                "published_at": timezone.now(),
+            }
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def measure(items, get_mapping):
+        with mock.patch.object(
+            data_transformer, "get_hh_city_to_region_mapping", get_mapping
+        ):
+            transform_hh_data(items[0])
+            started = time.perf_counter()
+            for item in items:
+                transform_hh_data(item)
+            elapsed = time.perf_counter() - started
+        return elapsed / len(items) * 1_000_000
@@ -0,0 +1,52 @@
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+
+from app.services.vacancies.utils.catalog_crawl import CRAWL_DAYS, crawl_catalogs
+from app.services.vacancies.utils.sources import catalog_sources
+
+
+class Command(BaseCommand):
+    help = (
+        "Полный обход IT-каталога площадок по окнам дат с контрольными "
+        "точками: повторный запуск с тем же --run-id продолжает обход."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--platform",
+            action="append",
+            choices=list(catalog_sources()),
+            help="Площадка (по умолчанию все)",
+        )
+        parser.add_argument(
+            "--days", type=int, default=CRAWL_DAYS, help="Глубина обхода в днях"
+        )
+        parser.add_argument(
+            "--run-id", help="Идентификатор обхода (по умолчанию текущая дата)"
+        )
+        parser.add_argument(
+            "--hh-area",
+            action="append",
+            default=[],
+            help="Регион HH (area); окна строятся отдельно для каждого",
+        )
+
+    def handle(self, *args, **options):
+        summaries = async_to_sync(crawl_catalogs)(
+            options["platform"] or list(catalog_sources()),
+            run_id=options["run_id"],
+            days=options["days"],
+            areas={"hh": options["hh_area"]},
+        )
+        self.stdout.write(
+            f"{'platform':>10} {'windows':>8} {'resumed':>8} {'failed':>7} "
+            f"{'found':>8} {'saved':>8} {'known':>8} {'304':>6}"
+        )
+        for platform, summary in summaries.items():
+            self.stdout.write(
+                f"{platform:>10} {summary.windows:>8} {summary.resumed:>8} "
+                f"{summary.failed:>7} {summary.found:>8} {summary.saved:>8} "
+                f"{summary.known:>8} {summary.unchanged:>6}"
+            )
+            for error in summary.errors:
+                self.stderr.write(f"{platform}: {error}")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from app.services.vacancies.utils.search_index import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Пересобирает поисковый индекс вакансий"
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.create_index()
+        backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Поисковый индекс пересобран ({type(backend).__name__})")
+        )
@@ -0,0 +1,73 @@
+import time
+from datetime import date
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app.services.vacancies.utils.raw_archive import iter_payloads, iter_segments
+from app.services.vacancies.utils.search_cache import invalidate_search_cache
+from app.services.vacancies.utils.sources import catalog_sources, get_source
+
+
+class Command(BaseCommand):
+    help = (
+        "Переразбирает архив сырых ответов площадок текущими "
+        "преобразователями и сохраняет вакансии пачками, без запросов к API."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--platform",
+            action="append",
+            choices=list(catalog_sources()),
+            help="Площадка (по умолчанию все)",
+        )
+        parser.add_argument(
+            "--date-from", type=date.fromisoformat, help="Дата получения, с"
+        )
+        parser.add_argument(
+            "--date-to", type=date.fromisoformat, help="Дата получения, по"
+        )
+        parser.add_argument(
+            "--archive", default=settings.RAW_ARCHIVE_DIR, help="Каталог архива"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Вакансий в пачке"
+        )
+
+    def handle(self, *args, **options):
+        if not options["archive"]:
+            raise CommandError(
+                "Архив не настроен: задайте RAW_ARCHIVE_DIR или --archive"
+            )
+
+        for name in options["platform"] or list(catalog_sources()):
+            source = get_source(name)
+            segments = iter_segments(
+                options["archive"],
+                source.platform,
+                options["date_from"],
+                options["date_to"],
+            )
+            payloads = iter_payloads(segments)
+            started = time.perf_counter()
+            read = saved = failed = 0
+            # Сегменты идут по порядку записи: более поздний ответ о той же
+            # вакансии перезаписывает ранний.
+            while batch := list(islice(payloads, options["batch_size"])):
+                rows = []
+                for payload in batch:
+                    try:
+                        rows.append(source.transform(payload))
+                    except Exception as e:
+                        failed += 1
+                        self.stderr.write(f"{name} {payload.get('id')}: {e}")
+                read += len(batch)
+                saved += len(source.save(rows))
+            self.stdout.write(
+                f"{name}: прочитано {read}, сохранено {saved}, ошибок {failed} "
+                f"за {time.perf_counter() - started:.1f} с"
+            )
+
+        invalidate_search_cache()
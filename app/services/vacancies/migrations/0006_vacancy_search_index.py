@@ -0,0 +1,85 @@
+from django.db import migrations
+
+# DDL зафиксирован здесь, а не берется из utils/search_index.py, чтобы
+# последующие правки поиска не меняли уже примененную миграцию.
+DOCUMENT_SOURCE = """
+    FROM vacancies_vacancy v
+    LEFT JOIN vacancies_company c ON c.id = v.company_id
+    LEFT JOIN vacancies_city ci ON ci.id = v.city_id
+"""
+DOCUMENT_COLUMNS = (
+    ("title", "v.title", "A"),
+    ("skills", "v.skills", "B"),
+    ("company", "c.name", "C"),
+    ("city", "ci.name", "C"),
+    ("description", "v.description", "D"),
+)
+POSTGRES_DOCUMENT = " || ".join(
+    f"setweight(to_tsvector('{config}', coalesce({column}, '')), '{weight}')"
+    for _, column, weight in DOCUMENT_COLUMNS
+    for config in ("russian", "english")
+)
+POSTGRES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS vacancies_vacancy_search (
+        vacancy_id bigint PRIMARY KEY
+            REFERENCES vacancies_vacancy (id)
+            ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+        document tsvector NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS vacancies_vacancy_search_document_idx
+    ON vacancies_vacancy_search USING gin (document)
+    """,
+    f"""
+    INSERT INTO vacancies_vacancy_search (vacancy_id, document)
+    SELECT v.id, {POSTGRES_DOCUMENT}
+    {DOCUMENT_SOURCE}
+    ON CONFLICT (vacancy_id) DO UPDATE SET document = EXCLUDED.document
+    """,
+]
+SQLITE_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_vacancy_fts
+    USING fts5(
+        title, skills, company, city, description,
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    INSERT INTO vacancies_vacancy_fts (rowid, title, skills, company, city, description)
+    SELECT v.id, {}
+    {}
+    """.format(
+        ", ".join(f"coalesce({column}, '')" for _, column, _ in DOCUMENT_COLUMNS),
+        DOCUMENT_SOURCE,
+    ),
+]
+DROP_SQL = {
+    "postgresql": "DROP TABLE IF EXISTS vacancies_vacancy_search",
+    "sqlite": "DROP TABLE IF EXISTS vacancies_vacancy_fts",
+}
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {"postgresql": POSTGRES_SQL, "sqlite": SQLITE_SQL}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    sql = DROP_SQL.get(schema_editor.connection.vendor)
+    if sql:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0005_vacancy_published_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0006_vacancy_search_index'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='vacancy',
+            name='unique_platform_vacancy_id',
+        ),
+        migrations.AddConstraint(
+            model_name='vacancy',
+            constraint=models.UniqueConstraint(fields=('platform_vacancy_id',), name='unique_platform_vacancy_id'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0007_vacancy_unique_platform_vacancy_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageValidator',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(unique=True, verbose_name='Cсылка')),
+                ('etag', models.CharField(max_length=255, null=True, verbose_name='ETag')),
+                ('last_modified', models.CharField(max_length=64, null=True, verbose_name='Last-Modified')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Валидатор страницы',
+                'verbose_name_plural': 'Валидаторы страниц',
+            },
+        ),
+        migrations.CreateModel(
+            name='CrawlWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(choices=[('HeadHunter', 'HeadHunter'), ('SuperJob', 'SuperJob'), ('Telegram', 'Telegram')], max_length=50, verbose_name='Платформа')),
+                ('query_key', models.CharField(max_length=40, verbose_name='Ключ запроса')),
+                ('query', models.JSONField(default=dict, verbose_name='Параметры запроса')),
+                ('last_published_at', models.DateTimeField(verbose_name='Последняя опубликованная вакансия')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Отметка обхода',
+                'verbose_name_plural': 'Отметки обхода',
+                'constraints': [models.UniqueConstraint(fields=('platform', 'query_key'), name='unique_crawl_watermark')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0008_crawl_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(choices=[('HeadHunter', 'HeadHunter'), ('SuperJob', 'SuperJob'), ('Telegram', 'Telegram')], max_length=50, verbose_name='Платформа')),
+                ('run_id', models.CharField(max_length=50, verbose_name='Обход')),
+                ('window_key', models.CharField(max_length=100, verbose_name='Окно')),
+                ('params', models.JSONField(default=dict, verbose_name='Параметры запроса')),
+                ('found', models.PositiveIntegerField(default=0, verbose_name='Найдено')),
+                ('saved', models.PositiveIntegerField(default=0, verbose_name='Сохранено')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает'), ('done', 'Завершено'), ('failed', 'Ошибка')], default='pending', max_length=20, verbose_name='Статус')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Контрольная точка обхода',
+                'verbose_name_plural': 'Контрольные точки обхода',
+                'ordering': ['platform', 'run_id', 'window_key'],
+                'constraints': [models.UniqueConstraint(fields=('platform', 'run_id', 'window_key'), name='unique_crawl_checkpoint')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0009_crawl_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HarvestRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('done', 'Завершено'), ('failed', 'Ошибка'), ('skipped', 'Пропущено')], max_length=20, verbose_name='Статус')),
+                ('fetched', models.PositiveIntegerField(default=0, verbose_name='Получено')),
+                ('written', models.PositiveIntegerField(default=0, verbose_name='Записано')),
+                ('duration', models.FloatField(default=0, verbose_name='Длительность, с')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('started_at', models.DateTimeField(verbose_name='Начало')),
+                ('checkpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='harvest_runs', to='vacancies.crawlcheckpoint', verbose_name='Окно обхода')),
+            ],
+            options={
+                'verbose_name': 'Запуск сбора',
+                'verbose_name_plural': 'Запуски сбора',
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0010_harvest_run'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VacancyRefill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100, unique=True, verbose_name='Запрос и страница')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает'), ('running', 'Выполняется'), ('done', 'Завершено'), ('failed', 'Ошибка')], default='pending', max_length=20, verbose_name='Статус')),
+                ('details', models.JSONField(default=dict, verbose_name='Подробности')),
+                ('updated_at', models.DateTimeField(verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Догрузка вакансий',
+                'verbose_name_plural': 'Догрузки вакансий',
+            },
+        ),
+    ]
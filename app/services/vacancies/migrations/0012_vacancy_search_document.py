@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:30
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Таблица поисковых документов из 0006 была неуправляемой, и flush не мог
+# очистить вакансии из-за ее внешнего ключа. Она пересоздается как модель
+# VacancySearchDocument; на SQLite используется FTS5, и таблица пустая.
+DOCUMENT_COLUMNS = (
+    ("v.title", "A"),
+    ("v.skills", "B"),
+    ("c.name", "C"),
+    ("ci.name", "C"),
+    ("v.description", "D"),
+)
+POSTGRES_DOCUMENT = " || ".join(
+    f"setweight(to_tsvector('{config}', coalesce({column}, '')), '{weight}')"
+    for column, weight in DOCUMENT_COLUMNS
+    for config in ("russian", "english")
+)
+INDEX_SQL = [
+    """
+    CREATE INDEX IF NOT EXISTS vacancies_vacancy_search_document_idx
+    ON vacancies_vacancy_search USING gin (document)
+    """,
+    f"""
+    INSERT INTO vacancies_vacancy_search (vacancy_id, document)
+    SELECT v.id, {POSTGRES_DOCUMENT}
+    FROM vacancies_vacancy v
+    LEFT JOIN vacancies_company c ON c.id = v.company_id
+    LEFT JOIN vacancies_city ci ON ci.id = v.city_id
+    """,
+]
+UNMANAGED_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS vacancies_vacancy_search (
+        vacancy_id bigint PRIMARY KEY
+            REFERENCES vacancies_vacancy (id)
+            ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+        document tsvector NOT NULL
+    )
+"""
+
+
+def run_on_postgres(*statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            for sql in statements:
+                schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0011_vacancy_refill'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_on_postgres("DROP TABLE IF EXISTS vacancies_vacancy_search"),
+            run_on_postgres(UNMANAGED_TABLE_SQL, *INDEX_SQL),
+        ),
+        migrations.CreateModel(
+            name='VacancySearchDocument',
+            fields=[
+                ('vacancy', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='vacancies.vacancy', verbose_name='Вакансия')),
+                ('document', django.contrib.postgres.search.SearchVectorField(verbose_name='Поисковый документ')),
+            ],
+            options={
+                'verbose_name': 'Поисковый документ',
+                'verbose_name_plural': 'Поисковые документы',
+                'db_table': 'vacancies_vacancy_search',
+            },
+        ),
+        migrations.RunPython(
+            run_on_postgres(*INDEX_SQL),
+            run_on_postgres(
+                "DROP INDEX IF EXISTS vacancies_vacancy_search_document_idx"
+            ),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinLengthValidator
 from django.db import models
 
@@ -166,17 +167,271 @@ class Vacancy(models.Model):
         ordering = ["-published_at"]
         indexes = [
             models.Index(fields=["title", "city"]),
+            models.Index(
+                fields=["-published_at", "-id"],
+                name="vacancy_published_id_idx",
+            ),
         ]
         constraints = [
             models.UniqueConstraint(
                 fields=["platform_vacancy_id"],
                 name="unique_platform_vacancy_id",
-                condition=models.Q(
-                    platform__isnull=False, platform_vacancy_id__isnull=False
-                ),
             ),
         ]
 
     def __str__(self) -> str:
         company_name = self.company.name if self.company else "Неизвестную компанию"
         return f"{self.title} в {company_name}"
+
+
+class VacancySearchDocument(models.Model):
+    """
+    Поисковый документ вакансии для PostgreSQL (utils/search_index.py).
+
+    Таблица управляется Django, чтобы flush и TRUNCATE вакансий захватывали
+    и ее. GIN-индекс по document создает миграция только на PostgreSQL:
+    на SQLite поиск идет через FTS5, и таблица остается пустой.
+    """
+
+    vacancy = models.OneToOneField(
+        Vacancy,
+        primary_key=True,
+        related_name="search_document",
+        on_delete=models.CASCADE,
+        verbose_name="Вакансия",
+    )
+    document = SearchVectorField(
+        verbose_name="Поисковый документ",
+    )
+
+    class Meta:
+        db_table = "vacancies_vacancy_search"
+        verbose_name = "Поисковый документ"
+        verbose_name_plural = "Поисковые документы"
+
+    def __str__(self) -> str:
+        return str(self.vacancy_id)
+
+
+class CrawlWatermark(models.Model):
+    platform = models.CharField(
+        max_length=50,
+        choices=Platform.PLATFORM_NAME_CHOICES,
+        verbose_name="Платформа",
+    )
+    query_key = models.CharField(
+        max_length=40,
+        verbose_name="Ключ запроса",
+    )
+    query = models.JSONField(
+        default=dict,
+        verbose_name="Параметры запроса",
+    )
+    last_published_at = models.DateTimeField(
+        verbose_name="Последняя опубликованная вакансия",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Обновлено",
+    )
+
+    class Meta:
+        verbose_name = "Отметка обхода"
+        verbose_name_plural = "Отметки обхода"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["platform", "query_key"],
+                name="unique_crawl_watermark",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.platform}: {self.last_published_at}"
+
+
+class PageValidator(models.Model):
+    url = models.URLField(
+        unique=True,
+        verbose_name="Cсылка",
+    )
+    etag = models.CharField(
+        max_length=255,
+        null=True,
+        verbose_name="ETag",
+    )
+    last_modified = models.CharField(
+        max_length=64,
+        null=True,
+        verbose_name="Last-Modified",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Обновлено",
+    )
+
+    class Meta:
+        verbose_name = "Валидатор страницы"
+        verbose_name_plural = "Валидаторы страниц"
+
+    def __str__(self) -> str:
+        return self.url
+
+
+class CrawlCheckpoint(models.Model):
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Ожидает"),
+        (DONE, "Завершено"),
+        (FAILED, "Ошибка"),
+    ]
+
+    platform = models.CharField(
+        max_length=50,
+        choices=Platform.PLATFORM_NAME_CHOICES,
+        verbose_name="Платформа",
+    )
+    run_id = models.CharField(
+        max_length=50,
+        verbose_name="Обход",
+    )
+    window_key = models.CharField(
+        max_length=100,
+        verbose_name="Окно",
+    )
+    params = models.JSONField(
+        default=dict,
+        verbose_name="Параметры запроса",
+    )
+    found = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Найдено",
+    )
+    saved = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Сохранено",
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name="Статус",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Обновлено",
+    )
+
+    class Meta:
+        verbose_name = "Контрольная точка обхода"
+        verbose_name_plural = "Контрольные точки обхода"
+        ordering = ["platform", "run_id", "window_key"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["platform", "run_id", "window_key"],
+                name="unique_crawl_checkpoint",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.platform} {self.run_id} {self.window_key}: {self.status}"
+
+
+class HarvestRun(models.Model):
+    DONE = "done"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+    STATUS_CHOICES = [
+        (DONE, "Завершено"),
+        (FAILED, "Ошибка"),
+        (SKIPPED, "Пропущено"),
+    ]
+
+    checkpoint = models.ForeignKey(
+        CrawlCheckpoint,
+        related_name="harvest_runs",
+        on_delete=models.CASCADE,
+        verbose_name="Окно обхода",
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        verbose_name="Статус",
+    )
+    fetched = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Получено",
+    )
+    written = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Записано",
+    )
+    duration = models.FloatField(
+        default=0,
+        verbose_name="Длительность, с",
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name="Ошибка",
+    )
+    started_at = models.DateTimeField(
+        verbose_name="Начало",
+    )
+
+    class Meta:
+        verbose_name = "Запуск сбора"
+        verbose_name_plural = "Запуски сбора"
+        ordering = ["-started_at"]
+
+    def __str__(self) -> str:
+        return f"{self.checkpoint}: {self.status} за {self.duration:.1f} с"
+
+
+class VacancyRefill(models.Model):
+    """
+    Статус догрузки последней страницы поиска (задача refill_vacancies).
+
+    Хранится в базе, а не в кэше: статус пишет воркер Celery, а читает
+    веб-процесс, и при локальном кэше они бы не видели друг друга.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Ожидает"),
+        (RUNNING, "Выполняется"),
+        (DONE, "Завершено"),
+        (FAILED, "Ошибка"),
+    ]
+
+    key = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name="Запрос и страница",
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name="Статус",
+    )
+    details = models.JSONField(
+        default=dict,
+        verbose_name="Подробности",
+    )
+    updated_at = models.DateTimeField(
+        verbose_name="Обновлено",
+    )
+
+    class Meta:
+        verbose_name = "Догрузка вакансий"
+        verbose_name_plural = "Догрузки вакансий"
+
+    def __str__(self) -> str:
+        return f"{self.key}: {self.status}"
@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .models import City, Company, Platform, Vacancy
+from .utils.dimensions import dimension_resolver
+from .utils.search_index import index_vacancies, unindex_vacancies
+
+
+@receiver(post_save, sender=Vacancy)
+def update_vacancy_search_document(sender, instance, **kwargs):
+    index_vacancies([instance.pk])
+
+
+@receiver(post_delete, sender=Vacancy)
+def remove_vacancy_search_document(sender, instance, **kwargs):
+    unindex_vacancies([instance.pk])
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=City)
+def update_dimension_search_documents(sender, instance, created, **kwargs):
+    # Название компании и города входит в поисковый документ вакансии.
+    if created:
+        return
+    field = "company" if sender is Company else "city"
+    index_vacancies(
+        Vacancy.objects.filter(**{field: instance}).values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Platform)
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=City)
+def forget_dimension(sender, instance, **kwargs):
+    dimension_resolver.forget(sender, instance.name)
+
+
+@receiver(post_migrate)
+def clear_dimension_cache(sender, **kwargs):
+    # migrate и flush могут пересоздать справочники с новыми id.
+    dimension_resolver.clear()
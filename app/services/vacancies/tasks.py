@@ -0,0 +1,79 @@
+import logging
+
+from asgiref.sync import async_to_sync
+from celery import group
+
+from app.celery import app
+
+from .utils.catalog_crawl import CRAWL_DAYS, crawl_catalogs
+from .utils.harvest import harvest_window, plan_harvest
+from .utils.refill import DONE, FAILED, RUNNING, fetch_vacancies, set_refill_status
+from .utils.sources import catalog_sources
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(ignore_result=True)
+def refill_vacancies(search_query: str, page_number: int) -> None:
+    """
+    Догружает вакансии HH и SuperJob для последней страницы поиска.
+
+    Статус выполнения хранится в VacancyRefill по запросу и странице,
+    его опрашивает фронтенд через /vacancies/refresh/.
+    """
+    set_refill_status(search_query, page_number, RUNNING)
+    try:
+        responses = async_to_sync(fetch_vacancies)(search_query, page_number)
+    except Exception:
+        set_refill_status(search_query, page_number, FAILED)
+        raise
+
+    status_codes = [response.status_code for response in responses]
+    for status_code in status_codes:
+        if status_code != 200:
+            logger.error(f"Fetch error, status code: {status_code}")
+
+    status = DONE if 200 in status_codes else FAILED
+    set_refill_status(search_query, page_number, status, status_codes=status_codes)
+
+
+@app.task(ignore_result=True)
+def crawl_catalog(
+    platforms: list[str] | None = None,
+    run_id: str | None = None,
+    days: int = CRAWL_DAYS,
+) -> None:
+    """
+    Полный обход IT-каталога HH и SuperJob. Повторный запуск с тем же
+    run_id продолжает обход с незавершенных окон.
+    """
+    summaries = async_to_sync(crawl_catalogs)(
+        platforms or list(catalog_sources()), run_id=run_id, days=days
+    )
+    for platform, summary in summaries.items():
+        logger.info(f"Обход каталога {platform}: {summary}")
+
+
+@app.task(ignore_result=True)
+def harvest_vacancies(platforms: list[str] | None = None, days: int | None = None):
+    """
+    Периодический сбор вакансий (Celery beat, CELERY_BEAT_SCHEDULE).
+
+    Делит работу на окна площадка × регион × период и раздает их
+    воркерам отдельными задачами harvest_shard.
+    """
+    shard_ids = async_to_sync(plan_harvest)(
+        platforms or list(catalog_sources()), days=days
+    )
+    if shard_ids:
+        group(harvest_shard.s(shard_id) for shard_id in shard_ids).apply_async()
+
+
+@app.task(ignore_result=True, acks_late=True)
+def harvest_shard(checkpoint_id: int) -> None:
+    run = async_to_sync(harvest_window)(checkpoint_id)
+    logger.info(
+        f"Окно {run.checkpoint.window_key} {run.checkpoint.platform}: "
+        f"{run.status}, получено {run.fetched}, записано {run.written} "
+        f"за {run.duration:.1f} с"
+    )
@@ -1,23 +1,147 @@
 import asyncio
-from unittest.mock import AsyncMock, patch
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import factory
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.management import call_command
+from django.db import DataError, connection
 from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.utils import timezone
 
-from app.services.vacancies.models import Vacancy
+from app.services.vacancies.management.commands.benchmark_http_client import (
+    StubServer,
+)
+from app.services.vacancies.models import (
+    City,
+    CrawlCheckpoint,
+    CrawlWatermark,
+    HarvestRun,
+    Platform,
+    Vacancy,
+    VacancyRefill,
+)
+from app.services.vacancies.tasks import refill_vacancies
+from app.services.vacancies.utils.bulk_upsert import bulk_upsert_vacancies
+from app.services.vacancies.utils.catalog_crawl import CatalogCrawler
+from app.services.vacancies.utils.crawl_state import CrawlSource
+from app.services.vacancies.utils.cursor_pagination import (
+    InvalidCursor,
+    decode_cursor,
+)
+from app.services.vacancies.utils.dimensions import LRUCache, dimension_resolver
+from app.services.vacancies.utils.harvest import (
+    harvest_lock,
+    harvest_window,
+    plan_harvest,
+    shard_lock_key,
+)
+from app.services.vacancies.utils.http_client import (
+    ClientSessionRegistry,
+    HTTPClient,
+)
+from app.services.vacancies.utils.ingest_pipeline import IngestPipeline
 from app.services.vacancies.utils.paginated_vacancies import (
+    LIST_DEFERRED_FIELDS,
     VACANCIES_PER_PAGE,
+    get_cursor_paginated_vacancies,
     get_paginated_vacancies,
     get_searched_vacancies,
+    get_vacancies_cursor_page,
+    get_vacancies_page,
+)
+from app.services.vacancies.utils.rate_limit import (
+    RetryBudget,
+    TokenBucket,
+    parse_retry_after,
+)
+from app.services.vacancies.utils.raw_archive import (
+    iter_payloads,
+    iter_segments,
+    open_archive,
+)
+from app.services.vacancies.utils.refill import (
+    DONE,
+    FAILED,
+    PENDING,
+    REFILL_STATUS_TIMEOUT,
+    aget_refill_status,
+    claim_refill,
+)
+from app.services.vacancies.utils.region_index import RegionIndex
+from app.services.vacancies.utils.search_cache import (
+    HITS_KEY,
+    MISSES_KEY,
+    aget_cached_page,
+    aset_cached_page,
+    cache_stats,
+    get_cache_stats,
+    invalidate_search_cache,
+)
+from app.services.vacancies.utils.search_index import SEARCH_TABLE
+from app.services.vacancies.utils.sources import (
+    SourceAdapter,
+    catalog_sources,
+    get_platform_source,
+    get_source,
 )
 
-from ..views import VacancyListView
+from ..views import (
+    VacancyCacheStatsView,
+    VacancyFeedView,
+    VacancyHttpStatsView,
+    VacancyListView,
+    VacancyRefreshView,
+)
 from .factories import CityFactory, CompanyFactory, VacancyFactory
 
 
+class FakeLockClient:
+    """Блокировки Redis в памяти теста: общие для всех клиентов."""
+
+    held = set()
+
+    def lock(self, name, timeout=None, blocking=True):
+        return FakeLock(self.held, name)
+
+    async def aclose(self):
+        pass
+
+
+class FakeLock:
+    def __init__(self, held, name):
+        self.held = held
+        self.name = name
+
+    async def acquire(self):
+        if self.name in self.held:
+            return False
+        self.held.add(self.name)
+        return True
+
+    async def release(self):
+        self.held.discard(self.name)
+
+
 class VacanciesTests(TransactionTestCase):
     def setUp(self):
         self.factory = RequestFactory()
+        cache.clear()
+        cache_stats.reset()
+        delay_patcher = patch(
+            "app.services.vacancies.utils.paginated_vacancies.refill_vacancies.delay"
+        )
+        self.mock_refill_delay = delay_patcher.start()
+        self.addCleanup(delay_patcher.stop)
         VacancyFactory.create_batch(
             2,
             title=factory.Iterator(["Python Developer", "Java Engineer"]),
@@ -118,21 +242,75 @@ class VacanciesTests(TransactionTestCase):
         VacancyFactory.create_batch(12)
 
         request = self.factory.get("/vacancies?page=3")
-
-        with patch(
-            "app.services.vacancies.utils.paginated_vacancies.hh_vacancy_parse"
-        ) as mock_hh:
-            with patch(
-                "app.services.vacancies.utils.paginated_vacancies.superjob_vacancy_parse"
-            ) as mock_sj:
-                mock_hh.return_value = AsyncMock(status_code=200)
-                mock_sj.return_value = AsyncMock(status_code=200)
-
-                result = asyncio.run(get_paginated_vacancies(request))
+        result = asyncio.run(get_paginated_vacancies(request))
 
         self.assertEqual(result["pagination"]["current_page"], 3)
         self.assertFalse(result["pagination"]["has_next"])
         self.assertTrue(result["pagination"]["has_previous"])
+        self.assertEqual(result["refresh"]["status"], PENDING)
+        self.mock_refill_delay.assert_called_once_with("", 3)
+
+    def test_first_page_does_not_schedule_refill(self):
+        VacancyFactory.create_batch(10)
+
+        request = self.factory.get("/vacancies?page=1")
+        result = asyncio.run(get_paginated_vacancies(request))
+
+        self.assertIsNone(result["refresh"])
+        self.mock_refill_delay.assert_not_called()
+
+    def test_refill_is_deduplicated(self):
+        request = self.factory.get("/vacancies", {"search": "Python"})
+        asyncio.run(get_paginated_vacancies(request))
+        request = self.factory.get("/vacancies", {"search": "  python "})
+        asyncio.run(get_paginated_vacancies(request))
+
+        self.mock_refill_delay.assert_called_once_with("Python", 1)
+
+    def test_expired_refill_is_claimed_again(self):
+        self.assertTrue(asyncio.run(claim_refill("python", 2)))
+        self.assertFalse(asyncio.run(claim_refill("python", 2)))
+
+        VacancyRefill.objects.update(
+            updated_at=timezone.now() - timedelta(seconds=REFILL_STATUS_TIMEOUT + 1)
+        )
+
+        self.assertIsNone(asyncio.run(aget_refill_status("python", 2)))
+        self.assertTrue(asyncio.run(claim_refill("python", 2)))
+        self.assertEqual(VacancyRefill.objects.get().status, PENDING)
+
+    @patch(
+        "app.services.vacancies.tasks.fetch_vacancies",
+        new_callable=AsyncMock,
+    )
+    def test_refill_task_records_status(self, mock_fetch):
+        mock_fetch.return_value = [
+            MagicMock(status_code=200),
+            MagicMock(status_code=500),
+        ]
+
+        refill_vacancies("python", 2)
+
+        mock_fetch.assert_awaited_once_with("python", 2)
+        request = self.factory.get(
+            "/vacancies/refresh/", {"search": "python", "page": 2}
+        )
+        response = asyncio.run(VacancyRefreshView().get(request))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'"status": "{DONE}"', response.content.decode())
+
+    @patch(
+        "app.services.vacancies.tasks.fetch_vacancies",
+        new_callable=AsyncMock,
+    )
+    def test_refill_task_failed_fetch(self, mock_fetch):
+        mock_fetch.return_value = [MagicMock(status_code=404)]
+
+        refill_vacancies("python", 1)
+
+        request = self.factory.get("/vacancies/refresh/", {"search": "python"})
+        response = asyncio.run(VacancyRefreshView().get(request))
+        self.assertIn(f'"status": "{FAILED}"', response.content.decode())
 
     def test_default_page_number(self):
         request = self.factory.get("/vacancies")
@@ -163,3 +341,776 @@ class VacanciesTests(TransactionTestCase):
         self.assertIn("total_pages", pagination)
         self.assertIn("has_next", pagination)
         self.assertIn("has_previous", pagination)
+
+    def test_vacancies_page_returns_only_current_page(self):
+        VacancyFactory.create_batch(10)
+
+        vacancies, paginator, page_obj = asyncio.run(get_vacancies_page("", 2))
+
+        self.assertEqual(len(vacancies), VACANCIES_PER_PAGE)
+        self.assertEqual(paginator.count, Vacancy.objects.count())
+        self.assertEqual(page_obj.number, 2)
+
+    def test_vacancies_page_defers_heavy_fields(self):
+        vacancies, _, page_obj = asyncio.run(get_vacancies_page("", 1))
+
+        for field in LIST_DEFERRED_FIELDS:
+            self.assertNotIn(field, vacancies[0])
+            self.assertIn(field, page_obj.object_list[0].get_deferred_fields())
+
+    def test_vacancies_page_invalid_number_falls_back(self):
+        _, _, page_obj = asyncio.run(get_vacancies_page("", "abc"))
+
+        self.assertEqual(page_obj.number, 1)
+
+    def test_cursor_pages_walk_forward_and_back(self):
+        VacancyFactory.create_batch(10)
+        expected = list(
+            Vacancy.objects.order_by("-published_at", "-id").values_list(
+                "platform_vacancy_id", flat=True
+            )
+        )
+
+        first, next_cursor, previous_cursor = asyncio.run(
+            get_vacancies_cursor_page("", None)
+        )
+        self.assertIsNone(previous_cursor)
+        self.assertEqual(
+            [v["id"] for v in first], expected[:VACANCIES_PER_PAGE]
+        )
+
+        second, _, previous_cursor = asyncio.run(
+            get_vacancies_cursor_page("", next_cursor)
+        )
+        self.assertEqual(
+            [v["id"] for v in second],
+            expected[VACANCIES_PER_PAGE : VACANCIES_PER_PAGE * 2],
+        )
+
+        back, _, _ = asyncio.run(get_vacancies_cursor_page("", previous_cursor))
+        self.assertEqual(back, first)
+
+    def test_cursor_pages_are_stable_on_new_inserts(self):
+        VacancyFactory.create_batch(10)
+        _, next_cursor, _ = asyncio.run(get_vacancies_cursor_page("", None))
+        second, _, _ = asyncio.run(get_vacancies_cursor_page("", next_cursor))
+
+        VacancyFactory.create_batch(3)
+        second_again, _, _ = asyncio.run(get_vacancies_cursor_page("", next_cursor))
+
+        self.assertEqual(second, second_again)
+
+    def test_cursor_last_page_has_no_next(self):
+        request = self.factory.get("/vacancies", {"cursor": ""})
+        result = asyncio.run(get_cursor_paginated_vacancies(request))
+
+        self.assertEqual(len(result["vacancies"]), 2)
+        self.assertFalse(result["cursor"]["has_next"])
+        self.assertIsNone(result["cursor"]["next"])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            decode_cursor("not-a-cursor")
+
+    @override_settings(SECRET_KEY="a-test-secret")
+    async def test_invalid_cursor_response(self):
+        request = self.factory.get("/vacancies/feed/", {"cursor": "broken"})
+
+        response = await VacancyFeedView().get(request)
+
+        self.assertEqual(response.status_code, 400)
+
+    async def test_cursor_feed_response(self):
+        request = self.factory.get("/vacancies/feed/")
+
+        response = await VacancyFeedView().get(request)
+        data = json.loads(response.content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(data["vacancies"]), 2)
+        self.assertFalse(data["cursor"]["has_next"])
+
+    def test_search_ranks_title_above_description(self):
+        VacancyFactory.create(title="Backend Engineer", description="Kotlin")
+        VacancyFactory.create(title="Kotlin Developer", description="Backend")
+
+        result = asyncio.run(get_searched_vacancies("kotlin"))
+
+        self.assertEqual(
+            [v["title"] for v in result], ["Kotlin Developer", "Backend Engineer"]
+        )
+
+    def test_search_index_follows_updates(self):
+        vacancy = Vacancy.objects.get(title="Java Engineer")
+        vacancy.title = "Go Engineer"
+        vacancy.save()
+
+        self.assertEqual(len(asyncio.run(get_searched_vacancies("Java"))), 0)
+        self.assertEqual(len(asyncio.run(get_searched_vacancies("Go"))), 1)
+
+    def test_search_index_follows_company_rename(self):
+        vacancy = Vacancy.objects.get(title="Java Engineer")
+        vacancy.company.name = "Kotlinware"
+        vacancy.company.save()
+
+        result = asyncio.run(get_searched_vacancies("Kotlinware"))
+
+        self.assertEqual([v["title"] for v in result], ["Java Engineer"])
+
+    def test_search_table_is_flushed_with_vacancies(self):
+        # flush и TRUNCATE на PostgreSQL очищают только известные Django таблицы.
+        self.assertIn(SEARCH_TABLE, connection.introspection.django_table_names())
+
+    def test_search_russian_word_forms(self):
+        VacancyFactory.create(title="Ведущий разработчик")
+
+        result = asyncio.run(get_searched_vacancies("Разработчик"))
+
+        self.assertEqual(len(result), 1)
+
+    def test_search_page_is_cached(self):
+        request = self.factory.get("/vacancies", {"search": "Python"})
+        first = asyncio.run(get_paginated_vacancies(request))
+
+        VacancyFactory.create(title="Python Team Lead")
+        request = self.factory.get("/vacancies", {"search": "python "})
+        second = asyncio.run(get_paginated_vacancies(request))
+
+        self.assertEqual(first["vacancies"], second["vacancies"])
+        self.assertEqual(get_cache_stats()["hits"], 1)
+        self.assertEqual(get_cache_stats()["misses"], 1)
+
+    def test_search_cache_hit_reads_once_and_writes_nothing(self):
+        asyncio.run(aset_cached_page("Python", 1, 1, {"vacancies": []}))
+
+        with (
+            patch.object(cache, "aget_many", wraps=cache.aget_many) as get_many,
+            patch.object(cache, "aset", wraps=cache.aset) as set_,
+            patch.object(cache, "aincr", wraps=cache.aincr) as incr,
+        ):
+            page = asyncio.run(aget_cached_page("python", 1))
+
+        self.assertEqual(page, (1, {"vacancies": []}))
+        self.assertEqual(get_many.call_count, 1)
+        set_.assert_not_called()
+        incr.assert_not_called()
+
+    def test_search_cache_stats_flushed_in_batches(self):
+        request = self.factory.get("/vacancies", {"search": "Python"})
+        with patch.object(cache_stats, "flush_every", 3):
+            for _ in range(4):
+                asyncio.run(get_paginated_vacancies(request))
+
+        self.assertEqual(cache.get(HITS_KEY), 2)
+        self.assertEqual(cache.get(MISSES_KEY), 1)
+        self.assertEqual(get_cache_stats()["hits"], 3)
+
+    def test_search_cache_invalidated_by_generation(self):
+        request = self.factory.get("/vacancies", {"search": "Python"})
+        asyncio.run(get_paginated_vacancies(request))
+
+        VacancyFactory.create(title="Python Team Lead")
+        invalidate_search_cache()
+        result = asyncio.run(get_paginated_vacancies(request))
+
+        self.assertEqual(len(result["vacancies"]), 2)
+        self.assertEqual(get_cache_stats()["generation"], 2)
+        self.assertEqual(get_cache_stats()["misses"], 2)
+
+    def test_stats_views_require_staff(self):
+        for view_class in (VacancyCacheStatsView, VacancyHttpStatsView):
+            view = view_class.as_view()
+            request = self.factory.get("/vacancies/cache-stats/")
+            request.user = AnonymousUser()
+            with self.assertRaises(PermissionDenied):
+                view(request)
+
+            request.user = SimpleNamespace(is_staff=True)
+            self.assertEqual(view(request).status_code, 200)
+
+    def test_dimension_resolver_caches_ids(self):
+        CityFactory.create(name="Москва")
+        ids = dimension_resolver.resolve_many(City, ["Москва", "Казань"])
+
+        self.assertTrue(City.objects.filter(name="Казань").exists())
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                dimension_resolver.resolve_many(City, ["Казань", "Москва"]), ids
+            )
+        self.assertIsNone(dimension_resolver.resolve(City, ""))
+
+    def test_dimension_resolver_warm_preloads_ids(self):
+        city = CityFactory.create(name="Казань")
+        dimension_resolver.clear()
+
+        dimension_resolver.warm()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(dimension_resolver.resolve(City, "Казань"), city.id)
+        self.assertEqual(dimension_resolver.hits, 1)
+
+    def test_dimension_resolver_forgets_deleted_rows(self):
+        platform_id = dimension_resolver.resolve(Platform, Platform.HH)
+        Platform.objects.filter(id=platform_id).get().delete()
+
+        self.assertNotEqual(
+            dimension_resolver.resolve(Platform, Platform.HH), platform_id
+        )
+
+    def test_lru_cache_evicts_least_recently_used(self):
+        lru = LRUCache(maxsize=2)
+        lru.set_many({"a": 1, "b": 2})
+        lru.get_many(["a"])
+        lru.set_many({"c": 3})
+
+        self.assertEqual(lru.get_many(["a", "b", "c"]), {"a": 1, "c": 3})
+
+    def test_bulk_upsert_resolves_dimensions_once(self):
+        rows = [
+            {
+                "platform": Platform.HH,
+                "company": "Hexlet",
+                "city": "Москва",
+                "platform_vacancy_id": f"hh{i}",
+                "title": f"Python {i}",
+                "url": f"https://hh.ru/vacancy/{i}",
+                "published_at": timezone.now(),
+            }
+            for i in range(3)
+        ]
+        bulk_upsert_vacancies(rows)
+        # Справочники уже в кэше: транзакция, вставка, id и поисковый индекс.
+        with self.assertNumQueries(6):
+            bulk_upsert_vacancies(rows)
+
+        self.assertEqual(Vacancy.objects.filter(city__name="Москва").count(), 3)
+
+    def test_region_index_reloads_on_mtime_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mapping.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"Казань": "Татарстан"}, f)
+            index = RegionIndex(path, fetch_mapping=MagicMock(), check_interval=0)
+
+            mapping = index.get()
+            self.assertIs(index.get(), mapping)
+            self.assertEqual(index.region_for("Казань"), "Татарстан")
+            self.assertEqual(index.region_for(None, "нет"), "нет")
+
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"Казань": "Республика Татарстан"}, f)
+            os.utime(path, (0, 0))
+
+            self.assertEqual(index.region_for("Казань"), "Республика Татарстан")
+            index.fetch_mapping.assert_not_called()
+
+    def test_region_index_fetches_missing_file(self):
+        fetch_mapping = MagicMock(return_value={"Москва": "Москва"})
+        index = RegionIndex("/nonexistent/mapping.json", fetch_mapping)
+
+        self.assertEqual(index.region_for("Москва"), "Москва")
+        self.assertEqual(index.region_for("Москва"), "Москва")
+        fetch_mapping.assert_called_once()
+        with self.assertRaises(TypeError):
+            index.get()["Москва"] = "Подмосковье"
+
+    def test_http_client_reuses_connections_across_event_loops(self):
+        server = StubServer()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}/vacancies"
+
+        registry = ClientSessionRegistry()
+        self.addCleanup(registry.close)
+        client = HTTPClient(url, {}, registry=registry)
+
+        first = asyncio.run(client.get([url]))
+        second = asyncio.run(client.get([url]))
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(first[0]["items"]), 20)
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(len(registry.sessions), 1)
+
+        registry.close()
+        self.assertIsNone(registry.loop)
+        self.assertEqual(registry.sessions, {})
+
+    @override_settings(HTTP_CLIENT_MAX_RETRIES=3)
+    @patch("app.services.vacancies.utils.http_client.backoff_delay", return_value=0)
+    def test_http_client_retries_throttled_requests(self, mock_backoff):
+        server = StubServer(
+            responses=[(429, {"Retry-After": "0"}), (503, {})]
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}/vacancies"
+
+        registry = ClientSessionRegistry()
+        self.addCleanup(registry.close)
+        client = HTTPClient(url, {}, registry=registry)
+
+        result = asyncio.run(client.get([url]))
+
+        self.assertEqual(len(result[0]["items"]), 20)
+        self.assertEqual(server.requests, 3)
+        metrics = next(iter(registry.get_metrics().values()))
+        self.assertEqual(metrics["requests"], 3)
+        self.assertEqual(metrics["throttled"], 1)
+        self.assertEqual(metrics["server_errors"], 1)
+        self.assertEqual(metrics["retries"], 2)
+        self.assertLess(metrics["concurrency_limit"], 10)
+
+    @override_settings(HTTP_CLIENT_MAX_RETRIES=1)
+    @patch("app.services.vacancies.utils.http_client.backoff_delay", return_value=0)
+    def test_http_client_gives_up_after_max_retries(self, mock_backoff):
+        server = StubServer(responses=[(500, {}), (500, {}), (500, {})])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}/vacancies"
+
+        registry = ClientSessionRegistry()
+        self.addCleanup(registry.close)
+        result = asyncio.run(HTTPClient(url, {}, registry=registry).get([url]))
+
+        self.assertIsInstance(result[0], aiohttp.ClientResponseError)
+        self.assertEqual(result[0].status, 500)
+        self.assertEqual(server.requests, 2)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("5"), 5.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertEqual(parse_retry_after("100000"), 120.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_token_bucket_and_retry_budget(self):
+        bucket = TokenBucket(rate=1000, burst=2)
+        self.assertFalse(asyncio.run(bucket.acquire()))
+        self.assertFalse(asyncio.run(bucket.acquire()))
+        self.assertTrue(asyncio.run(bucket.acquire()))
+
+        budget = RetryBudget(ratio=0.5, minimum=1)
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+    def test_ingest_pipeline_saves_in_batches(self):
+        async def source():
+            for i in range(25):
+                yield {"id": i}
+
+        def transform(item):
+            if item["id"] == 7:
+                raise ValueError("broken vacancy")
+            return item
+
+        batches = []
+        pipeline = IngestPipeline(
+            transform, save=batches.append, batch_size=10, queue_size=2
+        )
+        stats = asyncio.run(pipeline.run(source()))
+
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 4])
+        self.assertEqual(
+            sorted(row["id"] for batch in batches for row in batch),
+            [i for i in range(25) if i != 7],
+        )
+        self.assertEqual(stats["fetch"].items, 25)
+        self.assertEqual(stats["transform"].failed, 1)
+        self.assertEqual(stats["save"].items, 24)
+
+    def test_ingest_pipeline_reraises_source_error(self):
+        async def source():
+            yield {"id": 1}
+            raise ValueError("Vacancy not found")
+
+        pipeline = IngestPipeline(lambda item: item, save=lambda batch: None)
+        with self.assertRaisesMessage(ValueError, "Vacancy not found"):
+            asyncio.run(pipeline.run(source()))
+
+    def test_ingest_holds_watermark_before_failed_transform(self):
+        now = timezone.now()
+
+        class DatedSource(CrawlSource):
+            platform = Platform.HH
+
+            async def crawl(self):
+                for hours in range(1, 4):
+                    published_at = now - timedelta(hours=hours)
+                    self.seen(published_at)
+                    yield {"id": hours, "published_at": published_at}
+
+            def published_at(self, payload):
+                return payload["published_at"]
+
+        class DatedCatalog(SourceAdapter):
+            platform = Platform.HH
+
+            def transform(self, payload):
+                if payload["id"] == 2:
+                    raise ValueError("broken vacancy")
+                return payload
+
+            def save(self, rows):
+                return []
+
+        source = DatedSource({"text": "python"}, incremental=True)
+        asyncio.run(DatedCatalog().ingest(source))
+
+        self.assertEqual(
+            CrawlWatermark.objects.get().last_published_at, now - timedelta(hours=2)
+        )
+
+    def test_http_client_stream_limits_in_flight_requests(self):
+        server = StubServer(responses=[(404, {})])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}/vacancies"
+
+        registry = ClientSessionRegistry()
+        self.addCleanup(registry.close)
+        client = HTTPClient(url, {}, registry=registry)
+
+        async def consume():
+            results = []
+            async for result in client.stream(
+                (f"{url}/{i}" for i in range(10)), window=3
+            ):
+                results.append(result)
+                # Пока потребитель не забрал ответ, новые запросы не уходят.
+                self.assertLessEqual(server.requests, len(results) + 3)
+            return results
+
+        results = asyncio.run(consume())
+
+        self.assertEqual(len(results), 10)
+        self.assertEqual(
+            sum(isinstance(result, aiohttp.ClientResponseError) for result in results),
+            1,
+        )
+        self.assertEqual(server.requests, 10)
+
+    @patch(
+        "app.services.vacancies.utils.catalog_crawl.timezone.now",
+        return_value=timezone.now(),
+    )
+    def test_catalog_crawler_splits_windows_and_resumes(self, mock_now):
+        hour = 3600
+
+        async def count(params):
+            # 100 вакансий в час: суточное окно превышает предел в 1000.
+            return (params["to"] - params["from"]) * 100 // hour
+
+        class WindowSource(CrawlSource):
+            platform = Platform.HH
+            failing_from = None
+
+            async def crawl(self):
+                if self.params["from"] == WindowSource.failing_from:
+                    raise RuntimeError("Api error")
+                for i in range(3):
+                    yield {"id": f"{self.params['from']}-{i}"}
+
+        class WindowCatalog(SourceAdapter):
+            name = "hh"
+            platform = Platform.HH
+            catalog_params = {}
+            max_depth = 1000
+
+            def stream(self, params=None, incremental=False, paginate=False):
+                return WindowSource(params)
+
+            def transform(self, payload):
+                return {
+                    "platform_vacancy_id": payload["id"],
+                    "title": "t",
+                    "published_at": timezone.now(),
+                }
+
+            async def count(self, params):
+                return await count(params)
+
+            def window_params(self, window):
+                return {
+                    "from": int(window.date_from.timestamp()),
+                    "to": int(window.date_to.timestamp()),
+                }
+
+        catalog = WindowCatalog()
+
+        summary = asyncio.run(CatalogCrawler(catalog, "run-1", days=1).run())
+
+        checkpoints = list(CrawlCheckpoint.objects.order_by("params__from"))
+        self.assertEqual(len(checkpoints), 4)
+        self.assertTrue(all(c.found <= 1000 for c in checkpoints))
+        self.assertEqual(summary.windows, 4)
+        self.assertEqual(summary.saved, 12)
+
+        WindowSource.failing_from = checkpoints[1].params["from"]
+        CrawlCheckpoint.objects.all().delete()
+        Vacancy.objects.all().delete()
+        summary = asyncio.run(CatalogCrawler(catalog, "run-2", days=1).run())
+
+        self.assertEqual(summary.failed, 1)
+        self.assertEqual(summary.saved, 9)
+        self.assertEqual(
+            CrawlCheckpoint.objects.filter(status=CrawlCheckpoint.FAILED).count(), 1
+        )
+
+        WindowSource.failing_from = None
+        with patch.object(
+            CatalogCrawler, "plan", side_effect=AssertionError("replanned")
+        ):
+            summary = asyncio.run(CatalogCrawler(catalog, "run-2", days=1).run())
+
+        self.assertEqual(summary.resumed, 3)
+        self.assertEqual(summary.saved, 12)
+        self.assertEqual(Vacancy.objects.count(), 12)
+        self.assertFalse(
+            CrawlCheckpoint.objects.exclude(status=CrawlCheckpoint.DONE).exists()
+        )
+
+    @patch(
+        "app.services.telegram.telegram_parser.source.hh_region_index.region_for",
+        return_value="Москва",
+    )
+    def test_registered_sources_share_ingest_pipeline(self, mock_region):
+        self.assertEqual(set(catalog_sources()), {"hh", "superjob"})
+        self.assertIs(get_platform_source(Platform.TELEGRAM), get_source("telegram"))
+
+        async def messages():
+            yield {
+                "company": "Telegram Co",
+                "city": "Москва",
+                "title": "Python developer",
+                "salary": "",
+                "url": "https://t.me/jobs/1",
+                "experience": "",
+                "schedule": "",
+                "work_format": "",
+                "skills": "",
+                "description": "",
+                "address": "",
+                "contacts": "",
+            }
+
+        stats = asyncio.run(get_source("telegram").ingest(messages()))
+
+        self.assertEqual(stats["save"].items, 1)
+        self.assertTrue(
+            Vacancy.objects.filter(
+                platform__name=Platform.TELEGRAM, company__name="Telegram Co"
+            ).exists()
+        )
+
+    def test_telegram_vacancy_id_is_stable_and_fits(self):
+        source = get_source("telegram")
+        payload = {
+            "company": "Telegram Co",
+            "title": "Go developer",
+            "description": None,
+            "url": None,
+        }
+        max_length = Vacancy._meta.get_field("platform_vacancy_id").max_length
+
+        vacancy_id = source.vacancy_id(payload)
+
+        self.assertLessEqual(len(vacancy_id), max_length)
+        self.assertEqual(source.vacancy_id(dict(payload)), vacancy_id)
+        self.assertNotEqual(
+            source.vacancy_id({**payload, "url": "https://t.me/jobs/1"}), vacancy_id
+        )
+
+    @patch(
+        "app.services.telegram.telegram_parser.source.hh_region_index.region_for",
+        return_value="Москва",
+    )
+    def test_telegram_save_skips_conflicting_url(self, mock_region):
+        source = get_source("telegram")
+
+        def row(title, url):
+            return source.transform(
+                {
+                    "company": "Telegram Co",
+                    "city": "Москва",
+                    "title": title,
+                    "salary": "",
+                    "url": url,
+                    "experience": "",
+                    "schedule": "",
+                    "work_format": "",
+                    "skills": "",
+                    "description": "",
+                    "address": "",
+                    "contacts": "",
+                }
+            )
+
+        # Вакансия с той же ссылкой уже сохранена под другим id:
+        # пачка целиком не запишется, остальные строки сохранятся по одной.
+        VacancyFactory.create(url="https://t.me/jobs/1")
+        rows = [
+            row("Python developer", "https://t.me/jobs/1"),
+            row("Go developer", "https://t.me/jobs/2"),
+            row("Go developer", "https://t.me/jobs/2"),
+        ]
+        vacancy_ids = source.save(rows)
+
+        self.assertEqual(len(vacancy_ids), 1)
+        self.assertEqual(
+            list(
+                Vacancy.objects.filter(platform__name=Platform.TELEGRAM).values_list(
+                    "url", flat=True
+                )
+            ),
+            ["https://t.me/jobs/2"],
+        )
+
+        with patch(
+            "app.services.telegram.telegram_parser.source.bulk_upsert_vacancies",
+            side_effect=DataError("value too long"),
+        ):
+            with self.assertRaises(DataError):
+                source.save(rows)
+
+    @override_settings(HARVEST_AREAS={"hh": ["1", "2"]})
+    @patch("app.services.vacancies.utils.harvest.get_lock_client", FakeLockClient)
+    @patch(
+        "app.services.vacancies.utils.harvest.harvest_period_end",
+        return_value=timezone.now(),
+    )
+    def test_harvest_shards_by_area_and_records_runs(self, mock_period_end):
+        class WindowSource(CrawlSource):
+            platform = Platform.HH
+
+            async def crawl(self):
+                for i in range(2):
+                    yield {"id": f"{self.params['area']}-{i}"}
+
+        class AreaCatalog(SourceAdapter):
+            name = "hh"
+            platform = Platform.HH
+            catalog_params = {}
+            max_depth = 1000
+
+            def stream(self, params=None, incremental=False, paginate=False):
+                return WindowSource(params)
+
+            def transform(self, payload):
+                return {
+                    "platform_vacancy_id": payload["id"],
+                    "title": "t",
+                    "published_at": timezone.now(),
+                }
+
+            async def count(self, params):
+                return 10
+
+            def window_params(self, window):
+                return {"area": window.area}
+
+        with patch.dict(
+            "app.services.vacancies.utils.sources.SOURCES", {"hh": AreaCatalog()}
+        ):
+            shard_ids = asyncio.run(plan_harvest(["hh"], run_id="harvest-1"))
+            self.assertEqual(len(shard_ids), 2)
+
+            run = asyncio.run(harvest_window(shard_ids[0]))
+            self.assertEqual(run.status, HarvestRun.DONE)
+            self.assertEqual((run.fetched, run.written), (2, 2))
+            self.assertGreater(run.duration, 0)
+
+            # Окно уже собрано: повторная доставка задачи ничего не делает.
+            run = asyncio.run(harvest_window(shard_ids[0]))
+            self.assertEqual(run.status, HarvestRun.SKIPPED)
+
+            async def harvest_locked():
+                checkpoint = await CrawlCheckpoint.objects.aget(id=shard_ids[1])
+                async with harvest_lock(shard_lock_key(checkpoint)):
+                    return await harvest_window(shard_ids[1])
+
+            self.assertEqual(asyncio.run(harvest_locked()).status, HarvestRun.SKIPPED)
+            self.assertEqual(
+                CrawlCheckpoint.objects.get(id=shard_ids[1]).status,
+                CrawlCheckpoint.PENDING,
+            )
+
+            shard_ids = asyncio.run(plan_harvest(["hh"], run_id="harvest-1"))
+            self.assertEqual(len(shard_ids), 1)
+
+            # Другой запуск с теми же окнами: собранное окно не повторяется.
+            other_ids = asyncio.run(plan_harvest(["hh"], run_id="harvest-2"))
+            runs = [asyncio.run(harvest_window(shard_id)) for shard_id in other_ids]
+            self.assertEqual(
+                sorted(run.status for run in runs), [HarvestRun.DONE, HarvestRun.SKIPPED]
+            )
+
+        self.assertEqual(
+            Vacancy.objects.filter(platform_vacancy_id__startswith="1-").count(), 2
+        )
+
+    @patch(
+        "app.services.hh.hh_parser.utils.data_transformer"
+        ".get_hh_city_to_region_mapping",
+        return_value={"Казань": "Татарстан"},
+    )
+    def test_raw_archive_replays_through_reprocess(self, mock_regions):
+        items = [
+            {
+                "id": str(i),
+                "name": f"Python Developer {i}",
+                "alternate_url": f"https://hh.ru/vacancy/{i}",
+                "area": {"name": "Казань"},
+                "employer": {"name": "Hexlet"},
+                "description": "<p>Python</p>",
+                "published_at": "2024-01-15T10:00:00+0300",
+            }
+            for i in range(3)
+        ]
+
+        async def source():
+            for item in items:
+                yield item
+
+        with tempfile.TemporaryDirectory() as archive_dir:
+            with override_settings(RAW_ARCHIVE_DIR=archive_dir):
+                pipeline = IngestPipeline(
+                    lambda item: item,
+                    save=lambda batch: None,
+                    archive=open_archive(Platform.HH),
+                )
+                asyncio.run(pipeline.run(source()))
+
+            segments = list(iter_segments(archive_dir, Platform.HH))
+            self.assertEqual(len(segments), 1)
+            self.assertEqual(list(iter_payloads(segments)), items)
+
+            # Оборванный сегмент упавшего писателя не мешает чтению.
+            broken = os.path.join(archive_dir, "broken.jsonl.gz")
+            with open(broken, "wb") as file:
+                file.write(segments[0].read_bytes()[:-10])
+            payloads = list(iter_payloads([broken]))
+            self.assertEqual(payloads, items[: len(payloads)])
+
+            items[0]["name"] = "Fixed title"
+            with override_settings(RAW_ARCHIVE_DIR=archive_dir):
+                archive = open_archive(Platform.HH)
+                archive.write(items[0])
+                archive.close()
+
+            stdout = io.StringIO()
+            call_command(
+                "reprocess", platform=["hh"], archive=archive_dir, stdout=stdout
+            )
+
+        self.assertIn("hh: прочитано", stdout.getvalue())
+        vacancies = Vacancy.objects.filter(platform__name=Platform.HH)
+        self.assertEqual(vacancies.count(), 3)
+        self.assertTrue(vacancies.filter(title="Fixed title", region="Татарстан"))
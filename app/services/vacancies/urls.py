@@ -4,4 +4,16 @@ from . import views
 
 urlpatterns = [
     path("", views.VacancyListView.as_view(), name="vacancy_list"),
+    path("feed/", views.VacancyFeedView.as_view(), name="vacancy_feed"),
+    path("refresh/", views.VacancyRefreshView.as_view(), name="vacancy_refresh"),
+    path(
+        "cache-stats/",
+        views.VacancyCacheStatsView.as_view(),
+        name="vacancy_cache_stats",
+    ),
+    path(
+        "http-stats/",
+        views.VacancyHttpStatsView.as_view(),
+        name="vacancy_http_stats",
+    ),
 ]
@@ -0,0 +1,72 @@
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from django.db import transaction
+
+from app.services.vacancies.models import City, Company, Platform, Vacancy
+from app.services.vacancies.utils.dimensions import dimension_resolver
+from app.services.vacancies.utils.search_index import chunked, index_vacancies
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+# Поля-справочники: в строках они приходят названиями и
+# разрешаются в id через общий DimensionResolver.
+DIMENSIONS = {
+    "platform": Platform,
+    "company": Company,
+    "city": City,
+}
+UPDATE_EXCLUDED_FIELDS = {"platform_vacancy_id", "created_at"}
+
+
+def resolve_dimensions(rows: list[dict[str, Any]]) -> None:
+    for field, model in DIMENSIONS.items():
+        names = {row[field] for row in rows if isinstance(row.get(field), str)}
+        if not names:
+            continue
+        resolved = dimension_resolver.resolve_many(model, names)
+        for row in rows:
+            if isinstance(row.get(field), str):
+                row[f"{field}_id"] = resolved[row.pop(field)]
+
+
+def bulk_upsert_vacancies(rows: Iterable[dict[str, Any]]) -> list[int]:
+    """
+    Сохраняет вакансии пачкой (INSERT ... ON CONFLICT по platform_vacancy_id).
+
+    Платформа, компания и город в строках могут быть названиями или
+    объектами моделей. Возвращает id сохраненных вакансий.
+    """
+    # При повторе platform_vacancy_id в одной пачке побеждает последняя строка.
+    unique_rows = {row["platform_vacancy_id"]: dict(row) for row in rows}
+    if not unique_rows:
+        return []
+
+    rows = list(unique_rows.values())
+    update_fields = sorted(
+        {field for row in rows for field in row} - UPDATE_EXCLUDED_FIELDS
+    )
+    with transaction.atomic():
+        resolve_dimensions(rows)
+        Vacancy.objects.bulk_create(
+            [Vacancy(**row) for row in rows],
+            batch_size=BATCH_SIZE,
+            update_conflicts=bool(update_fields),
+            ignore_conflicts=not update_fields,
+            unique_fields=["platform_vacancy_id"] if update_fields else None,
+            update_fields=update_fields or None,
+        )
+        vacancy_ids = [
+            vacancy_id
+            for batch in chunked(unique_rows.keys())
+            for vacancy_id in Vacancy.objects.filter(platform_vacancy_id__in=batch)
+            .order_by()
+            .values_list("id", flat=True)
+        ]
+        index_vacancies(vacancy_ids)
+
+    logger.info(f"Сохранено вакансий: {len(vacancy_ids)}")
+    return vacancy_ids
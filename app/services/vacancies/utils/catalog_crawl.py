@@ -0,0 +1,210 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from app.services.vacancies.models import CrawlCheckpoint
+
+from .ingest_pipeline import StageStats
+from .search_cache import ainvalidate_search_cache
+from .sources import SourceAdapter, get_source
+
+logger = logging.getLogger(__name__)
+
+CRAWL_DAYS = 30
+# Окно короче не делится, даже если площадка находит в нем больше
+# вакансий, чем отдает по одному запросу.
+MIN_WINDOW = timedelta(minutes=10)
+
+
+@dataclass(frozen=True)
+class Window:
+    date_from: datetime
+    date_to: datetime
+    area: str | None = None
+
+    @property
+    def key(self) -> str:
+        return (
+            f"{self.area or 'all'}:"
+            f"{int(self.date_from.timestamp())}-{int(self.date_to.timestamp())}"
+        )
+
+    def split(self) -> tuple["Window", "Window"]:
+        middle = self.date_from + (self.date_to - self.date_from) / 2
+        return (
+            Window(self.date_from, middle, self.area),
+            Window(middle, self.date_to, self.area),
+        )
+
+
+@dataclass
+class CrawlSummary:
+    windows: int = 0
+    resumed: int = 0
+    failed: int = 0
+    found: int = 0
+    fetched: int = 0
+    saved: int = 0
+    known: int = 0
+    unchanged: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+class CatalogCrawler:
+    """
+    Полный обход каталога одной площадки.
+
+    Площадки отдают по одному запросу ограниченное число вакансий
+    (max_depth), поэтому период делится пополам по дате публикации,
+    пока каждое окно не уложится в предел. Окна сохраняются как
+    CrawlCheckpoint: повторный запуск с тем же run_id пропускает уже
+    обойденные окна и продолжает с незавершенных.
+    """
+
+    def __init__(
+        self,
+        source: SourceAdapter,
+        run_id: str,
+        days: int = CRAWL_DAYS,
+        areas: Iterable[str] = (),
+        until: datetime | None = None,
+    ):
+        self.source = source
+        self.run_id = run_id
+        self.days = days
+        self.areas = list(areas)
+        self.until = until
+        self.summary = CrawlSummary()
+
+    async def run(self) -> CrawlSummary:
+        checkpoints = await self.prepare()
+        self.summary.windows = len(checkpoints)
+        for checkpoint in checkpoints:
+            self.summary.found += checkpoint.found
+            if checkpoint.status == CrawlCheckpoint.DONE:
+                self.summary.resumed += 1
+                self.summary.saved += checkpoint.saved
+                continue
+            await self.crawl_window(checkpoint)
+        return self.summary
+
+    async def prepare(self) -> list[CrawlCheckpoint]:
+        """Окна обхода: сохраненные для run_id или разбиение заново."""
+        checkpoints = await sync_to_async(self.load_checkpoints)()
+        if checkpoints:
+            logger.info(
+                f"Обход {self.source.platform} {self.run_id}: продолжение, "
+                f"окон {len(checkpoints)}"
+            )
+            return checkpoints
+        windows = await self.plan()
+        return await sync_to_async(self.create_checkpoints)(windows)
+
+    async def plan(self) -> list[tuple[Window, int]]:
+        date_to = self.until or timezone.now()
+        date_from = date_to - timedelta(days=self.days)
+        roots = [Window(date_from, date_to, area) for area in self.areas or [None]]
+        planned = await asyncio.gather(*(self.split(window) for window in roots))
+        return [window for windows in planned for window in windows]
+
+    async def split(self, window: Window) -> list[tuple[Window, int]]:
+        found = await self.source.count(self.source.catalog_query(window))
+        if not found:
+            return []
+        if found <= self.source.max_depth:
+            return [(window, found)]
+        if window.date_to - window.date_from <= MIN_WINDOW:
+            logger.warning(
+                f"Окно {window.key} {self.source.platform}: найдено {found}, "
+                f"площадка отдаст только {self.source.max_depth}"
+            )
+            return [(window, found)]
+
+        left, right = await asyncio.gather(
+            *(self.split(part) for part in window.split())
+        )
+        return [*left, *right]
+
+    def load_checkpoints(self) -> list[CrawlCheckpoint]:
+        return list(
+            CrawlCheckpoint.objects.filter(
+                platform=self.source.platform, run_id=self.run_id
+            )
+        )
+
+    def create_checkpoints(
+        self, windows: list[tuple[Window, int]]
+    ) -> list[CrawlCheckpoint]:
+        CrawlCheckpoint.objects.bulk_create(
+            [
+                CrawlCheckpoint(
+                    platform=self.source.platform,
+                    run_id=self.run_id,
+                    window_key=window.key,
+                    params=self.source.catalog_query(window),
+                    found=found,
+                )
+                for window, found in windows
+            ],
+            ignore_conflicts=True,
+        )
+        return self.load_checkpoints()
+
+    async def crawl_window(
+        self, checkpoint: CrawlCheckpoint
+    ) -> dict[str, StageStats] | None:
+        """Обходит окно; при ошибке помечает его FAILED и возвращает None."""
+        stats = None
+        stream = self.source.stream(checkpoint.params, paginate=True)
+        try:
+            stats = await self.source.ingest(stream)
+        except Exception as e:
+            logger.error(
+                f"Окно {checkpoint.window_key} {self.source.platform} не обойдено: {e}"
+            )
+            checkpoint.status = CrawlCheckpoint.FAILED
+            self.summary.failed += 1
+            self.summary.errors.append(f"{checkpoint.window_key}: {e}")
+        else:
+            checkpoint.status = CrawlCheckpoint.DONE
+            checkpoint.saved = stats["save"].items
+            self.summary.fetched += stats["fetch"].items
+            self.summary.saved += checkpoint.saved
+            self.summary.known += stream.known
+            self.summary.unchanged += stream.unchanged
+        await sync_to_async(checkpoint.save)(
+            update_fields=["status", "saved", "updated_at"]
+        )
+        return stats
+
+
+async def crawl_catalogs(
+    platforms: Iterable[str],
+    run_id: str | None = None,
+    days: int = CRAWL_DAYS,
+    areas: dict[str, list[str]] | None = None,
+) -> dict[str, CrawlSummary]:
+    """Обходит каталоги площадок параллельно, по одному CatalogCrawler на площадку."""
+    run_id = run_id or timezone.now().strftime("%Y-%m-%d")
+    areas = areas or {}
+    crawlers = {
+        name: CatalogCrawler(get_source(name), run_id, days, areas.get(name, ()))
+        for name in platforms
+    }
+    results = await asyncio.gather(
+        *(crawler.run() for crawler in crawlers.values()), return_exceptions=True
+    )
+
+    summaries = {}
+    for name, result in zip(crawlers, results):
+        if isinstance(result, Exception):
+            logger.error(f"Обход {name} прерван: {result}")
+            result = CrawlSummary(errors=[str(result)])
+        summaries[name] = result
+    await ainvalidate_search_cache()
+    return summaries
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import logging
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+
+from app.services.vacancies.models import CrawlWatermark, PageValidator, Vacancy
+from app.services.vacancies.utils.search_index import chunked
+
+logger = logging.getLogger(__name__)
+
+# Параметры постраничного обхода не влияют на то, какие вакансии
+# попадают в выдачу, и не должны менять ключ отметки.
+PAGING_PARAMS = {"page", "per_page", "count", "date_from", "order_by"}
+
+
+def watermark_key(params: dict[str, Any]) -> str:
+    query = {key: value for key, value in params.items() if key not in PAGING_PARAMS}
+    return hashlib.sha1(
+        json.dumps(query, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def get_watermark(platform: str, params: dict[str, Any]) -> datetime | None:
+    return (
+        CrawlWatermark.objects.filter(platform=platform, query_key=watermark_key(params))
+        .values_list("last_published_at", flat=True)
+        .first()
+    )
+
+
+def advance_watermark(
+    platform: str, params: dict[str, Any], published_at: datetime
+) -> None:
+    """Сдвигает отметку вперед; более ранняя дата отметку не меняет."""
+    watermark, created = CrawlWatermark.objects.select_for_update().get_or_create(
+        platform=platform,
+        query_key=watermark_key(params),
+        defaults={"query": params, "last_published_at": published_at},
+    )
+    if not created and watermark.last_published_at < published_at:
+        watermark.last_published_at = published_at
+        watermark.save(update_fields=["last_published_at", "updated_at"])
+
+
+def get_validators(urls: Iterable[str]) -> dict[str, tuple[str | None, str | None]]:
+    validators = {}
+    for batch in chunked(urls, 500):
+        validators.update(
+            (url, (etag, last_modified))
+            for url, etag, last_modified in PageValidator.objects.filter(
+                url__in=batch
+            ).values_list("url", "etag", "last_modified")
+        )
+    return validators
+
+
+def save_validators(validators: dict[str, tuple[str | None, str | None]]) -> None:
+    PageValidator.objects.bulk_create(
+        [
+            PageValidator(url=url, etag=etag, last_modified=last_modified)
+            for url, (etag, last_modified) in validators.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["url"],
+        update_fields=["etag", "last_modified", "updated_at"],
+        batch_size=500,
+    )
+
+
+def get_stored_published_at(platform_vacancy_ids: Iterable[str]) -> dict[str, datetime]:
+    """Даты публикации уже сохраненных вакансий: один IN-запрос на 500 id."""
+    stored = {}
+    for batch in chunked(platform_vacancy_ids, 500):
+        stored.update(
+            Vacancy.objects.filter(platform_vacancy_id__in=batch)
+            .order_by()
+            .values_list("platform_vacancy_id", "published_at")
+        )
+    return stored
+
+
+class CrawlSource:
+    """
+    Источник вакансий для IngestPipeline с состоянием обхода.
+
+    Во время обхода запоминает самую позднюю дату публикации и валидаторы
+    (ETag, Last-Modified) полученных страниц, а сохраняет их только после
+    commit(), то есть когда вакансии уже записаны: при ошибке сохранения
+    следующий обход запросит те же вакансии заново.
+
+    Вакансии, которые не удалось получить или преобразовать, отмечаются
+    через failed(): отметка сдвигается не дальше самой ранней из них,
+    чтобы следующий обход запросил их снова.
+    """
+
+    platform: str
+
+    def __init__(self, params: dict[str, Any] | None = None, incremental: bool = False):
+        self.params = params or {}
+        self.incremental = incremental
+        self.latest_published_at: datetime | None = None
+        self.earliest_failed_at: datetime | None = None
+        # Не удалось определить дату необработанной вакансии: отметка
+        # в этом обходе не сдвигается.
+        self.complete = True
+        self.validators: dict[str, tuple[str | None, str | None]] = {}
+        self.unchanged = 0
+        # Подробные страницы, которые не запрашивались: вакансия уже
+        # сохранена, а данные списка с ней совпадают.
+        self.known = 0
+
+    def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        return self.crawl()
+
+    def crawl(self) -> AsyncIterator[dict[str, Any]]:
+        raise NotImplementedError
+
+    def seen(self, published_at: datetime) -> None:
+        if self.latest_published_at is None or published_at > self.latest_published_at:
+            self.latest_published_at = published_at
+
+    def published_at(self, payload: dict[str, Any]) -> datetime | None:
+        return None
+
+    def failed(self, payload: dict[str, Any]) -> None:
+        published_at = self.published_at(payload)
+        if published_at is None:
+            self.complete = False
+        elif self.earliest_failed_at is None or published_at < self.earliest_failed_at:
+            self.earliest_failed_at = published_at
+
+    def watermark(self) -> datetime | None:
+        """Новая отметка: дата самой поздней вакансии, но не позже необработанных."""
+        if not self.complete:
+            return None
+        if self.earliest_failed_at is not None and (
+            self.latest_published_at is None
+            or self.earliest_failed_at < self.latest_published_at
+        ):
+            # date_from включает границу: вакансия с этой датой будет
+            # запрошена снова.
+            return self.earliest_failed_at
+        return self.latest_published_at
+
+    async def commit(self) -> None:
+        await sync_to_async(self.save_state)()
+
+    def save_state(self) -> None:
+        with transaction.atomic():
+            if self.validators:
+                save_validators(self.validators)
+            watermark = self.watermark()
+            if self.incremental and watermark:
+                advance_watermark(self.platform, self.params, watermark)
+        logger.info(
+            f"Обход {self.platform}: пропущено известных {self.known}, "
+            f"без изменений {self.unchanged}, отметка {self.watermark()}"
+        )
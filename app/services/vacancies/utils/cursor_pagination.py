@@ -0,0 +1,81 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from django.db.models import Q, QuerySet
+
+NEXT = "next"
+PREVIOUS = "previous"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(published_at: datetime, pk: int, direction: str) -> str:
+    payload = json.dumps(
+        {"p": published_at.isoformat(), "i": pk, "d": direction},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        published_at = datetime.fromisoformat(payload["p"])
+        pk = int(payload["i"])
+        direction = payload["d"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+    if direction not in (NEXT, PREVIOUS):
+        raise InvalidCursor("Invalid cursor direction")
+    return published_at, pk, direction
+
+
+def paginate_by_cursor(
+    qs: QuerySet, cursor: str | None, limit: int
+) -> tuple[list[Any], str | None, str | None]:
+    """
+    Keyset-пагинация по (published_at, id) в порядке убывания.
+
+    Стоимость страницы не зависит от ее глубины: вместо OFFSET
+    используется условие по ключу последней показанной записи.
+    Возвращает (записи, курсор следующей страницы, курсор предыдущей).
+    """
+    if not cursor:
+        rows = list(qs.order_by("-published_at", "-id")[: limit + 1])
+        has_next, has_previous = len(rows) > limit, False
+        rows = rows[:limit]
+    else:
+        published_at, pk, direction = decode_cursor(cursor)
+        if direction == NEXT:
+            rows = list(
+                qs.filter(
+                    Q(published_at__lt=published_at)
+                    | Q(published_at=published_at, id__lt=pk)
+                ).order_by("-published_at", "-id")[: limit + 1]
+            )
+            has_next, has_previous = len(rows) > limit, True
+            rows = rows[:limit]
+        else:
+            rows = list(
+                qs.filter(
+                    Q(published_at__gt=published_at)
+                    | Q(published_at=published_at, id__gt=pk)
+                ).order_by("published_at", "id")[: limit + 1]
+            )
+            has_next, has_previous = True, len(rows) > limit
+            rows = rows[:limit][::-1]
+
+    next_cursor = previous_cursor = None
+    if rows and has_next:
+        next_cursor = encode_cursor(rows[-1].published_at, rows[-1].pk, NEXT)
+    if rows and has_previous:
+        previous_cursor = encode_cursor(rows[0].published_at, rows[0].pk, PREVIOUS)
+
+    return rows, next_cursor, previous_cursor
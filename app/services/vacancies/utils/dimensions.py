@@ -0,0 +1,140 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.db import transaction
+
+from app.services.vacancies.models import City, Company, Platform
+
+from .search_index import chunked
+
+DIMENSION_MODELS = (Platform, Company, City)
+
+
+class LRUCache:
+    """Ограниченный по размеру словарь с вытеснением давно не использованных."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.data: OrderedDict[str, int] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, int]:
+        found = {}
+        with self.lock:
+            for key in keys:
+                if key in self.data:
+                    self.data.move_to_end(key)
+                    found[key] = self.data[key]
+        return found
+
+    def set_many(self, items: dict[str, int]) -> None:
+        with self.lock:
+            for key, value in items.items():
+                self.data[key] = value
+                self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        with self.lock:
+            self.data.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.data.clear()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+class DimensionResolver:
+    """
+    Разрешает названия платформ, компаний и городов в id.
+
+    Известные названия берутся из LRU-кэша процесса, промахи ищутся
+    одним запросом на пачку, недостающие записи создаются пачкой.
+    """
+
+    def __init__(self, maxsize: int):
+        self.caches = {model: LRUCache(maxsize) for model in DIMENSION_MODELS}
+        self.hits = 0
+        self.misses = 0
+        # Резолвер общий для потоков процесса (sync_to_async, пулы воркеров).
+        self.lock = threading.Lock()
+
+    def resolve(self, model, name: str | None) -> int | None:
+        if not name:
+            return None
+        return self.resolve_many(model, [name])[name]
+
+    def resolve_many(self, model, names: Iterable[str]) -> dict[str, int]:
+        names = {name for name in names if name}
+        cache = self.caches[model]
+        resolved = cache.get_many(names)
+        missing = names - resolved.keys()
+        with self.lock:
+            self.hits += len(resolved)
+            self.misses += len(missing)
+        if not missing:
+            return resolved
+
+        found = self.fetch(model, missing)
+        cache.set_many(found)
+        resolved.update(found)
+
+        missing -= found.keys()
+        if missing:
+            created = self.create(model, missing)
+            # Созданные id кэшируем только после коммита: при откате
+            # транзакции в кэше остались бы ссылки на несуществующие строки.
+            transaction.on_commit(lambda: cache.set_many(created))
+            resolved.update(created)
+        return resolved
+
+    @staticmethod
+    def fetch(model, names: Iterable[str]) -> dict[str, int]:
+        found = {}
+        for batch in chunked(names):
+            rows = (
+                model.objects.filter(name__in=batch)
+                .order_by("-id")
+                .values_list("name", "id")
+            )
+            # У Company и City название не уникально: берем самую раннюю
+            # запись, чтобы параллельные воркеры сходились на одном id.
+            found.update(rows)
+        return found
+
+    def create(self, model, names: set[str]) -> dict[str, int]:
+        # ignore_conflicts: если запись с уникальным названием (Platform)
+        # успел создать другой процесс, повторный поиск вернет ее id.
+        with transaction.atomic():
+            model.objects.bulk_create(
+                [model(name=name) for name in names], ignore_conflicts=True
+            )
+            return self.fetch(model, names)
+
+    def warm(self, models=DIMENSION_MODELS) -> None:
+        """
+        Заполняет кэш последними записями справочников, по одному запросу
+        на модель. Вызывается при старте воркера Celery и слушателя Telegram.
+        """
+        for model in models:
+            cache = self.caches[model]
+            rows = model.objects.order_by("-id").values_list("name", "id")
+            cache.set_many(dict(rows[: cache.maxsize]))
+
+    def forget(self, model, name: str) -> None:
+        self.caches[model].discard(name)
+
+    def clear(self) -> None:
+        for cache in self.caches.values():
+            cache.clear()
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+
+
+dimension_resolver = DimensionResolver(settings.DIMENSION_CACHE_SIZE)
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import redis.asyncio as redis
+from django.conf import settings
+from django.utils import timezone
+from redis.exceptions import LockError
+
+from app.services.vacancies.models import CrawlCheckpoint, HarvestRun
+
+from .catalog_crawl import CatalogCrawler
+from .search_cache import ainvalidate_search_cache
+from .sources import get_platform_source, get_source
+
+logger = logging.getLogger(__name__)
+
+PLAN_LOCK_KEY = "vacancies:harvest:plan"
+
+
+def shard_lock_key(checkpoint: CrawlCheckpoint) -> str:
+    # window_key содержит регион и границы окна: окна разных запусков
+    # с теми же границами делят одну блокировку.
+    return f"vacancies:harvest:{checkpoint.platform}:{checkpoint.window_key}"
+
+
+def get_lock_client() -> redis.Redis:
+    return redis.from_url(settings.HARVEST_LOCK_URL)
+
+
+@asynccontextmanager
+async def harvest_lock(key: str):
+    """
+    Блокировка Redis (HARVEST_LOCK_URL) на время сбора.
+
+    Общая для всех воркеров: повторно доставленная или продублированная
+    задача не получит блокировку, а упавший воркер держит ее не дольше
+    HARVEST_LOCK_TIMEOUT. Освобождает блокировку только ее владелец.
+    """
+    client = get_lock_client()
+    lock = client.lock(key, timeout=settings.HARVEST_LOCK_TIMEOUT, blocking=False)
+    acquired = False
+    try:
+        acquired = await lock.acquire()
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                await lock.release()
+            except LockError:
+                logger.warning(f"Блокировка {key} истекла до конца сбора")
+        await client.aclose()
+
+
+def harvest_period_end(now: datetime) -> datetime:
+    """
+    Конец периода сбора, выровненный по HARVEST_INTERVAL_MINUTES: запуски
+    внутри одного интервала планируют одни и те же окна.
+    """
+    interval = timedelta(minutes=settings.HARVEST_INTERVAL_MINUTES)
+    epoch = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return epoch + (now - epoch) // interval * interval
+
+
+async def plan_harvest(
+    platforms: Iterable[str], run_id: str | None = None, days: int | None = None
+) -> list[int]:
+    """
+    Делит сбор на окна площадка × регион × период и возвращает id
+    необработанных окон. Площадки разбиваются параллельно.
+    """
+    until = harvest_period_end(timezone.now())
+    run_id = run_id or f"harvest-{until:%Y%m%dT%H%M}"
+    days = days or settings.HARVEST_DAYS
+    async with harvest_lock(PLAN_LOCK_KEY) as acquired:
+        if not acquired:
+            logger.info("Сбор вакансий уже планируется, запуск пропущен")
+            return []
+        crawlers = [
+            CatalogCrawler(
+                get_source(name),
+                run_id,
+                days,
+                settings.HARVEST_AREAS.get(name, ()),
+                until=until,
+            )
+            for name in platforms
+        ]
+        results = await asyncio.gather(
+            *(crawler.prepare() for crawler in crawlers), return_exceptions=True
+        )
+
+    shard_ids = []
+    for crawler, result in zip(crawlers, results):
+        if isinstance(result, Exception):
+            logger.error(f"Сбор {crawler.source.platform} не запланирован: {result}")
+            continue
+        shard_ids.extend(
+            checkpoint.id
+            for checkpoint in result
+            if checkpoint.status != CrawlCheckpoint.DONE
+        )
+    logger.info(f"Сбор {run_id}: окон {len(shard_ids)}")
+    return shard_ids
+
+
+async def is_window_done(checkpoint: CrawlCheckpoint) -> bool:
+    """Окно собрано этим или другим запуском с теми же границами."""
+    await checkpoint.arefresh_from_db()
+    return await CrawlCheckpoint.objects.filter(
+        platform=checkpoint.platform,
+        window_key=checkpoint.window_key,
+        status=CrawlCheckpoint.DONE,
+    ).aexists()
+
+
+async def harvest_window(checkpoint_id: int) -> HarvestRun:
+    """Собирает одно окно и записывает запуск в HarvestRun."""
+    started_at = timezone.now()
+    started = time.perf_counter()
+    checkpoint = await CrawlCheckpoint.objects.aget(id=checkpoint_id)
+    async with harvest_lock(shard_lock_key(checkpoint)) as acquired:
+        if not acquired or await is_window_done(checkpoint):
+            return await HarvestRun.objects.acreate(
+                checkpoint=checkpoint,
+                status=HarvestRun.SKIPPED,
+                started_at=started_at,
+            )
+        crawler = CatalogCrawler(
+            get_platform_source(checkpoint.platform), checkpoint.run_id
+        )
+        stats = await crawler.crawl_window(checkpoint)
+
+    run = HarvestRun(
+        checkpoint=checkpoint,
+        started_at=started_at,
+        duration=time.perf_counter() - started,
+    )
+    if stats is None:
+        run.status = HarvestRun.FAILED
+        run.error = "\n".join(crawler.summary.errors)
+    else:
+        run.status = HarvestRun.DONE
+        run.fetched = stats["fetch"].items
+        run.written = stats["save"].items
+        if run.written:
+            await ainvalidate_search_cache()
+    await run.asave()
+    return run
@@ -1,8 +1,33 @@
 import asyncio
+import atexit
+import logging
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
 from typing import Any
+from urllib.parse import urlsplit
 
 import aiohttp
+from django.conf import settings
+
+from .rate_limit import HostLimiter, backoff_delay, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class HTTPResponse:
+    status: int
+    data: Any = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
 
 
 class HTTPClientInterface(ABC):
@@ -11,38 +36,268 @@ class HTTPClientInterface(ABC):
         pass
 
 
+class ClientSessionRegistry:
+    """
+    Долгоживущие aiohttp-сессии процесса, по одной на хост.
+
+    Django под WSGI и задачи Celery выполняют корутины через async_to_sync,
+    то есть каждый раз в новом event loop, а сессия aiohttp привязана к
+    своему циклу. Поэтому сессии живут в отдельном фоновом цикле, а запросы
+    из любого цикла передаются туда через run_coroutine_threadsafe. Так
+    соединения (keep-alive) и DNS-кэш переиспользуются между запросами.
+
+    Для каждого хоста действует HostLimiter: token bucket, адаптивный
+    предел параллельности, учет Retry-After и бюджет повторов.
+    """
+
+    def __init__(self):
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+        self.sessions: dict[str, aiohttp.ClientSession] = {}
+        self.limiters: dict[str, HostLimiter] = {}
+        self.lock = threading.Lock()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        with self.lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(
+                    target=self.loop.run_forever,
+                    name="http-client-loop",
+                    daemon=True,
+                )
+                self.thread.start()
+            return self.loop
+
+    async def request_json(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float = 10,
+    ) -> Any:
+        response = await self.request(url, params, headers, timeout)
+        return response.data
+
+    async def request(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float = 10,
+    ) -> HTTPResponse:
+        future = asyncio.run_coroutine_threadsafe(
+            self.fetch_response(url, params, headers, timeout), self.get_loop()
+        )
+        return await asyncio.wrap_future(future)
+
+    async def fetch_response(self, url, params, headers, timeout) -> HTTPResponse:
+        host = urlsplit(url).netloc
+        session = self.get_session(host)
+        limiter = self.get_limiter(host)
+        attempt = 0
+        while True:
+            retry_after = None
+            async with limiter.slot():
+                try:
+                    async with session.get(
+                        url,
+                        params=params,
+                        headers=headers,
+                        timeout=aiohttp.ClientTimeout(total=timeout),
+                    ) as response:
+                        if response.status not in RETRY_STATUSES:
+                            response.raise_for_status()
+                            # 304 на условный запрос приходит без тела.
+                            data = None
+                            if response.status != 304:
+                                data = await response.json()
+                            limiter.on_success()
+                            return HTTPResponse(
+                                response.status,
+                                data,
+                                etag=response.headers.get("ETag"),
+                                last_modified=response.headers.get("Last-Modified"),
+                            )
+
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+                        limiter.on_throttle(response.status, retry_after)
+                        error = aiohttp.ClientResponseError(
+                            response.request_info,
+                            response.history,
+                            status=response.status,
+                            message=response.reason or "",
+                            headers=response.headers,
+                        )
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    limiter.on_connection_error()
+                    error = e
+
+            if attempt >= settings.HTTP_CLIENT_MAX_RETRIES or not limiter.allow_retry():
+                raise error
+            attempt += 1
+            # При Retry-After ждать будет сам token bucket хоста.
+            if retry_after is None:
+                await asyncio.sleep(backoff_delay(attempt))
+
+    def get_session(self, host: str) -> aiohttp.ClientSession:
+        # Вызывается только из фонового цикла, блокировка не нужна.
+        session = self.sessions.get(host)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=self.limit_for(host),
+                ttl_dns_cache=settings.HTTP_CLIENT_DNS_CACHE_TTL,
+                keepalive_timeout=settings.HTTP_CLIENT_KEEPALIVE_TIMEOUT,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self.sessions[host] = session
+        return session
+
+    def get_limiter(self, host: str) -> HostLimiter:
+        limiter = self.limiters.get(host)
+        if limiter is None:
+            rate = settings.HTTP_CLIENT_RATE_LIMITS.get(
+                host, settings.HTTP_CLIENT_DEFAULT_RATE_LIMIT
+            )
+            limiter = HostLimiter(rate, max_concurrency=self.limit_for(host))
+            self.limiters[host] = limiter
+        return limiter
+
+    def get_metrics(self) -> dict[str, dict[str, float]]:
+        return {
+            host: limiter.snapshot() for host, limiter in list(self.limiters.items())
+        }
+
+    @staticmethod
+    def limit_for(host: str) -> int:
+        return settings.HTTP_CLIENT_LIMITS_PER_HOST.get(
+            host, settings.HTTP_CLIENT_DEFAULT_LIMIT_PER_HOST
+        )
+
+    async def close_sessions(self) -> None:
+        sessions, self.sessions = list(self.sessions.values()), {}
+        self.limiters = {}
+        for session in sessions:
+            await session.close()
+
+    def close(self, timeout: float = 5) -> None:
+        with self.lock:
+            loop, thread = self.loop, self.thread
+            self.loop, self.thread = None, None
+        if loop is None:
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self.close_sessions(), loop).result(
+                timeout
+            )
+        except Exception as e:
+            logger.warning(f"Не удалось закрыть HTTP-сессии: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        loop.close()
+        logger.info("HTTP-сессии закрыты")
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self.close)
+
+
+session_registry = ClientSessionRegistry()
+atexit.register(session_registry.close)
+
+
 class HTTPClient(HTTPClientInterface):
-    CONCURRENT_LIMIT = 10
+    STREAM_WINDOW = 20
 
     def __init__(
         self,
         base_url: str,
         headers: dict[str, str],
         timeout: int = 10,
+        registry: ClientSessionRegistry = session_registry,
     ):
         self.base_url = base_url
         self.headers = headers
         self.timeout = timeout
+        self.registry = registry
 
-    async def fetch(self, session, url, semaphore, params):
-        async with semaphore:
-            async with session.get(
-                url, params=params, headers=self.headers
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
+    async def fetch(self, url, params):
+        try:
+            return await self.registry.request_json(
+                url, params=params, headers=self.headers, timeout=self.timeout
+            )
+        except Exception as e:
+            logger.warning(f"Не удалось получить {url}: {e}")
+            raise
+
+    async def fetch_conditional(
+        self,
+        url: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        params: dict[str, Any] = None,
+    ) -> HTTPResponse:
+        """Условный GET: при неизменившемся ресурсе площадка отвечает 304."""
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        try:
+            return await self.registry.request(
+                url, params=params, headers=headers, timeout=self.timeout
+            )
+        except Exception as e:
+            logger.warning(f"Не удалось получить {url}: {e}")
+            raise
 
     async def get(
         self,
         urls: list[str],
         params: dict[str, Any] = None,
     ) -> Any:
-        semaphore = asyncio.Semaphore(self.CONCURRENT_LIMIT)
-        timeout = aiohttp.ClientTimeout(total=self.timeout)
-        async with aiohttp.ClientSession(
-            timeout=timeout, raise_for_status=True
-        ) as session:
-            tasks = [
-                self.fetch(session, url, semaphore, params) for url in urls
-            ]
-            return await asyncio.gather(*tasks, return_exceptions=True)
+        # Параллельность и частоту ограничивает HostLimiter хоста.
+        tasks = [self.fetch(url, params) for url in urls]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def stream(
+        self,
+        urls: Iterable[str],
+        params: dict[str, Any] = None,
+        window: int | None = None,
+        fetch: Callable[[str], Awaitable[Any]] | None = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Отдает ответы (или исключения) по мере готовности.
+
+        Одновременно запрошено не больше window адресов; новые запросы
+        отправляются, только когда потребитель забирает готовые ответы.
+        fetch заменяет обычный GET, например условным запросом.
+        """
+        window = window or self.STREAM_WINDOW
+        fetch = fetch or (lambda url: self.fetch(url, params))
+        urls = iter(urls)
+        pending = set()
+
+        def schedule():
+            for url in urls:
+                pending.add(asyncio.create_task(fetch(url)))
+                if len(pending) >= window:
+                    break
+
+        try:
+            schedule()
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                pending -= done
+                for task in done:
+                    yield task.exception() or task.result()
+                schedule()
+        finally:
+            for task in pending:
+                task.cancel()
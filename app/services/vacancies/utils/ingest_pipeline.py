@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from asgiref.sync import sync_to_async
+
+from .bulk_upsert import bulk_upsert_vacancies
+from .raw_archive import ArchiveWriter
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+QUEUE_SIZE = 50
+TRANSFORM_WORKERS = 4
+
+END = object()
+
+
+@dataclass
+class StageStats:
+    items: int = 0
+    failed: int = 0
+    # Время работы стадии без ожидания соседних стадий.
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "items": self.items,
+            "failed": self.failed,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+class IngestPipeline:
+    """
+    Потоковая загрузка вакансий: fetch -> transform -> пакетное сохранение.
+
+    Стадии связаны очередями ограниченного размера: если сохранение или
+    преобразование не успевает, источник перестает запрашивать новые
+    вакансии (backpressure), а в памяти одновременно находится не больше
+    queue_size сырых ответов площадки.
+
+    С archive сырые ответы дописываются в архив еще до преобразования,
+    чтобы после исправления преобразователя их можно было переразобрать
+    без повторного обхода площадки (команда reprocess). on_error получает
+    сырые ответы, которые не удалось преобразовать.
+    """
+
+    def __init__(
+        self,
+        transform: Callable[[dict[str, Any]], dict[str, Any]],
+        save: Callable[[list[dict[str, Any]]], Any] = bulk_upsert_vacancies,
+        batch_size: int = BATCH_SIZE,
+        queue_size: int = QUEUE_SIZE,
+        transform_workers: int = TRANSFORM_WORKERS,
+        archive: ArchiveWriter | None = None,
+        on_error: Callable[[dict[str, Any]], None] | None = None,
+    ):
+        self.transform = transform
+        self.save = sync_to_async(save)
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.transform_workers = transform_workers
+        self.archive = archive
+        self.on_error = on_error
+        self.stats = {
+            "fetch": StageStats(),
+            "transform": StageStats(),
+            "save": StageStats(),
+        }
+
+    async def run(self, source: AsyncIterable[dict[str, Any]]) -> dict[str, StageStats]:
+        raw_queue = asyncio.Queue(self.queue_size)
+        row_queue = asyncio.Queue(self.queue_size)
+        self.active_workers = self.transform_workers
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self.fetch(source, raw_queue))
+                for _ in range(self.transform_workers):
+                    group.create_task(self.transform_items(raw_queue, row_queue))
+                group.create_task(self.save_batches(row_queue))
+        except ExceptionGroup as errors:
+            # Остальные стадии уже отменены, наружу отдаем исходную ошибку.
+            raise errors.exceptions[0]
+        finally:
+            if self.archive is not None:
+                self.archive.close()
+
+        logger.info(
+            "Загрузка вакансий: "
+            + ", ".join(
+                f"{name} {stats.items} шт. за {stats.seconds:.2f} с"
+                for name, stats in self.stats.items()
+            )
+        )
+        return self.stats
+
+    async def fetch(self, source, raw_queue: asyncio.Queue) -> None:
+        stats = self.stats["fetch"]
+        iterator = aiter(source)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = await anext(iterator)
+            except StopAsyncIteration:
+                break
+            finally:
+                stats.seconds += time.perf_counter() - started
+            stats.items += 1
+            if self.archive is not None:
+                self.archive.write(item)
+            await raw_queue.put(item)
+
+        for _ in range(self.transform_workers):
+            await raw_queue.put(END)
+
+    async def transform_items(
+        self, raw_queue: asyncio.Queue, row_queue: asyncio.Queue
+    ) -> None:
+        stats = self.stats["transform"]
+        while (item := await raw_queue.get()) is not END:
+            started = time.perf_counter()
+            try:
+                # Разбор HTML описания нагружает CPU: выполняем вне event loop,
+                # чтобы запросы к площадке продолжали уходить.
+                row = await asyncio.to_thread(self.transform, item)
+            except Exception as e:
+                stats.failed += 1
+                logger.error(f"Ошибка преобразования вакансии {item.get('id')}: {e}")
+                if self.on_error is not None:
+                    self.on_error(item)
+                continue
+            finally:
+                stats.seconds += time.perf_counter() - started
+            stats.items += 1
+            await row_queue.put(row)
+
+        self.active_workers -= 1
+        if not self.active_workers:
+            await row_queue.put(END)
+
+    async def save_batches(self, row_queue: asyncio.Queue) -> None:
+        batch = []
+        while (row := await row_queue.get()) is not END:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                await self.save_batch(batch)
+                batch = []
+        if batch:
+            await self.save_batch(batch)
+
+    async def save_batch(self, batch: list[dict[str, Any]]) -> None:
+        stats = self.stats["save"]
+        started = time.perf_counter()
+        await self.save(batch)
+        stats.seconds += time.perf_counter() - started
+        stats.items += len(batch)
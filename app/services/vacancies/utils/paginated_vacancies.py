@@ -1,122 +1,158 @@
-import asyncio
 import logging
+from typing import Any
 
 from asgiref.sync import sync_to_async
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import QuerySet
+from kombu.exceptions import OperationalError
 
-from app.services.hh.hh_parser.views import hh_vacancy_parse
-from app.services.superjob.superjob_parser.views import superjob_vacancy_parse
 from app.services.vacancies.models import Vacancy
+from app.services.vacancies.tasks import refill_vacancies
+
+from .cursor_pagination import paginate_by_cursor
+from .refill import FAILED, aget_refill_status, aset_refill_status, claim_refill
+from .search_cache import aget_cached_page, aset_cached_page
+from .search_index import get_search_backend
 
 VACANCIES_PER_PAGE = 5
-PLATFORM_VACANCIES_QTY = VACANCIES_PER_PAGE * 2
-HH_AREA_DEFAULT = 1
-HH_VACANCY_CATEGORIES = [96, 165]
-SUPERJOB_VACANCY_CATEGORY = 33
+LIST_DEFERRED_FIELDS = ("description", "contacts")
 
 logger = logging.getLogger(__name__)
 
 
+def search_vacancies(search_query: str = "", ranked: bool = True) -> QuerySet[Vacancy]:
+    qs = Vacancy.objects.select_related("company", "city", "platform")
+
+    if not search_query:
+        return qs.order_by("-published_at", "-id")
+
+    qs = get_search_backend().filter(qs, search_query, ranked=ranked)
+    if ranked:
+        return qs.order_by("-search_rank", "-published_at", "-id")
+    return qs.order_by("-published_at", "-id")
+
+
+def serialize_vacancy(vacancy: Vacancy, detailed: bool = True) -> dict[str, Any]:
+    data = {
+        "id": vacancy.platform_vacancy_id,
+        "platform": vacancy.platform.name if vacancy.platform else "",
+        "title": vacancy.title,
+        "salary": vacancy.salary,
+        "company": vacancy.company.name if vacancy.company else "",
+        "region": vacancy.region,
+        "city": vacancy.city.name if vacancy.city else "",
+        "url": vacancy.url,
+        "skills": vacancy.skills,
+        "experience": vacancy.experience,
+        "employment": vacancy.employment,
+        "work_format": vacancy.work_format,
+        "schedule": vacancy.schedule,
+        "address": vacancy.address,
+        "published_at": vacancy.published_at,
+    }
+    if detailed:
+        data["description"] = vacancy.description
+        data["contacts"] = vacancy.contacts
+    return data
+
+
 @sync_to_async
-def get_searched_vacancies(search_query: str = "") -> list[dict[str, str]]:
-    qs = Vacancy.objects.select_related("company", "city", "platform").order_by(
-        "-published_at"
-    )
+def get_searched_vacancies(search_query: str = "") -> list[dict[str, Any]]:
+    return [serialize_vacancy(v) for v in search_vacancies(search_query)]
 
-    if search_query:
-        terms = search_query.split()
-        for term in terms:
-            qs = qs.filter(
-                Q(title__icontains=term)
-                | Q(company__name__icontains=term)
-                | Q(description__icontains=term)
-                | Q(city__name__icontains=term)
-            )
-
-    return [
-        {
-            "id": v.platform_vacancy_id,
-            "platform": v.platform.name if v.platform else "",
-            "title": v.title,
-            "salary": v.salary,
-            "company": v.company.name if v.company else "",
-            "region": v.region,
-            "city": v.city.name if v.city else "",
-            "url": v.url,
-            "skills": v.skills,
-            "experience": v.experience,
-            "employment": v.employment,
-            "work_format": v.work_format,
-            "schedule": v.schedule,
-            "description": v.description,
-            "address": v.address,
-            "contacts": v.contacts,
-            "published_at": v.published_at,
-        }
-        for v in qs
-    ]
 
+@sync_to_async
+def get_vacancies_page(search_query: str = "", page_number=1):
+    """
+    Возвращает только текущую страницу поиска.
+
+    COUNT и LIMIT/OFFSET выполняются в БД, а тяжелые поля
+    (описание, контакты) не загружаются для списка.
+    """
+    qs = search_vacancies(search_query).defer(*LIST_DEFERRED_FIELDS)
+    paginator = Paginator(qs, VACANCIES_PER_PAGE)
+    page_obj = paginator.get_page(page_number)
+    vacancies = [serialize_vacancy(v, detailed=False) for v in page_obj.object_list]
 
-async def fetch_vacancies(search_query, page_obj):
-    hh_params = {
-        "text": search_query,
-        "per_page": PLATFORM_VACANCIES_QTY,
-        "page": page_obj.number - 1,
-        "order_by": "publication_time",
-        "professional_role": HH_VACANCY_CATEGORIES,
-    }
-    superjob_params = {
-        "keyword": search_query,
-        "count": PLATFORM_VACANCIES_QTY,
-        "page": page_obj.number - 1,
-        "catalogues": SUPERJOB_VACANCY_CATEGORY,
-    }
-    responses = await asyncio.gather(
-        hh_vacancy_parse(params=hh_params),
-        superjob_vacancy_parse(params=superjob_params),
+    return (vacancies, paginator, page_obj)
+
+
+@sync_to_async
+def get_vacancies_cursor_page(search_query: str = "", cursor: str | None = None):
+    qs = search_vacancies(search_query, ranked=False).defer(*LIST_DEFERRED_FIELDS)
+    rows, next_cursor, previous_cursor = paginate_by_cursor(
+        qs, cursor, VACANCIES_PER_PAGE
     )
-    return responses
+    vacancies = [serialize_vacancy(v, detailed=False) for v in rows]
 
+    return (vacancies, next_cursor, previous_cursor)
 
-def paginate(vacancies, page_number):
-    paginator = Paginator(vacancies, VACANCIES_PER_PAGE)
-    page_obj = paginator.get_page(page_number)
 
-    return (vacancies, paginator, page_obj)
+async def request_refill(search_query: str, page_number: int) -> dict | None:
+    if await claim_refill(search_query, page_number):
+        try:
+            await sync_to_async(refill_vacancies.delay)(search_query, page_number)
+        except OperationalError as e:
+            logger.error(f"Refill scheduling error: {e}")
+            await aset_refill_status(search_query, page_number, FAILED)
+
+    return await aget_refill_status(search_query, page_number)
+
+
+def build_pagination(paginator: Paginator, page_obj) -> dict[str, Any]:
+    return {
+        "current_page": page_obj.number,
+        "total_pages": paginator.num_pages,
+        "has_next": page_obj.has_next(),
+        "has_previous": page_obj.has_previous(),
+        "next_page_number": page_obj.next_page_number()
+        if page_obj.has_next()
+        else None,
+        "previous_page_number": page_obj.previous_page_number()
+        if page_obj.has_previous()
+        else None,
+    }
 
 
 async def get_paginated_vacancies(request):
-    page_number = int(request.GET.get("page", 1))
+    try:
+        page_number = int(request.GET.get("page", 1))
+    except ValueError:
+        page_number = 1
+    search_query = request.GET.get("search", "").strip()
+
+    generation, page = await aget_cached_page(search_query, page_number)
+    if page is None:
+        (vacancies, paginator, page_obj) = await get_vacancies_page(
+            search_query, page_number
+        )
+        page = {
+            "pagination": build_pagination(paginator, page_obj),
+            "vacancies": vacancies,
+        }
+        await aset_cached_page(search_query, page_number, generation, page)
+
+    pagination = page["pagination"]
+    refresh = None
+    if not pagination["has_next"]:
+        refresh = await request_refill(search_query, pagination["current_page"])
+
+    return {**page, "refresh": refresh}
+
+
+async def get_cursor_paginated_vacancies(request):
+    cursor = request.GET.get("cursor", "").strip() or None
     search_query = request.GET.get("search", "").strip()
-    vacancies = await get_searched_vacancies(search_query)
-    (vacancies, paginator, page_obj) = paginate(vacancies, page_number)
-
-    if page_obj.number == paginator.num_pages:
-        responses = await fetch_vacancies(search_query, page_obj)
-
-        for response in responses:
-            if response.status_code == 200:
-                """Refetch paginated vacancies with new data"""
-                vacancies = await get_searched_vacancies(search_query)
-                (_, paginator, page_obj) = paginate(vacancies, page_number)
-            else:
-                logger.error(
-                    f"Fetch error, status code: {response.status_code}"
-                )
+    (vacancies, next_cursor, previous_cursor) = await get_vacancies_cursor_page(
+        search_query, cursor
+    )
 
     return {
-        "pagination": {
-            "current_page": page_obj.number,
-            "total_pages": paginator.num_pages,
-            "has_next": page_obj.has_next(),
-            "has_previous": page_obj.has_previous(),
-            "next_page_number": page_obj.next_page_number()
-            if page_obj.has_next()
-            else None,
-            "previous_page_number": page_obj.previous_page_number()
-            if page_obj.has_previous()
-            else None,
+        "cursor": {
+            "next": next_cursor,
+            "previous": previous_cursor,
+            "has_next": next_cursor is not None,
+            "has_previous": previous_cursor is not None,
         },
-        "vacancies": page_obj.object_list,
+        "vacancies": vacancies,
     }
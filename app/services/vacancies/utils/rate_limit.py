@@ -0,0 +1,198 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from django.conf import settings
+
+# Доля, на которую снижается предел параллельности при 429/5xx (AIMD).
+DECREASE_RATIO = 0.5
+# Не снижать предел чаще, чем раз в это время: ответы на уже
+# отправленные запросы отражают старый предел.
+DECREASE_COOLDOWN = 1.0
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+MAX_RETRY_AFTER = 120.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After в секундах: число секунд или HTTP-дата."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        seconds = (date - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Экспоненциальная задержка с полным джиттером."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+
+
+class TokenBucket:
+    """Ограничение частоты запросов: rate токенов в секунду, запас burst."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    async def acquire(self) -> bool:
+        """Забирает токен; возвращает True, если пришлось ждать."""
+        waited = False
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                waited = True
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return waited
+            waited = True
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def block(self, seconds: float) -> None:
+        """Приостанавливает выдачу токенов (ответ с Retry-After)."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class AdaptiveConcurrency:
+    """
+    Предел одновременных запросов по схеме AIMD.
+
+    Успешный ответ увеличивает предел примерно на единицу за «окно»
+    из limit запросов, 429/5xx — уменьшает его вдвое.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(maximum)
+        self.in_flight = 0
+        self.decreased_at = 0.0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def increase(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def decrease(self) -> None:
+        now = time.monotonic()
+        if now - self.decreased_at < DECREASE_COOLDOWN:
+            return
+        self.decreased_at = now
+        self.limit = max(self.minimum, self.limit * DECREASE_RATIO)
+
+
+class RetryBudget:
+    """
+    Бюджет повторов: каждый запрос пополняет его на ratio токена,
+    каждый повтор тратит токен. Не дает повторам умножить нагрузку
+    на площадку, когда она отвечает ошибками на всё подряд.
+    """
+
+    def __init__(self, ratio: float, minimum: float = 10.0):
+        self.ratio = ratio
+        self.maximum = minimum
+        self.balance = minimum
+
+    def deposit(self) -> None:
+        self.balance = min(self.maximum, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
+
+
+@dataclass
+class HostMetrics:
+    requests: int = 0
+    throttled: int = 0
+    server_errors: int = 0
+    connection_errors: int = 0
+    retries: int = 0
+    retry_budget_exhausted: int = 0
+    rate_limited: int = 0
+
+
+class HostLimiter:
+    """Частота, параллельность, бюджет повторов и метрики одного хоста."""
+
+    def __init__(self, rate: float, max_concurrency: int):
+        self.bucket = TokenBucket(rate, burst=max(rate, 1))
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self.retry_budget = RetryBudget(settings.HTTP_CLIENT_RETRY_BUDGET_RATIO)
+        self.metrics = HostMetrics()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.concurrency.acquire()
+        try:
+            if await self.bucket.acquire():
+                self.metrics.rate_limited += 1
+            self.metrics.requests += 1
+            self.retry_budget.deposit()
+            yield
+        finally:
+            await self.concurrency.release()
+
+    def on_success(self) -> None:
+        self.concurrency.increase()
+
+    def on_throttle(self, status: int, retry_after: float | None) -> None:
+        if status == 429:
+            self.metrics.throttled += 1
+        else:
+            self.metrics.server_errors += 1
+        if retry_after:
+            self.bucket.block(retry_after)
+        self.concurrency.decrease()
+
+    def on_connection_error(self) -> None:
+        self.metrics.connection_errors += 1
+        self.concurrency.decrease()
+
+    def allow_retry(self) -> bool:
+        if self.retry_budget.withdraw():
+            self.metrics.retries += 1
+            return True
+        self.metrics.retry_budget_exhausted += 1
+        return False
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            **asdict(self.metrics),
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "retry_budget": round(self.retry_budget.balance, 2),
+        }
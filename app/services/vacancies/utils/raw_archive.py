@@ -0,0 +1,98 @@
+import gzip
+import json
+import logging
+import os
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".jsonl.gz"
+# Записей в одном сегменте: после этого писатель открывает новый файл.
+SEGMENT_RECORDS = 10_000
+
+
+class ArchiveWriter:
+    """
+    Дописывает сырые ответы площадки в архив <root>/<platform>/<дата>/.
+
+    Каждый писатель пишет в собственные сегменты (gzip JSONL), имя которых
+    содержит время, pid и случайный суффикс, поэтому процессы и воркеры не
+    мешают друг другу, а записанные сегменты никогда не переписываются.
+    """
+
+    def __init__(self, root: str | Path, platform: str):
+        self.root = Path(root)
+        self.platform = platform
+        self.file = None
+        self.day: date | None = None
+        self.records = 0
+        self.written = 0
+
+    def write(self, payload: dict[str, Any]) -> None:
+        now = datetime.now(timezone.utc)
+        if (
+            self.file is None
+            or self.day != now.date()
+            or (self.records >= SEGMENT_RECORDS)
+        ):
+            self.open_segment(now)
+        record = {"fetched_at": now.isoformat(), "payload": payload}
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self.records += 1
+        self.written += 1
+
+    def open_segment(self, now: datetime) -> None:
+        self.close()
+        directory = self.root / self.platform / now.date().isoformat()
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"{now:%H%M%S%f}-{os.getpid()}-{uuid.uuid4().hex[:8]}{SEGMENT_SUFFIX}"
+        self.file = gzip.open(directory / name, "xt", encoding="utf-8")
+        self.day = now.date()
+        self.records = 0
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def open_archive(platform: str | None) -> ArchiveWriter | None:
+    """Писатель архива или None, если архив не настроен (RAW_ARCHIVE_DIR)."""
+    if not settings.RAW_ARCHIVE_DIR or not platform:
+        return None
+    return ArchiveWriter(settings.RAW_ARCHIVE_DIR, platform)
+
+
+def iter_segments(
+    root: str | Path,
+    platform: str,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> Iterator[Path]:
+    """Сегменты площадки по порядку записи, за период дат получения."""
+    directory = Path(root) / platform
+    if not directory.is_dir():
+        return
+    for day_directory in sorted(directory.iterdir()):
+        day = date.fromisoformat(day_directory.name)
+        if (date_from and day < date_from) or (date_to and day > date_to):
+            continue
+        yield from sorted(day_directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+
+def iter_payloads(segments: Iterable[Path]) -> Iterator[dict[str, Any]]:
+    for segment in segments:
+        try:
+            with gzip.open(segment, "rt", encoding="utf-8") as file:
+                for line in file:
+                    yield json.loads(line)["payload"]
+        except (EOFError, gzip.BadGzipFile, json.JSONDecodeError) as e:
+            # Сегмент, который писал упавший процесс, обрывается на середине:
+            # записи до обрыва уже отданы.
+            logger.warning(f"Сегмент архива {segment} поврежден: {e}")
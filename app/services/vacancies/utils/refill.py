@@ -0,0 +1,113 @@
+import asyncio
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from app.services.hh.hh_parser.views import hh_vacancy_parse
+from app.services.superjob.superjob_parser.views import superjob_vacancy_parse
+from app.services.vacancies.models import VacancyRefill
+
+from .search_cache import normalize_query
+
+PLATFORM_VACANCIES_QTY = 10
+HH_AREA_DEFAULT = 1
+HH_VACANCY_CATEGORIES = [96, 165]
+SUPERJOB_VACANCY_CATEGORY = 33
+
+REFILL_STATUS_TIMEOUT = 300
+
+PENDING = VacancyRefill.PENDING
+RUNNING = VacancyRefill.RUNNING
+DONE = VacancyRefill.DONE
+FAILED = VacancyRefill.FAILED
+
+logger = logging.getLogger(__name__)
+
+
+def refill_cache_key(search_query: str, page_number: int) -> str:
+    digest = hashlib.sha1(normalize_query(search_query).encode()).hexdigest()
+    return f"vacancies:refill:{digest}:{page_number}"
+
+
+def build_refill_status(refill: VacancyRefill) -> dict[str, Any]:
+    return {
+        "status": refill.status,
+        "updated_at": refill.updated_at.isoformat(),
+        **refill.details,
+    }
+
+
+async def claim_refill(search_query: str, page_number: int) -> bool:
+    """
+    Ставит догрузку в очередь только один раз на запрос и страницу.
+
+    Пока статус предыдущей догрузки (в том числе завершенной) моложе
+    REFILL_STATUS_TIMEOUT, повторный запуск не выполняется. Захват
+    атомарен: строку создает или перехватывает только один процесс.
+    """
+    return await sync_to_async(claim_refill_sync)(
+        refill_cache_key(search_query, page_number)
+    )
+
+
+def claim_refill_sync(key: str) -> bool:
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            VacancyRefill.objects.create(key=key, updated_at=now)
+    except IntegrityError:
+        expired = now - timedelta(seconds=REFILL_STATUS_TIMEOUT)
+        updated = VacancyRefill.objects.filter(key=key, updated_at__lt=expired).update(
+            status=PENDING, details={}, updated_at=now
+        )
+        return bool(updated)
+    return True
+
+
+def set_refill_status(
+    search_query: str, page_number: int, status: str, **extra: Any
+) -> None:
+    VacancyRefill.objects.update_or_create(
+        key=refill_cache_key(search_query, page_number),
+        defaults={"status": status, "details": extra, "updated_at": timezone.now()},
+    )
+
+
+async def aset_refill_status(
+    search_query: str, page_number: int, status: str, **extra: Any
+) -> None:
+    await sync_to_async(set_refill_status)(search_query, page_number, status, **extra)
+
+
+async def aget_refill_status(search_query: str, page_number: int) -> dict | None:
+    expired = timezone.now() - timedelta(seconds=REFILL_STATUS_TIMEOUT)
+    refill = await VacancyRefill.objects.filter(
+        key=refill_cache_key(search_query, page_number), updated_at__gte=expired
+    ).afirst()
+    return build_refill_status(refill) if refill else None
+
+
+async def fetch_vacancies(search_query, page_number):
+    hh_params = {
+        "text": search_query,
+        "per_page": PLATFORM_VACANCIES_QTY,
+        "page": page_number - 1,
+        "order_by": "publication_time",
+        "professional_role": HH_VACANCY_CATEGORIES,
+    }
+    superjob_params = {
+        "keyword": search_query,
+        "count": PLATFORM_VACANCIES_QTY,
+        "page": page_number - 1,
+        "catalogues": SUPERJOB_VACANCY_CATEGORY,
+    }
+    responses = await asyncio.gather(
+        hh_vacancy_parse(params=hh_params),
+        superjob_vacancy_parse(params=superjob_params),
+    )
+    return responses
@@ -0,0 +1,85 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
+
+from app.parser import get_fixture_data
+
+logger = logging.getLogger(__name__)
+
+# Как часто (в секундах) проверять mtime файла сопоставления.
+CHECK_INTERVAL = 5.0
+
+EMPTY_MAPPING: Mapping[str, str] = MappingProxyType({})
+
+
+class RegionIndex:
+    """
+    Индекс город -> регион, общий для процесса.
+
+    Файл сопоставления читается при первом обращении и перечитывается,
+    только если изменилось его время модификации. Если файла нет, он
+    строится функцией fetch_mapping (запрос к API площадки) и сохраняется.
+    Возвращаемое сопоставление неизменяемо, поэтому его можно без
+    блокировок использовать из нескольких потоков.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fetch_mapping: Callable[[], dict[str, str]],
+        check_interval: float = CHECK_INTERVAL,
+    ):
+        self.path = path
+        self.fetch_mapping = fetch_mapping
+        self.check_interval = check_interval
+        self.mapping: Mapping[str, str] | None = None
+        self.mtime: float | None = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+    def get(self) -> Mapping[str, str]:
+        now = time.monotonic()
+        if self.mapping is not None and now - self.checked_at < self.check_interval:
+            return self.mapping
+
+        with self.lock:
+            if self.mapping is None or self.is_stale():
+                self.load()
+            self.checked_at = time.monotonic()
+        return self.mapping
+
+    def region_for(self, city: str | None, default: str | None = None) -> str | None:
+        if not city:
+            return default
+        return self.get().get(city, default)
+
+    def is_stale(self) -> bool:
+        return self.current_mtime() != self.mtime
+
+    def current_mtime(self) -> float | None:
+        try:
+            return os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def load(self) -> None:
+        mtime = self.current_mtime()
+        if mtime is None:
+            # fetch_mapping сохраняет файл, следующая проверка увидит его mtime.
+            mapping = self.fetch_mapping()
+            mtime = self.current_mtime()
+        else:
+            mapping = get_fixture_data(self.path)
+
+        self.mapping = MappingProxyType(dict(mapping)) if mapping else EMPTY_MAPPING
+        self.mtime = mtime
+        logger.info(f"Загружено сопоставление регионов {self.path}: {len(mapping)}")
+
+    def clear(self) -> None:
+        with self.lock:
+            self.mapping = None
+            self.mtime = None
+            self.checked_at = 0.0
@@ -0,0 +1,116 @@
+import hashlib
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+GENERATION_KEY = "vacancies:generation"
+HITS_KEY = "vacancies:cache:hits"
+MISSES_KEY = "vacancies:cache:misses"
+# Счетчики попаданий и промахов копятся в процессе и пишутся в кэш пачкой
+STATS_FLUSH_EVERY = 100
+
+
+def normalize_query(search_query: str) -> str:
+    return " ".join(search_query.lower().split())
+
+
+def page_cache_key(search_query: str, page_number: int) -> str:
+    digest = hashlib.sha1(normalize_query(search_query).encode()).hexdigest()
+    return f"vacancies:page:{digest}:{page_number}"
+
+
+async def aincrement(key: str, delta: int = 1) -> None:
+    try:
+        await cache.aincr(key, delta)
+    except ValueError:
+        await cache.aadd(key, 0, None)
+        await cache.aincr(key, delta)
+
+
+class CacheStats:
+    """
+    Счетчики попаданий и промахов кэша поиска.
+
+    Запрос списка не пишет в кэш на каждое обращение: счетчики
+    накапливаются в процессе и добавляются в общий кэш раз
+    в STATS_FLUSH_EVERY обращений.
+    """
+
+    def __init__(self, flush_every: int = STATS_FLUSH_EVERY):
+        self.flush_every = flush_every
+        self.pending = {HITS_KEY: 0, MISSES_KEY: 0}
+
+    async def arecord(self, hit: bool) -> None:
+        self.pending[HITS_KEY if hit else MISSES_KEY] += 1
+        if sum(self.pending.values()) >= self.flush_every:
+            await self.aflush()
+
+    async def aflush(self) -> None:
+        pending, self.pending = self.pending, {HITS_KEY: 0, MISSES_KEY: 0}
+        for key, delta in pending.items():
+            if delta:
+                await aincrement(key, delta)
+
+    def reset(self) -> None:
+        self.pending = {HITS_KEY: 0, MISSES_KEY: 0}
+
+
+cache_stats = CacheStats()
+
+
+async def aget_cached_page(search_query: str, page_number: int) -> tuple[int, Any]:
+    """
+    Возвращает текущее поколение и страницу из кэша одним get_many.
+
+    Страница хранится вместе с поколением, при котором она собрана;
+    страница прошлого поколения считается промахом (None).
+    """
+    key = page_cache_key(search_query, page_number)
+    values = await cache.aget_many([GENERATION_KEY, key])
+    generation = values.get(GENERATION_KEY, 1)
+    cached = values.get(key)
+    page = cached[1] if cached is not None and cached[0] == generation else None
+    await cache_stats.arecord(page is not None)
+    return generation, page
+
+
+async def aset_cached_page(
+    search_query: str, page_number: int, generation: int, page: Any
+) -> None:
+    await cache.aset(
+        page_cache_key(search_query, page_number),
+        (generation, page),
+        settings.VACANCY_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_search_cache() -> None:
+    """
+    Сбрасывает кэш поиска сменой поколения ключей.
+
+    Старые записи не удаляются явно и истекают по таймауту.
+    """
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 2, None)
+
+
+async def ainvalidate_search_cache() -> None:
+    try:
+        await cache.aincr(GENERATION_KEY)
+    except ValueError:
+        await cache.aadd(GENERATION_KEY, 2, None)
+
+
+def get_cache_stats() -> dict[str, int]:
+    """
+    Счетчики из общего кэша плюс еще не записанные счетчики этого процесса.
+    """
+    stats = cache.get_many([HITS_KEY, MISSES_KEY, GENERATION_KEY])
+    return {
+        "hits": stats.get(HITS_KEY, 0) + cache_stats.pending[HITS_KEY],
+        "misses": stats.get(MISSES_KEY, 0) + cache_stats.pending[MISSES_KEY],
+        "generation": stats.get(GENERATION_KEY, 1),
+    }
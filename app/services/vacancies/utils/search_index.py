@@ -0,0 +1,247 @@
+import re
+from collections.abc import Iterable
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = "vacancies_vacancy_search"
+FTS_TABLE = "vacancies_vacancy_fts"
+BATCH_SIZE = 500
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Поля поискового документа в порядке убывания веса:
+# название > навыки > компания и город > описание.
+DOCUMENT_FIELDS = (
+    ("title", "v.title", "A"),
+    ("skills", "v.skills", "B"),
+    ("company", "c.name", "C"),
+    ("city", "ci.name", "C"),
+    ("description", "v.description", "D"),
+)
+BM25_WEIGHTS = {"A": 10.0, "B": 5.0, "C": 2.0, "D": 1.0}
+DOCUMENT_SOURCE = """
+    FROM vacancies_vacancy v
+    LEFT JOIN vacancies_company c ON c.id = v.company_id
+    LEFT JOIN vacancies_city ci ON ci.id = v.city_id
+"""
+
+
+def chunked(ids: Iterable[int], size: int = BATCH_SIZE):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start : start + size]
+
+
+class BaseSearchBackend:
+    """Поиск по вакансиям без отдельного индекса (icontains по полям)."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def create_index(self) -> None:
+        pass
+
+    def drop_index(self) -> None:
+        pass
+
+    def update(self, vacancy_ids: Iterable[int]) -> None:
+        pass
+
+    def remove(self, vacancy_ids: Iterable[int]) -> None:
+        pass
+
+    def rebuild(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT id FROM vacancies_vacancy")
+            ids = [row[0] for row in cursor.fetchall()]
+        self.update(ids)
+
+    def filter(self, qs: QuerySet, query: str, ranked: bool = True) -> QuerySet:
+        for term in query.split():
+            qs = qs.filter(
+                Q(title__icontains=term)
+                | Q(company__name__icontains=term)
+                | Q(description__icontains=term)
+                | Q(city__name__icontains=term)
+            )
+        if ranked:
+            qs = qs.annotate(search_rank=Value(0.0, output_field=FloatField()))
+        return qs
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    tsvector-документ в таблице модели VacancySearchDocument с GIN-индексом.
+
+    Таблицу и индекс создают миграции; каждое поле индексируется с русским
+    и английским стеммингом, ранжирование — ts_rank с весами A/B/C/D.
+    """
+
+    TS_QUERY = "(plainto_tsquery('russian', %s) || plainto_tsquery('english', %s))"
+
+    def create_index(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx
+                ON {SEARCH_TABLE} USING gin (document)
+                """
+            )
+
+    def drop_index(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP INDEX IF EXISTS {SEARCH_TABLE}_document_idx")
+
+    def document_sql(self) -> str:
+        parts = [
+            f"setweight(to_tsvector('{config}', coalesce({column}, '')), '{weight}')"
+            for _, column, weight in DOCUMENT_FIELDS
+            for config in ("russian", "english")
+        ]
+        return " || ".join(parts)
+
+    def update(self, vacancy_ids: Iterable[int]) -> None:
+        with self.connection.cursor() as cursor:
+            for batch in chunked(vacancy_ids):
+                cursor.execute(
+                    f"""
+                    INSERT INTO {SEARCH_TABLE} (vacancy_id, document)
+                    SELECT v.id, {self.document_sql()}
+                    {DOCUMENT_SOURCE}
+                    WHERE v.id = ANY(%s)
+                    ON CONFLICT (vacancy_id)
+                    DO UPDATE SET document = EXCLUDED.document
+                    """,
+                    [batch],
+                )
+
+    def remove(self, vacancy_ids: Iterable[int]) -> None:
+        with self.connection.cursor() as cursor:
+            for batch in chunked(vacancy_ids):
+                cursor.execute(
+                    f"DELETE FROM {SEARCH_TABLE} WHERE vacancy_id = ANY(%s)",
+                    [batch],
+                )
+
+    def filter(self, qs: QuerySet, query: str, ranked: bool = True) -> QuerySet:
+        params = [query, query]
+        qs = qs.filter(
+            id__in=RawSQL(
+                f"SELECT vacancy_id FROM {SEARCH_TABLE} "
+                f"WHERE document @@ {self.TS_QUERY}",
+                params,
+            )
+        )
+        if ranked:
+            qs = qs.annotate(
+                search_rank=RawSQL(
+                    f"SELECT ts_rank(document, {self.TS_QUERY}) "
+                    f"FROM {SEARCH_TABLE} "
+                    f"WHERE vacancy_id = vacancies_vacancy.id",
+                    params,
+                    output_field=FloatField(),
+                )
+            )
+        return qs
+
+
+class SqliteSearchBackend(BaseSearchBackend):
+    """
+    FTS5-таблица для SQLite (локальная разработка и тесты).
+
+    Английский стемминг дает токенайзер porter, для русского
+    используется префиксный поиск по каждому слову запроса.
+    """
+
+    def create_index(self) -> None:
+        columns = ", ".join(name for name, _, _ in DOCUMENT_FIELDS)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+                USING fts5({columns}, tokenize='porter unicode61 remove_diacritics 2')
+                """
+            )
+
+    def drop_index(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    def update(self, vacancy_ids: Iterable[int]) -> None:
+        names = ", ".join(name for name, _, _ in DOCUMENT_FIELDS)
+        values = ", ".join(f"coalesce({column}, '')" for _, column, _ in DOCUMENT_FIELDS)
+        with self.connection.cursor() as cursor:
+            for batch in chunked(vacancy_ids):
+                placeholders = ", ".join(["%s"] * len(batch))
+                cursor.execute(
+                    f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", batch
+                )
+                cursor.execute(
+                    f"""
+                    INSERT INTO {FTS_TABLE} (rowid, {names})
+                    SELECT v.id, {values}
+                    {DOCUMENT_SOURCE}
+                    WHERE v.id IN ({placeholders})
+                    """,
+                    batch,
+                )
+
+    def remove(self, vacancy_ids: Iterable[int]) -> None:
+        with self.connection.cursor() as cursor:
+            for batch in chunked(vacancy_ids):
+                placeholders = ", ".join(["%s"] * len(batch))
+                cursor.execute(
+                    f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", batch
+                )
+
+    @staticmethod
+    def match_expression(query: str) -> str:
+        return " ".join(f'"{word}"*' for word in WORD_PATTERN.findall(query.lower()))
+
+    def filter(self, qs: QuerySet, query: str, ranked: bool = True) -> QuerySet:
+        match = self.match_expression(query)
+        if not match:
+            return super().filter(qs, "", ranked)
+
+        qs = qs.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [match],
+            )
+        )
+        if ranked:
+            weights = ", ".join(
+                str(BM25_WEIGHTS[weight]) for _, _, weight in DOCUMENT_FIELDS
+            )
+            qs = qs.annotate(
+                search_rank=RawSQL(
+                    f"SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+                    f"WHERE {FTS_TABLE} MATCH %s "
+                    f"AND {FTS_TABLE}.rowid = vacancies_vacancy.id",
+                    [match],
+                    output_field=FloatField(),
+                )
+            )
+        return qs
+
+
+SEARCH_BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SqliteSearchBackend,
+}
+
+
+def get_search_backend(connection=None) -> BaseSearchBackend:
+    connection = connection or connections[DEFAULT_DB_ALIAS]
+    backend_class = SEARCH_BACKENDS.get(connection.vendor, BaseSearchBackend)
+    return backend_class(connection)
+
+
+def index_vacancies(vacancy_ids: Iterable[int]) -> None:
+    get_search_backend().update(vacancy_ids)
+
+
+def unindex_vacancies(vacancy_ids: Iterable[int]) -> None:
+    get_search_backend().remove(vacancy_ids)
@@ -0,0 +1,88 @@
+from collections.abc import AsyncIterable
+from typing import Any
+
+from .bulk_upsert import bulk_upsert_vacancies
+from .crawl_state import CrawlSource
+from .ingest_pipeline import IngestPipeline, StageStats
+from .raw_archive import open_archive
+
+
+class SourceAdapter:
+    """
+    Источник вакансий для общего конвейера загрузки.
+
+    Адаптер описывает стадии fetch (stream), transform и save, а
+    IngestPipeline связывает их: пакетное сохранение, архив сырых ответов,
+    общий HTTP-клиент с ограничением частоты и кэш справочников действуют
+    для всех площадок одинаково. Адаптеры регистрируются декоратором
+    register_source при загрузке приложения площадки.
+    """
+
+    name: str
+    platform: str
+    # Полный обход каталога (catalog_crawl): базовый фильтр выдачи и
+    # глубина, глубже которой площадка не отдает вакансии по одному запросу.
+    catalog_params: dict[str, Any] | None = None
+    max_depth: int = 0
+
+    def stream(
+        self,
+        params: dict[str, Any] | None = None,
+        incremental: bool = False,
+        paginate: bool = False,
+    ) -> AsyncIterable[dict[str, Any]]:
+        raise NotImplementedError
+
+    def transform(self, payload: dict[str, Any]) -> dict[str, Any]:
+        raise NotImplementedError
+
+    def save(self, rows: list[dict[str, Any]]) -> list[int]:
+        return bulk_upsert_vacancies(rows)
+
+    async def count(self, params: dict[str, Any]) -> int:
+        raise NotImplementedError
+
+    def window_params(self, window) -> dict[str, Any]:
+        raise NotImplementedError
+
+    def catalog_query(self, window) -> dict[str, Any]:
+        return {**self.catalog_params, **self.window_params(window)}
+
+    async def ingest(
+        self, source: AsyncIterable[dict[str, Any]]
+    ) -> dict[str, StageStats]:
+        pipeline = IngestPipeline(
+            self.transform,
+            save=self.save,
+            archive=open_archive(self.platform),
+            on_error=source.failed if isinstance(source, CrawlSource) else None,
+        )
+        stats = await pipeline.run(source)
+        if isinstance(source, CrawlSource):
+            await source.commit()
+        return stats
+
+
+SOURCES: dict[str, SourceAdapter] = {}
+
+
+def register_source(adapter_class: type[SourceAdapter]) -> type[SourceAdapter]:
+    SOURCES[adapter_class.name] = adapter_class()
+    return adapter_class
+
+
+def get_source(name: str) -> SourceAdapter:
+    return SOURCES[name]
+
+
+def get_platform_source(platform: str) -> SourceAdapter:
+    return next(source for source in SOURCES.values() if source.platform == platform)
+
+
+def catalog_sources() -> dict[str, SourceAdapter]:
+    """Источники, каталог которых можно обойти целиком."""
+    return {
+        name: source
+        for name, source in SOURCES.items()
+        if source.catalog_params is not None
+    }
@@ -1,7 +1,16 @@
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import JsonResponse
 from django.views import View
 from inertia import render as inertia_render
 
-from .utils.paginated_vacancies import get_paginated_vacancies
+from .utils.cursor_pagination import InvalidCursor
+from .utils.http_client import session_registry
+from .utils.paginated_vacancies import (
+    get_cursor_paginated_vacancies,
+    get_paginated_vacancies,
+)
+from .utils.refill import aget_refill_status
+from .utils.search_cache import get_cache_stats
 
 
 class VacancyListView(View):
@@ -13,5 +22,51 @@ class VacancyListView(View):
             props={
                 "vacancies": pagination_vacancies["vacancies"],
                 "pagination": pagination_vacancies["pagination"],
+                "refresh": pagination_vacancies.get("refresh"),
             },
         )
+
+
+class VacancyFeedView(View):
+    """Лента вакансий по курсору (keyset) в JSON для бесконечной прокрутки."""
+
+    async def get(self, request):
+        try:
+            cursor_vacancies = await get_cursor_paginated_vacancies(request)
+        except InvalidCursor as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+        return JsonResponse(cursor_vacancies)
+
+
+class VacancyRefreshView(View):
+    async def get(self, request):
+        search_query = request.GET.get("search", "").strip()
+        try:
+            page_number = int(request.GET.get("page", 1))
+        except ValueError:
+            return JsonResponse(
+                {"status": "error", "message": "Invalid page number"}, status=400
+            )
+
+        refresh = await aget_refill_status(search_query, page_number)
+        return JsonResponse(refresh or {"status": None})
+
+
+class StaffOnlyMixin(UserPassesTestMixin):
+    """Служебная статистика доступна только сотрудникам (is_staff)."""
+
+    raise_exception = True
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+
+class VacancyCacheStatsView(StaffOnlyMixin, View):
+    def get(self, request):
+        return JsonResponse(get_cache_stats())
+
+
+class VacancyHttpStatsView(StaffOnlyMixin, View):
+    def get(self, request):
+        return JsonResponse(session_registry.get_metrics())
@@ -237,6 +237,88 @@ MAX_RETRIES_TO_SEND = os.environ.get("MAX_RETRIES_TO_SEND", 3)
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379")
 
+# Периодический сбор вакансий: beat раз в HARVEST_INTERVAL_MINUTES запускает
+# harvest_vacancies за последние HARVEST_DAYS дней
+HARVEST_INTERVAL_MINUTES = int(os.getenv("HARVEST_INTERVAL_MINUTES", 60))
+HARVEST_DAYS = int(os.getenv("HARVEST_DAYS", 1))
+# Регионы для отдельных окон (area HH, town SuperJob), через запятую
+HARVEST_AREAS = {
+    "hh": [area for area in os.getenv("HARVEST_HH_AREAS", "").split(",") if area],
+    "superjob": [
+        area for area in os.getenv("HARVEST_SUPERJOB_AREAS", "").split(",") if area
+    ],
+}
+# Блокировки окон сбора: Redis, общий для всех воркеров
+HARVEST_LOCK_URL = os.getenv("HARVEST_LOCK_URL", CELERY_BROKER_URL)
+HARVEST_LOCK_TIMEOUT = int(os.getenv("HARVEST_LOCK_TIMEOUT", 3600))
+CELERY_BEAT_SCHEDULE = {
+    "harvest-vacancies": {
+        "task": "app.services.vacancies.tasks.harvest_vacancies",
+        "schedule": HARVEST_INTERVAL_MINUTES * 60,
+    },
+}
+
+# Cache settings
+# locmem по умолчанию. При деплое с воркерами Celery и слушателем Telegram
+# нужен redis: они сбрасывают поколение кэша поиска для веб-процесса.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("CACHE_URL", CELERY_BROKER_URL),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+VACANCY_CACHE_TIMEOUT = int(os.getenv("VACANCY_CACHE_TIMEOUT", 300))
+# Размер LRU-кэша название -> id для платформ, компаний и городов (на процесс)
+DIMENSION_CACHE_SIZE = int(os.getenv("DIMENSION_CACHE_SIZE", 10_000))
+# Сколько секунд слушатель Telegram держит ключевые слова KeyWord в памяти
+TELEGRAM_KEYWORDS_TTL = int(os.getenv("TELEGRAM_KEYWORDS_TTL", 300))
+# Как часто слушатель Telegram сверяет подключенные каналы с Channel, сек
+TELEGRAM_CHANNEL_REFRESH_INTERVAL = int(
+    os.getenv("TELEGRAM_CHANNEL_REFRESH_INTERVAL", 30)
+)
+# Очередь постов между обработчиком Telegram и записью в базу: задачи
+# разбора, пачка записи (сообщений и мс), размер очереди и политика
+# переполнения: drop — отбросить, spill — дописать в TELEGRAM_SPILL_DIR
+TELEGRAM_PARSE_WORKERS = int(os.getenv("TELEGRAM_PARSE_WORKERS", 4))
+TELEGRAM_BATCH_SIZE = int(os.getenv("TELEGRAM_BATCH_SIZE", 50))
+TELEGRAM_FLUSH_INTERVAL_MS = int(os.getenv("TELEGRAM_FLUSH_INTERVAL_MS", 500))
+TELEGRAM_QUEUE_SIZE = int(os.getenv("TELEGRAM_QUEUE_SIZE", 1000))
+TELEGRAM_QUEUE_OVERFLOW = os.getenv("TELEGRAM_QUEUE_OVERFLOW", "drop")
+TELEGRAM_SPILL_DIR = os.getenv("TELEGRAM_SPILL_DIR", "")
+
+# Архив сырых ответов площадок (gzip JSONL) для команды reprocess;
+# пустое значение отключает архив
+RAW_ARCHIVE_DIR = os.getenv("RAW_ARCHIVE_DIR", "")
+
+# HTTP client settings (общие aiohttp-сессии для API площадок)
+HTTP_CLIENT_DEFAULT_LIMIT_PER_HOST = int(
+    os.getenv("HTTP_CLIENT_DEFAULT_LIMIT_PER_HOST", 10)
+)
+HTTP_CLIENT_LIMITS_PER_HOST = {
+    "api.hh.ru": int(os.getenv("HTTP_CLIENT_HH_LIMIT", 10)),
+    "api.superjob.ru": int(os.getenv("HTTP_CLIENT_SUPERJOB_LIMIT", 5)),
+}
+HTTP_CLIENT_KEEPALIVE_TIMEOUT = int(os.getenv("HTTP_CLIENT_KEEPALIVE_TIMEOUT", 60))
+HTTP_CLIENT_DNS_CACHE_TTL = int(os.getenv("HTTP_CLIENT_DNS_CACHE_TTL", 300))
+# Запросов в секунду на хост (token bucket) и повторы при 429/5xx
+HTTP_CLIENT_DEFAULT_RATE_LIMIT = float(os.getenv("HTTP_CLIENT_DEFAULT_RATE_LIMIT", 10))
+HTTP_CLIENT_RATE_LIMITS = {
+    "api.hh.ru": float(os.getenv("HTTP_CLIENT_HH_RATE_LIMIT", 10)),
+    "api.superjob.ru": float(os.getenv("HTTP_CLIENT_SUPERJOB_RATE_LIMIT", 5)),
+}
+HTTP_CLIENT_MAX_RETRIES = int(os.getenv("HTTP_CLIENT_MAX_RETRIES", 3))
+HTTP_CLIENT_RETRY_BUDGET_RATIO = float(
+    os.getenv("HTTP_CLIENT_RETRY_BUDGET_RATIO", 0.2)
+)
+
 # Tinkoff ID settings
 TINKOFF_ID_CLIENT_ID = os.getenv("TINKOFF_ID_CLIENT_ID", "")
 TINKOFF_ID_CLIENT_SECRET = os.getenv("TINKOFF_ID_CLIENT_SECRET", "")
@@ -3,3 +3,7 @@ curl -LsSf https://astral.sh/uv/install.sh | sh
 source $HOME/.local/bin/env
 
 make install && make build && make collectstatic && make migrate
+
+# Последний шаг: без индекса город -> регион деплой завершается с ошибкой,
+# иначе парсер скачивал бы справочники на первом запросе
+make region-index